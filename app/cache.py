@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    エントリ毎に有効期限を持つ、サイズ上限付きの LRU キャッシュ。
+    複数スレッドから参照されるため、操作はロックで保護する。
+
+    Args:
+        maxsize: 保持する最大エントリ数。0以下の場合はキャッシュしない。
+        clock: 現在時刻（UNIX時間）を返す関数
+    """
+
+    def __init__(self, maxsize: int, clock: Callable[[], float] = time.time) -> None:
+        self._maxsize = maxsize
+        self._clock = clock
+        self._entries: OrderedDict[K, Tuple[V, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self,
+        key: K,
+        value: V,
+        expires_at: Optional[float] = None,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        有効期限は expires_at（UNIX時間）か ttl_seconds のいずれかで指定する。
+        ttl_seconds はキャッシュの clock を基準にするため、有効期限の判定と同じ時刻で計算される。
+        """
+        now = self._clock()
+        if expires_at is None:
+            if ttl_seconds is None:
+                raise ValueError("expires_at か ttl_seconds を指定してください")
+            expires_at = now + ttl_seconds
+        if self._maxsize <= 0 or expires_at <= now:
+            return
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_if(self, predicate: Callable[[K, V], bool]) -> None:
+        with self._lock:
+            for key in [
+                key
+                for key, (value, _) in self._entries.items()
+                if predicate(key, value)
+            ]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self._maxsize,
+        }
@@ -11,6 +11,47 @@ class Settings(BaseSettings):
     DB_PORT: str = Field("")
     DB_NAME: str = Field("")
     TEST_DB_NAME: str = Field("")
+    # コネクションプールの設定（RDSのmax_connectionsに対してタスク数×(POOL_SIZE+MAX_OVERFLOW)で見積もる）
+    DB_POOL_SIZE: int = Field(5)
+    DB_MAX_OVERFLOW: int = Field(10)
+    DB_POOL_TIMEOUT: int = Field(30)
+    DB_POOL_RECYCLE: int = Field(1800)
+    DB_POOL_PRE_PING: bool = Field(True)
+    # 0の場合はstatement_timeoutを設定しない
+    DB_STATEMENT_TIMEOUT_MS: int = Field(0)
+    # 有効な場合、参照系のリポジトリをasyncpgの非同期実装に切り替える
+    DB_ASYNC_ENABLED: bool = Field(False)
+    # リードレプリカの接続文字列（カンマ区切り）。空の場合は読み取りもプライマリを使う
+    DB_REPLICA_URLS: str = Field("")
+    # round_robin または least_connections
+    DB_REPLICA_POLICY: str = Field("round_robin")
+    DB_REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: int = Field(10)
+    # 応答しないレプリカでヘルスチェックや読み取りが止まらないよう、接続のタイムアウトを短くする
+    DB_REPLICA_CONNECT_TIMEOUT_SECONDS: int = Field(2)
+    # 1リクエスト内で同じSQLがこの回数以上実行された場合、N+1の可能性として警告する（0で無効）
+    DB_N_PLUS_ONE_THRESHOLD: int = Field(10)
+    # この時間（ミリ秒）以上かかったSQLをスロークエリとしてログに出力する（0で無効）
+    DB_SLOW_QUERY_THRESHOLD_MS: int = Field(500)
+    # アウトボックス（DBのコミット後に行う処理）のワーカーの設定
+    OUTBOX_WORKER_ENABLED: bool = Field(True)
+    OUTBOX_POLL_INTERVAL_SECONDS: float = Field(1)
+    OUTBOX_BATCH_SIZE: int = Field(100)
+    # 取得したイベントを、他のワーカーが取得しないようにする時間
+    OUTBOX_LEASE_SECONDS: int = Field(300)
+    OUTBOX_MAX_ATTEMPTS: int = Field(10)
+    OUTBOX_RETRY_BASE_DELAY_SECONDS: float = Field(5)
+    OUTBOX_RETRY_MAX_DELAY_SECONDS: float = Field(600)
+    # 同期的な処理（DBアクセス・AWSの呼び出し等）を実行するスレッドプールのサイズ
+    # NOTE: DB を使う処理が多い場合は、DB_POOL_SIZE + DB_MAX_OVERFLOW を目安にする
+    THREADPOOL_SIZE: int = Field(40)
+    # イベントループの遅延の計測間隔と、警告としてログに出力する遅延（ミリ秒）
+    EVENT_LOOP_MONITOR_INTERVAL_SECONDS: float = Field(0.5)
+    EVENT_LOOP_LAG_WARNING_MS: int = Field(100)
+    # レスポンスを圧縮する最小のサイズ（バイト）。これより小さいレスポンスは圧縮しない
+    COMPRESSION_MINIMUM_SIZE: int = Field(1000)
+    # 圧縮レベル。リクエスト毎に圧縮するため、圧縮率より速度を優先する
+    COMPRESSION_GZIP_LEVEL: int = Field(6)
+    COMPRESSION_BROTLI_QUALITY: int = Field(4)
     LOCALSTACK_HOST: str = Field("")
     CORS_ORIGINS: str = Field("")
     SERVICE_ENV: str = Field("")
@@ -21,6 +62,30 @@ class Settings(BaseSettings):
     COGNITO_USER_POOL_ID: str = Field("")
     COGNITO_CLIENT_ID: str = Field("")
     COGNITO_DOMAIN: str = Field("")
+    # JWKS（Cognitoの公開鍵）のキャッシュ設定
+    COGNITO_JWKS_TTL_SECONDS: int = Field(3600)
+    COGNITO_JWKS_MIN_REFRESH_INTERVAL_SECONDS: int = Field(30)
+    COGNITO_JWKS_TIMEOUT_SECONDS: int = Field(5)
+    # ユーザーの一括作成時に、Cognito へ並行してサインアップする数
+    COGNITO_SIGN_UP_CONCURRENCY: int = Field(10)
+    # Cognito クライアントの設定。非同期版・一括作成時の呼び出しは同じ数のスレッドで実行する
+    COGNITO_MAX_POOL_CONNECTIONS: int = Field(20)
+    COGNITO_CONNECT_TIMEOUT_SECONDS: int = Field(5)
+    COGNITO_READ_TIMEOUT_SECONDS: int = Field(10)
+    # Cognito API 毎の1秒あたりの呼び出し数の上限（アカウントのクォータに合わせる。0で制限しない）
+    COGNITO_SIGN_UP_RATE_LIMIT: float = Field(50)
+    COGNITO_ADMIN_DISABLE_USER_RATE_LIMIT: float = Field(25)
+    COGNITO_ADMIN_ENABLE_USER_RATE_LIMIT: float = Field(25)
+    COGNITO_ADMIN_DELETE_USER_RATE_LIMIT: float = Field(25)
+    # スロットリング・通信エラー・5xx の場合のリトライ回数と、指数バックオフの初回・最大の待機時間
+    COGNITO_THROTTLE_MAX_RETRIES: int = Field(5)
+    COGNITO_THROTTLE_BASE_DELAY_SECONDS: float = Field(0.2)
+    COGNITO_THROTTLE_MAX_DELAY_SECONDS: float = Field(5)
+    # 検証済みトークンのキャッシュ件数上限（0でキャッシュしない）
+    AUTH_TOKEN_CACHE_MAXSIZE: int = Field(10000)
+    # 認可に使うユーザー・所属組織情報のキャッシュ設定
+    PRINCIPAL_CACHE_TTL_SECONDS: int = Field(30)
+    PRINCIPAL_CACHE_MAXSIZE: int = Field(1024)
     OPENAI_API_KEY: str = Field("")
     AWS_ACCESS_KEY_ID: str = Field("")
     AWS_SECRET_ACCESS_KEY: str = Field("")
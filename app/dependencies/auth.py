@@ -1,31 +1,300 @@
-from typing import Any, Dict
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
 
+import httpx
 import requests
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2AuthorizationCodeBearer
 from jose import exceptions, jwt
+from starlette.concurrency import run_in_threadpool
 
+from app.cache import TTLCache
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 oauth2_scheme = OAuth2AuthorizationCodeBearer(
     authorizationUrl=f"https://{settings.COGNITO_DOMAIN}/oauth2/authorize",
     tokenUrl=f"https://{settings.COGNITO_DOMAIN}/oauth2/token",
 )
 
+PublicKeys = Dict[str, Dict[str, Any]]
+
+JWKS_URL = f"https://cognito-idp.{settings.AWS_REGION}.amazonaws.com/{settings.COGNITO_USER_POOL_ID}/.well-known/jwks.json"  # noqa: E501
+
+_jwks_http_client: Optional[httpx.AsyncClient] = None
+
+# JWKS の取得失敗として扱う例外（通信エラー・HTTPエラー・不正なレスポンス）
+JWKS_FETCH_ERRORS = (requests.RequestException, httpx.HTTPError, ValueError, KeyError)
+
 
-def get_cognito_public_keys() -> dict[str, dict[str, Any]]:
-    jwks_url = f"https://cognito-idp.{settings.AWS_REGION}.amazonaws.com/{settings.COGNITO_USER_POOL_ID}/.well-known/jwks.json"  # noqa: E501
-    jwks = requests.get(jwks_url).json()
+def fetch_cognito_public_keys() -> PublicKeys:
+    """Cognito の JWKS エンドポイントから公開鍵を取得する"""
+    response = requests.get(JWKS_URL, timeout=settings.COGNITO_JWKS_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    jwks = response.json()
     return {key["kid"]: key for key in jwks["keys"]}
 
 
-def verify_token(token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
-    headers = jwt.get_unverified_header(token)
-    kid = headers["kid"]
+def get_jwks_http_client() -> httpx.AsyncClient:
+    """JWKS 取得用の HTTP クライアントを取得する。接続はプロセス内で使い回す。"""
+    global _jwks_http_client
+    if _jwks_http_client is None or _jwks_http_client.is_closed:
+        _jwks_http_client = httpx.AsyncClient(
+            timeout=settings.COGNITO_JWKS_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=2),
+        )
+    return _jwks_http_client
+
+
+async def close_jwks_http_client() -> None:
+    global _jwks_http_client
+    if _jwks_http_client is not None:
+        await _jwks_http_client.aclose()
+        _jwks_http_client = None
+
+
+async def fetch_cognito_public_keys_async() -> PublicKeys:
+    """Cognito の JWKS エンドポイントからイベントループをブロックせずに公開鍵を取得する"""
+    response = await get_jwks_http_client().get(JWKS_URL)
+    response.raise_for_status()
+    jwks = response.json()
+    return {key["kid"]: key for key in jwks["keys"]}
+
+
+class JWKSKeyStore:
+    """
+    Cognito の公開鍵をプロセス内にキャッシュする鍵ストア。
+
+    - 初回のみ同期的に取得し、以降は TTL の間キャッシュを返す。
+    - TTL を過ぎた場合はキャッシュを返しつつ、バックグラウンドで再取得する。
+    - 未知の kid を受け取った場合のみ同期的に再取得する。
+      ただし、不正なトークンによる連続取得を防ぐため、最小間隔で制限する。
+      再取得に失敗した場合は、鍵が見つからなかったものとして扱う。
+
+    非同期版のメソッド（*_async）はイベントループ上で取得し、
+    同時に発生した取得要求は実行中の取得にまとめる。
+    """
+
+    def __init__(
+        self,
+        fetcher: Callable[[], PublicKeys],
+        ttl_seconds: float,
+        min_refresh_interval_seconds: float,
+        async_fetcher: Optional[Callable[[], Awaitable[PublicKeys]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._fetcher = fetcher
+        self._async_fetcher = async_fetcher
+        self._ttl_seconds = ttl_seconds
+        self._min_refresh_interval_seconds = min_refresh_interval_seconds
+        self._clock = clock
+        self._keys: PublicKeys = {}
+        self._fetched_at: Optional[float] = None
+        self._last_attempt_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_task: Optional["asyncio.Task[PublicKeys]"] = None
+
+    def get_keys(self) -> PublicKeys:
+        if self._fetched_at is None:
+            return self.refresh()
+        if self._is_stale():
+            self._refresh_in_background()
+        return self._keys
+
+    def get_key(self, kid: str) -> Optional[Dict[str, Any]]:
+        key = self.get_keys().get(kid)
+        if key is not None:
+            return key
+
+        with self._lock:
+            # NOTE: ロック待ちの間に他のスレッドが再取得済みの場合があるため、再度確認する
+            key = self._keys.get(kid)
+            if key is not None or not self._can_refresh():
+                return key
+            try:
+                return self._refresh_locked().get(kid)
+            except JWKS_FETCH_ERRORS as e:
+                logger.warning(
+                    f"未知の kid のため JWKS を再取得しましたが、失敗しました: {e}"
+                )
+                return None
+
+    def refresh(self) -> PublicKeys:
+        with self._lock:
+            return self._refresh_locked()
+
+    async def get_keys_async(self) -> PublicKeys:
+        if self._fetched_at is None:
+            return await self.refresh_async()
+        if self._is_stale() and self._can_refresh():
+            self._start_refresh_task()
+        return self._keys
+
+    async def get_key_async(self, kid: str) -> Optional[Dict[str, Any]]:
+        key = (await self.get_keys_async()).get(kid)
+        if key is not None or not self._can_refresh():
+            return key
+        try:
+            return (await self.refresh_async()).get(kid)
+        except JWKS_FETCH_ERRORS:
+            # NOTE: 失敗は _log_refresh_task_error でログに出力する
+            return None
+
+    async def refresh_async(self) -> PublicKeys:
+        return await self._start_refresh_task()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys = {}
+            self._fetched_at = None
+            self._last_attempt_at = None
+
+    def _is_stale(self) -> bool:
+        return (
+            self._fetched_at is None
+            or self._clock() - self._fetched_at >= self._ttl_seconds
+        )
+
+    def _can_refresh(self) -> bool:
+        return (
+            self._last_attempt_at is None
+            or self._clock() - self._last_attempt_at
+            >= self._min_refresh_interval_seconds
+        )
+
+    def _refresh_locked(self) -> PublicKeys:
+        self._last_attempt_at = self._clock()
+        self._keys = self._fetcher()
+        self._fetched_at = self._clock()
+        return self._keys
+
+    def _refresh_in_background(self) -> None:
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        if not self._can_refresh():
+            return
+        self._last_attempt_at = self._clock()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_quietly, name="jwks-refresh", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def _refresh_quietly(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            # NOTE: 再取得に失敗しても、既存の鍵で検証を継続する
+            logger.warning(
+                f"JWKSの再取得に失敗しました。キャッシュを継続利用します: {e}"
+            )
+
+    def _start_refresh_task(self) -> "asyncio.Task[PublicKeys]":
+        loop = asyncio.get_running_loop()
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            # NOTE: 実行開始まで待つと、その間に届いた未知の kid のトークンが再取得を連続して要求するため、
+            # 作成時に記録する
+            self._last_attempt_at = self._clock()
+            task = loop.create_task(self._refresh_from_async_fetcher())
+            task.add_done_callback(self._log_refresh_task_error)
+            self._refresh_task = task
+        return task
+
+    async def _refresh_from_async_fetcher(self) -> PublicKeys:
+        if self._async_fetcher is None:
+            keys = await run_in_threadpool(self._fetcher)
+        else:
+            keys = await self._async_fetcher()
+        with self._lock:
+            self._keys = keys
+            self._fetched_at = self._clock()
+        return keys
+
+    @staticmethod
+    def _log_refresh_task_error(task: "asyncio.Task[PublicKeys]") -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"JWKSの取得に失敗しました: {task.exception()}")
+
 
-    public_keys = get_cognito_public_keys()
-    key = public_keys.get(kid)
+jwks_key_store = JWKSKeyStore(
+    fetcher=fetch_cognito_public_keys,
+    async_fetcher=fetch_cognito_public_keys_async,
+    ttl_seconds=settings.COGNITO_JWKS_TTL_SECONDS,
+    min_refresh_interval_seconds=settings.COGNITO_JWKS_MIN_REFRESH_INTERVAL_SECONDS,
+)
+
+
+def get_cognito_public_keys() -> PublicKeys:
+    return jwks_key_store.get_keys()
+
+
+def jwks_unavailable(e: Exception) -> HTTPException:
+    """鍵を1度も取得できていない場合は、トークンを検証できないため 503 とする"""
+    logger.error(f"JWKSの取得に失敗しました: {e}")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Unable to fetch public keys",
+    )
 
+
+def get_cognito_public_key(kid: str) -> Optional[Dict[str, Any]]:
+    try:
+        key = get_cognito_public_keys().get(kid)
+    except JWKS_FETCH_ERRORS as e:
+        raise jwks_unavailable(e) from e
+    if key is None:
+        # 鍵のローテーション直後の可能性があるため、鍵ストアから再取得を試みる
+        key = jwks_key_store.get_key(kid)
+    return key
+
+
+async def get_cognito_public_keys_async() -> PublicKeys:
+    return await jwks_key_store.get_keys_async()
+
+
+async def get_cognito_public_key_async(kid: str) -> Optional[Dict[str, Any]]:
+    try:
+        key = (await get_cognito_public_keys_async()).get(kid)
+    except JWKS_FETCH_ERRORS as e:
+        raise jwks_unavailable(e) from e
+    if key is None:
+        # 鍵のローテーション直後の可能性があるため、鍵ストアから再取得を試みる
+        key = await jwks_key_store.get_key_async(kid)
+    return key
+
+
+# NOTE: トークン文字列そのものを保持しないよう、ダイジェストをキーにする
+verified_token_cache: TTLCache[str, Dict[str, Any]] = TTLCache(
+    maxsize=settings.AUTH_TOKEN_CACHE_MAXSIZE
+)
+
+
+def get_token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def get_kid(token: str) -> str:
+    try:
+        headers = jwt.get_unverified_header(token)
+        kid: str = headers["kid"]
+        return kid
+    except (exceptions.JWTError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+        )
+
+
+def decode_token(token: str, key: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    トークンの署名とクレームを検証する。
+    RSA の署名検証は CPU を使うため、非同期経路ではスレッドプールで実行する。
+    """
     if key is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
@@ -55,9 +324,43 @@ def verify_token(token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
         )
 
 
+def cache_verified_token(token_digest: str, decoded_token: Dict[str, Any]) -> None:
+    # 検証済みのクレームはトークンの有効期限まで再利用する
+    if "exp" in decoded_token:
+        verified_token_cache.set(
+            token_digest,
+            dict(decoded_token),
+            expires_at=float(decoded_token["exp"]),
+        )
+
+
+def verify_token(token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
+    token_digest = get_token_digest(token)
+    cached_token = verified_token_cache.get(token_digest)
+    if cached_token is not None:
+        return dict(cached_token)
+
+    key = get_cognito_public_key(get_kid(token))
+    decoded_token = decode_token(token, key)
+    cache_verified_token(token_digest, decoded_token)
+    return decoded_token
+
+
+async def verify_token_async(token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
+    token_digest = get_token_digest(token)
+    cached_token = verified_token_cache.get(token_digest)
+    if cached_token is not None:
+        return dict(cached_token)
+
+    key = await get_cognito_public_key_async(get_kid(token))
+    decoded_token = await run_in_threadpool(decode_token, token, key)
+    cache_verified_token(token_digest, decoded_token)
+    return decoded_token
+
+
 async def verify_token_and_get_email(
     token: str = Depends(oauth2_scheme),
 ) -> str:
-    decoded_token = verify_token(token)
+    decoded_token = await verify_token_async(token)
     email: str = decoded_token["email"]
     return email
@@ -1,18 +1,12 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-from app.config import settings
-
-engine = create_engine(
-    f"postgresql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
-)  # noqa E501
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from app.infra.repository.db import get_db_session, pin_to_primary
 
 
 # NOTE: yieldの返り値は複雑なため、mypyの指摘を一旦無視する。
 def get_db():  # type: ignore
+    # NOTE: 呼び出し元で書き込みを行う可能性があるため、以降の読み取りもプライマリで行う
+    pin_to_primary()
+    db = get_db_session()
     try:
-        db = SessionLocal()
         yield db
     finally:
         db.close()
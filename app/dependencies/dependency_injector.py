@@ -1,24 +1,134 @@
-from injector import Binder, Injector, Module
+import threading
+from typing import Dict, Optional
 
-from app.domain.i_repository.organization import OrganizationIRepository
+from injector import Binder, Injector, Module, provider, singleton
+from openai import AzureOpenAI, OpenAI
+
+from app.config import settings
+from app.domain.i_repository.organization import (
+    OrganizationAsyncIRepository,
+    OrganizationIRepository,
+)
+from app.domain.i_repository.outbox import OutboxIRepository
 from app.domain.i_repository.s3 import S3IRepository
-from app.domain.i_repository.user import UserIRepository
-from app.domain.i_repository.user_organization import UserOrganizationIRepository
-from app.infra.repository.organization import OrganizationRepository
+from app.domain.i_repository.user import UserAsyncIRepository, UserIRepository
+from app.domain.i_repository.user_organization import (
+    UserOrganizationAsyncIRepository,
+    UserOrganizationIRepository,
+)
+from app.infra.repository.azure_openai import create_azure_openai_client
+from app.infra.repository.openai import create_openai_client
+from app.infra.repository.organization import (
+    OrganizationAsyncRepository,
+    OrganizationRepository,
+    OrganizationThreadpoolRepository,
+)
+from app.infra.repository.outbox import OutboxRepository
 from app.infra.repository.s3 import S3Repository
-from app.infra.repository.user import UserRepository
-from app.infra.repository.user_organization import UserOrganizationRepository
+from app.infra.repository.user import (
+    UserAsyncRepository,
+    UserRepository,
+    UserThreadpoolRepository,
+)
+from app.infra.repository.user_organization import (
+    UserOrganizationAsyncRepository,
+    UserOrganizationRepository,
+    UserOrganizationThreadpoolRepository,
+)
+from app.usecase.organization import OrganizationAsyncUsecase, OrganizationUsecase
+from app.usecase.outbox import OutboxUsecase
+from app.usecase.user import UserAsyncUsecase, UserUsecase
+from app.usecase.user_organization import UserOrganizationUsecase
+
+_injector: Optional[Injector] = None
+_injector_lock = threading.Lock()
+
+
+def get_shared_injector() -> Injector:
+    """
+    アプリケーション全体で共有する Injector を取得する。
+    初回の呼び出し時（通常は起動時の lifespan）に作成し、以降は同じものを返す。
+    """
+    global _injector
+    if _injector is None:
+        with _injector_lock:
+            if _injector is None:
+                _injector = Injector([Dependency()])
+    return _injector
+
+
+async def get_injector() -> Injector:
+    """
+    ルーターの Depends 用。共有の Injector を返すだけのため、
+    スレッドプールで実行されないよう async def で定義する
+    """
+    return get_shared_injector()
+
 
+USECASES = (
+    OrganizationUsecase,
+    OrganizationAsyncUsecase,
+    UserUsecase,
+    UserAsyncUsecase,
+    UserOrganizationUsecase,
+    OutboxUsecase,
+)
 
-def get_injector() -> Injector:
-    dependency = Dependency()
-    return Injector([dependency])
+
+def warm_up_injector() -> None:
+    """起動時にシングルトンを作成し、boto3 クライアント等の生成を最初のリクエストで行わないようにする"""
+    injector = get_shared_injector()
+    for usecase in USECASES:
+        injector.get(usecase)
 
 
 class Dependency(Module):
+    """
+    リポジトリ・usecase・外部サービスのクライアントは全てシングルトンとして登録する。
+    DBセッションはリポジトリが保持せず、リクエスト毎の RequestDBContext から取得する。
+
+    NOTE: リクエスト毎に状態を持つクラスを登録する場合は、シングルトンにせず
+    リクエスト内で作成すること（Injector はアプリケーション全体で共有される）。
+    """
+
     def configure(self, binder: Binder) -> None:
-        # NOTE: mypy のバグ。cf: https://qiita.com/yuji38kwmt/items/9ff5f0562c2b3d4787c3
-        binder.bind(interface=OrganizationIRepository, to=OrganizationRepository)  # type: ignore[type-abstract]
-        binder.bind(interface=UserIRepository, to=UserRepository)  # type: ignore[type-abstract]
-        binder.bind(interface=UserOrganizationIRepository, to=UserOrganizationRepository)  # type: ignore[type-abstract]
-        binder.bind(interface=S3IRepository, to=S3Repository)  # type: ignore[type-abstract]
+        repositories: Dict[type, type] = {
+            OrganizationIRepository: OrganizationRepository,
+            UserIRepository: UserRepository,
+            UserOrganizationIRepository: UserOrganizationRepository,
+            S3IRepository: S3Repository,
+            OutboxIRepository: OutboxRepository,
+        }
+        for interface, implementation in repositories.items():
+            binder.bind(interface=interface, to=implementation, scope=singleton)
+
+        # NOTE: 非同期版のリポジトリは、DB_ASYNC_ENABLED が有効な場合は asyncpg の実装、
+        # 無効な場合は同期版のリポジトリをスレッドプールで実行する実装を使う
+        async_repositories: Dict[type, type] = (
+            {
+                OrganizationAsyncIRepository: OrganizationAsyncRepository,
+                UserAsyncIRepository: UserAsyncRepository,
+                UserOrganizationAsyncIRepository: UserOrganizationAsyncRepository,
+            }
+            if settings.DB_ASYNC_ENABLED
+            else {
+                OrganizationAsyncIRepository: OrganizationThreadpoolRepository,
+                UserAsyncIRepository: UserThreadpoolRepository,
+                UserOrganizationAsyncIRepository: UserOrganizationThreadpoolRepository,
+            }
+        )
+        for interface, implementation in async_repositories.items():
+            binder.bind(interface=interface, to=implementation, scope=singleton)
+
+        for usecase in USECASES:
+            binder.bind(usecase, scope=singleton)
+
+    @singleton
+    @provider
+    def provide_openai_client(self) -> OpenAI:
+        return create_openai_client()
+
+    @singleton
+    @provider
+    def provide_azure_openai_client(self) -> AzureOpenAI:
+        return create_azure_openai_client()
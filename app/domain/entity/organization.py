@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import ConfigDict, Field
+from pydantic import ConfigDict, Field, TypeAdapter
 
 from app.domain.constants import NOT_SPECIFIED_ID
 from app.domain.entity.common import CommonEntity
@@ -12,3 +12,9 @@ class Organization(CommonEntity):
     deleted: Optional[bool] = Field(default=None)
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# NOTE: 一覧はリスト全体を1度に検証・シリアライズする。1件ずつ model_validate するより速い
+ORGANIZATION_LIST_ADAPTER: TypeAdapter[List[Organization]] = TypeAdapter(
+    List[Organization]
+)
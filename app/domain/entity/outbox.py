@@ -0,0 +1,32 @@
+import enum
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import ConfigDict, Field
+
+from app.domain.constants import NOT_SPECIFIED_ID
+from app.domain.entity.common import CommonEntity
+
+
+class OutboxEventType(str, enum.Enum):
+    # Cognito 上のユーザーの削除。payload: {"cognito_user_id": str}
+    DELETE_COGNITO_USER = "delete_cognito_user"
+
+
+class OutboxStatus(str, enum.Enum):
+    PENDING = "pending"
+    DONE = "done"
+    # リトライ回数の上限を超えたもの。手動での対応が必要
+    FAILED = "failed"
+
+
+class OutboxEvent(CommonEntity):
+    id: int = Field(default=NOT_SPECIFIED_ID)
+    event_type: OutboxEventType
+    payload: Dict[str, Any]
+    status: OutboxStatus = Field(default=OutboxStatus.PENDING)
+    attempts: int = Field(default=0)
+    next_attempt_at: Optional[datetime] = Field(default=None)
+    last_error: Optional[str] = Field(default=None)
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,13 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """カーソル（キーセット）ページネーションの1ページ分の結果"""
+
+    items: List[T] = Field(default_factory=list)
+    # 次のページがない場合は None
+    next_cursor: Optional[str] = Field(default=None)
@@ -0,0 +1,13 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from app.domain.entity.user import User
+from app.domain.entity.user_organization import UserOrganization
+
+
+class Principal(BaseModel):
+    """リクエストを行った認証済みユーザーと、その所属組織・ロールの情報"""
+
+    user: User
+    user_organizations: List[UserOrganization] = Field(default_factory=list)
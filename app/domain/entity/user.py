@@ -1,9 +1,10 @@
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter
 
 from app.domain.constants import NOT_SPECIFIED_ID
 from app.domain.entity.common import CommonEntity
+from app.domain.entity.user_organization import UserRole
 
 
 class User(CommonEntity):
@@ -14,3 +15,27 @@ class User(CommonEntity):
     deleted: Optional[bool] = Field(default=None)
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# NOTE: 一覧はリスト全体を1度に検証・シリアライズする。1件ずつ model_validate するより速い
+USER_LIST_ADAPTER: TypeAdapter[List[User]] = TypeAdapter(List[User])
+
+
+class UserBulkCreateItem(BaseModel):
+    """一括作成するユーザー1件分。index はリクエスト内の位置"""
+
+    index: int
+    user: User
+    organization_id: int
+    role: UserRole
+    password: str
+
+
+class UserBulkCreateResult(BaseModel):
+    """一括作成の1件分の結果。作成できなかった場合は error に理由を設定する"""
+
+    index: int
+    cognito_user_id: Optional[str] = Field(default=None)
+    email: Optional[str] = Field(default=None)
+    user: Optional[User] = Field(default=None)
+    error: Optional[str] = Field(default=None)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Optional, Set
 
 from app.domain.entity.organization import Organization
 
@@ -18,8 +19,42 @@ class OrganizationIRepository(ABC):
     def is_organization_exist(self, organization_id: int) -> bool:
         pass
 
+    @abstractmethod
+    def get_existing_organization_ids(self, organization_ids: Set[int]) -> Set[int]:
+        pass
+
     @abstractmethod
     def get_all_organizations(
-        self, exclude_deleted: bool = False
+        self,
+        exclude_deleted: bool = False,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+    ) -> list[Organization]:
+        pass
+
+
+class OrganizationAsyncIRepository(ABC):
+    """OrganizationIRepository の非同期版。イベントループをブロックせずにDBへアクセスする。"""
+
+    @abstractmethod
+    async def save_organization(self, organization: Organization) -> Organization:
+        pass
+
+    @abstractmethod
+    async def get_organization(
+        self, organization_id: int, exclude_deleted: bool = False
+    ) -> Organization:
+        pass
+
+    @abstractmethod
+    async def is_organization_exist(self, organization_id: int) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_all_organizations(
+        self,
+        exclude_deleted: bool = False,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
     ) -> list[Organization]:
         pass
@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.domain.entity.outbox import OutboxEvent, OutboxEventType
+
+
+class OutboxIRepository(ABC):
+    @abstractmethod
+    def add_event(
+        self, db: Session, event_type: OutboxEventType, payload: Dict[str, Any]
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def claim_pending_events(self, limit: int, lease_seconds: int) -> List[OutboxEvent]:
+        pass
+
+    @abstractmethod
+    def mark_done(self, event_id: int) -> None:
+        pass
+
+    @abstractmethod
+    def mark_failed(
+        self, event_id: int, error: str, retry_after_seconds: Optional[float]
+    ) -> None:
+        pass
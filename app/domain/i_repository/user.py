@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 
 from sqlalchemy.orm import Session
 
-from app.domain.entity.user import User
+from app.domain.entity.principal import Principal
+from app.domain.entity.user import User, UserBulkCreateItem, UserBulkCreateResult
 from app.domain.entity.user_organization import UserRole
 
 
@@ -13,7 +14,13 @@ class UserIRepository(ABC):
         pass
 
     @abstractmethod
-    def get_users(self, db: Session) -> List[User]:
+    def get_users(
+        self,
+        db: Session,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        organization_id: Optional[int] = None,
+    ) -> List[User]:
         pass
 
     @abstractmethod
@@ -24,16 +31,32 @@ class UserIRepository(ABC):
     def soft_delete_user(self, db: Session, cognito_user_id: str) -> None:
         pass
 
+    @abstractmethod
+    def stream_users(
+        self, organization_id: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        pass
+
     @abstractmethod
     def get_user_by_email(self, email: str) -> User:
         pass
 
+    @abstractmethod
+    def get_principal_by_email(self, email: str) -> Principal:
+        pass
+
     @abstractmethod
     def create_user_with_user_organization(
         self, user: User, organization_id: int, role: UserRole, password: str
     ) -> User:
         pass
 
+    @abstractmethod
+    def bulk_create_users_with_user_organization(
+        self, items: List[UserBulkCreateItem]
+    ) -> List[UserBulkCreateResult]:
+        pass
+
     @abstractmethod
     def disable_user_on_cognito(self, cognito_user_id: str) -> None:
         pass
@@ -45,3 +68,45 @@ class UserIRepository(ABC):
     @abstractmethod
     def delete_user_on_cognito(self, cognito_user_id: str) -> None:
         pass
+
+
+class UserAsyncIRepository(ABC):
+    """
+    UserIRepository の参照系と Cognito の操作の非同期版。
+    DB を更新する処理は同期版のリポジトリを使う。
+    """
+
+    @abstractmethod
+    async def get_users(
+        self,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        organization_id: Optional[int] = None,
+    ) -> List[User]:
+        pass
+
+    @abstractmethod
+    def stream_users(
+        self, organization_id: Optional[int] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        pass
+
+    @abstractmethod
+    async def get_user_by_email(self, email: str) -> User:
+        pass
+
+    @abstractmethod
+    async def get_principal_by_email(self, email: str) -> Principal:
+        pass
+
+    @abstractmethod
+    async def disable_user_on_cognito(self, cognito_user_id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def enable_user_on_cognito(self, cognito_user_id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def delete_user_on_cognito(self, cognito_user_id: str) -> None:
+        pass
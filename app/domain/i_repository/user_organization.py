@@ -33,3 +33,25 @@ class UserOrganizationIRepository(ABC):
     @abstractmethod
     def is_user_in_organization_exist(self, user_id: int, organization_id: int) -> bool:
         pass
+
+
+class UserOrganizationAsyncIRepository(ABC):
+    """UserOrganizationIRepository の参照系の非同期版"""
+
+    @abstractmethod
+    async def get_role_by_user_id_and_organization_id(
+        self, user_id: int, organization_id: int
+    ) -> UserRole:
+        pass
+
+    @abstractmethod
+    async def get_user_organizations_by_user_id(
+        self, user_id: int
+    ) -> List[UserOrganizationEntity]:
+        pass
+
+    @abstractmethod
+    async def is_user_in_organization_exist(
+        self, user_id: int, organization_id: int
+    ) -> bool:
+        pass
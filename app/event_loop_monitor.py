@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopLagMonitor:
+    """
+    イベントループの遅延（ブロックされていた時間）を計測する。
+    一定間隔で sleep し、予定の時刻より遅れて再開した時間を遅延とみなす。
+    遅延が大きい場合、async def の処理の中に同期的な（ブロッキングな）処理がある。
+
+    Args:
+        interval_seconds: 計測の間隔
+        warning_threshold_seconds: この時間以上の遅延を警告としてログに出力する
+        clock: 単調増加する現在時刻を返す関数
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        warning_threshold_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._interval_seconds = interval_seconds
+        self._warning_threshold_seconds = warning_threshold_seconds
+        self._clock = clock
+        self.count = 0
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+        self.total_lag_seconds = 0.0
+
+    def record(self, lag_seconds: float) -> None:
+        self.count += 1
+        self.last_lag_seconds = lag_seconds
+        self.max_lag_seconds = max(self.max_lag_seconds, lag_seconds)
+        self.total_lag_seconds += lag_seconds
+        if lag_seconds >= self._warning_threshold_seconds:
+            logger.warning(
+                f"イベントループが{lag_seconds * 1000:.0f}msブロックされました"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "last_lag_ms": self.last_lag_seconds * 1000,
+            "max_lag_ms": self.max_lag_seconds * 1000,
+            "avg_lag_ms": (
+                self.total_lag_seconds / self.count * 1000 if self.count else 0.0
+            ),
+        }
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """stop がセットされるまで計測を続ける"""
+        while not stop.is_set():
+            expected_at = self._clock() + self._interval_seconds
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self._interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                return
+            self.record(max(self._clock() - expected_at, 0.0))
+
+
+event_loop_monitor = EventLoopLagMonitor(
+    interval_seconds=settings.EVENT_LOOP_MONITOR_INTERVAL_SECONDS,
+    warning_threshold_seconds=settings.EVENT_LOOP_LAG_WARNING_MS / 1000,
+)
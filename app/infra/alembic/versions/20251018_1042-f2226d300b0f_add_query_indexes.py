@@ -0,0 +1,68 @@
+"""add_query_indexes
+
+Revision ID: f2226d300b0f
+Revises: 51cb356d4b23
+Create Date: 2025-10-18 10:42:31.204518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2226d300b0f"
+down_revision: Union[str, None] = "51cb356d4b23"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # NOTE: 運用中のテーブルへの書き込みをロックしないよう、CONCURRENTLY で作成する。
+    # CONCURRENTLY はトランザクション内で実行できないため、autocommit_block の中で実行する。
+    # 作成に失敗すると INVALID なインデックスが残るため、削除してから再実行すること。
+    with op.get_context().autocommit_block():
+        # 所属組織の取得（user_id で絞り込み、updated_at の降順で並べる）
+        op.create_index(
+            "ix_user_organization_user_id_updated_at",
+            "user_organization",
+            ["user_id", "updated_at"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        # 組織に所属するユーザーの一覧・エクスポート（主キーは user_id が先頭のため使えない）
+        op.create_index(
+            "ix_user_organization_organization_id_user_id",
+            "user_organization",
+            ["organization_id", "user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        # 主キーのインデックスと重複しているため削除する
+        # NOTE: 組織の一覧（キーセットページネーションで id 順に取得する）は主キーのインデックスを使う
+        op.drop_index(
+            "ix_organization_id",
+            table_name="organization",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_organization_id",
+            "organization",
+            ["id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_user_organization_organization_id_user_id",
+            table_name="user_organization",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_user_organization_user_id_updated_at",
+            table_name="user_organization",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,177 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import PoolProxiedConnection, QueuePool
+
+from app.config import settings
+
+
+def get_database_url(db_name: Optional[str] = None) -> str:
+    return f"postgresql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{db_name or settings.DB_NAME}"  # noqa E501
+
+
+def to_async_database_url(url: str) -> str:
+    """psycopg2 用の接続文字列を asyncpg 用に変換する"""
+    return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+def get_async_database_url(db_name: Optional[str] = None) -> str:
+    return to_async_database_url(get_database_url(db_name))
+
+
+class PoolCheckoutStats:
+    """コネクションプールからの取得（チェックアウト）にかかった待ち時間を集計する"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.count = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record(self, wait_seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.count,
+                "checkout_timeouts": self.timeouts,
+                "avg_checkout_wait_ms": (
+                    self.total_wait_seconds / self.count * 1000 if self.count else 0.0
+                ),
+                "max_checkout_wait_ms": self.max_wait_seconds * 1000,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """チェックアウトの待ち時間を計測する QueuePool"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = PoolCheckoutStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        started_at = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.checkout_stats.record(time.perf_counter() - started_at, True)
+            raise
+        self.checkout_stats.record(time.perf_counter() - started_at)
+        return connection
+
+
+def create_db_engine(
+    url: Optional[str] = None,
+    connect_timeout_seconds: Optional[int] = None,
+    **kwargs: Any,
+) -> Engine:
+    """
+    アプリケーションで共有するエンジンを作成する。
+    プロセス毎にコネクションプールを1つにするため、エンジンの作成はこの関数に集約する。
+    プールの設定は Settings で調整する。
+
+    Args:
+        url: 接続文字列。省略した場合はプライマリに接続する
+        connect_timeout_seconds: 接続のタイムアウト（秒）。省略した場合はドライバーの既定値
+    """
+    connect_args: Dict[str, Any] = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["options"] = (
+            f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        )
+    if connect_timeout_seconds is not None:
+        connect_args["connect_timeout"] = connect_timeout_seconds
+
+    options: Dict[str, Any] = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+    options.update(kwargs)
+    return create_engine(url or get_database_url(), **options)
+
+
+def get_pool_stats(target_engine: Engine) -> Dict[str, Any]:
+    """プールの使用状況（使用中・オーバーフロー数、チェックアウトの待ち時間）を取得する"""
+    pool = target_engine.pool
+    stats: Dict[str, Any] = {"status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            {
+                "pool_size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "in_use": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+            }
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(pool.checkout_stats.to_dict())
+    return stats
+
+
+def create_async_db_engine(
+    url: Optional[str] = None,
+    connect_timeout_seconds: Optional[int] = None,
+    **kwargs: Any,
+) -> AsyncEngine:
+    """
+    asyncpg を使う非同期エンジンを作成する。
+    プールの設定は同期エンジンと同じ Settings の値を使う。
+    """
+    connect_args: Dict[str, Any] = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+        }
+    if connect_timeout_seconds is not None:
+        connect_args["timeout"] = connect_timeout_seconds
+
+    options: Dict[str, Any] = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+    options.update(kwargs)
+    return create_async_engine(url or get_async_database_url(), **options)
+
+
+engine = create_db_engine()
+
+_async_engine: Optional[AsyncEngine] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    非同期エンジンを取得する。
+    DB_ASYNC_ENABLED が無効な場合は使われないため、初回の呼び出し時に作成する。
+    """
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_db_engine()
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
@@ -1,13 +1,10 @@
-from sqlalchemy import Column, DateTime, create_engine
+from sqlalchemy import Column, DateTime
 from sqlalchemy.orm import Mapped, declarative_base, declared_attr
 from sqlalchemy.sql import func
 
-from app.config import settings
+from app.infra.engine import engine
 
-Engine = create_engine(
-    f"postgresql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}",
-    echo=False,
-)  # noqa E501
+Engine = engine
 ModelBase = declarative_base()
 
 
@@ -8,7 +8,7 @@ from app.infra.models.user_organization import UserOrganization
 class Organization(Base):
     __tablename__ = "organization"
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(255), index=True)
     deleted = Column(Boolean, default=False, nullable=False)
 
@@ -0,0 +1,30 @@
+from sqlalchemy import JSON, Column, DateTime, Enum, Index, Integer, String
+from sqlalchemy.sql import func
+
+from app.domain.entity.outbox import OutboxEventType, OutboxStatus
+from app.infra.models.base import Base
+
+
+class Outbox(Base):
+    __tablename__ = "outbox"
+    __table_args__ = (
+        # 処理待ちのイベントの取得用
+        Index("ix_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event_type = Column(
+        Enum(OutboxEventType, name="event_type", native_enum=False, length=255),
+        nullable=False,
+    )
+    payload = Column(JSON, nullable=False)
+    status = Column(
+        Enum(OutboxStatus, name="status", native_enum=False, length=255),
+        nullable=False,
+        default=OutboxStatus.PENDING,
+    )
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_error = Column(String, nullable=True)
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, Enum, ForeignKey, Integer
+from sqlalchemy import Column, Enum, ForeignKey, Index, Integer
 
 from app.domain.entity.user_organization import UserRole
 from app.infra.models.base import Base
@@ -12,6 +12,16 @@ if TYPE_CHECKING:
 
 class UserOrganization(Base):
     __tablename__ = "user_organization"
+    __table_args__ = (
+        # ユーザーの所属組織を更新日時順に取得する用
+        Index("ix_user_organization_user_id_updated_at", "user_id", "updated_at"),
+        # 組織に所属するユーザーの取得用（主キーは user_id が先頭のため）
+        Index(
+            "ix_user_organization_organization_id_user_id",
+            "organization_id",
+            "user_id",
+        ),
+    )
     user_id = Column(Integer, ForeignKey("user.id"), primary_key=True)
     organization_id = Column(Integer, ForeignKey("organization.id"), primary_key=True)
     role = Column(
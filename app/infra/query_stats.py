@@ -0,0 +1,204 @@
+import logging
+import math
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import Connection, ExceptionContext
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_START_TIMES_KEY = "query_stats_start_times"
+
+# フィンガープリント毎に保持する実行時間のサンプル数
+STATEMENT_SAMPLE_SIZE = 1000
+# 集計するフィンガープリントの種類の上限
+MAX_FINGERPRINTS = 1000
+
+_STRING_PATTERN = re.compile(r"'(?:[^']|'')*'")
+_PARAMETER_PATTERN = re.compile(r"%\(\w+\)s|\$\d+|\?")
+_NUMBER_PATTERN = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST_PATTERN = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS_PATTERN = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    SQLからバインドパラメータ・リテラルを除いたフィンガープリントを作る。
+    IN 句の値の数や複数行の VALUES の行数が違っても、同じフィンガープリントになる。
+    """
+    normalized = _STRING_PATTERN.sub("?", statement)
+    normalized = _PARAMETER_PATTERN.sub("?", normalized)
+    normalized = _NUMBER_PATTERN.sub("?", normalized)
+    normalized = _LIST_PATTERN.sub("(...)", normalized)
+    normalized = _ROWS_PATTERN.sub("(...)", normalized)
+    return _WHITESPACE_PATTERN.sub(" ", normalized).strip()
+
+
+class QueryStats:
+    """
+    実行したSQLの件数と合計時間を集計する。
+    スレッドプールで実行される処理からも更新できるよう、ミュータブルなオブジェクトで持つ。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.statements[statement] += 1
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """threshold 回以上実行されたSQL（N+1 の可能性があるもの）を返す"""
+        if threshold <= 0:
+            return []
+        with self._lock:
+            return [
+                (statement, count)
+                for statement, count in self.statements.most_common()
+                if count >= threshold
+            ]
+
+
+class _StatementEntry:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.samples: Deque[float] = deque(maxlen=STATEMENT_SAMPLE_SIZE)
+
+
+class StatementStats:
+    """
+    プロセス内で実行したSQLの実行時間を、フィンガープリント毎に集計する。
+    パーセンタイルは直近の STATEMENT_SAMPLE_SIZE 件の実行時間から計算する。
+    フィンガープリントが MAX_FINGERPRINTS 種類を超えた場合、新しいものは集計しない。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _StatementEntry] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        key = fingerprint(statement)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= MAX_FINGERPRINTS:
+                    return
+                entry = self._entries[key] = _StatementEntry()
+            entry.count += 1
+            entry.total_seconds += seconds
+            entry.max_seconds = max(entry.max_seconds, seconds)
+            entry.samples.append(seconds)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """フィンガープリント毎の集計を、合計時間の長い順に返す"""
+        with self._lock:
+            entries = [
+                (key, entry.count, entry.total_seconds, entry.max_seconds)
+                + (sorted(entry.samples),)
+                for key, entry in self._entries.items()
+            ]
+        return [
+            {
+                "fingerprint": key,
+                "count": count,
+                "total_ms": total_seconds * 1000,
+                "p50_ms": _percentile(samples, 0.5) * 1000,
+                "p95_ms": _percentile(samples, 0.95) * 1000,
+                "max_ms": max_seconds * 1000,
+            }
+            for key, count, total_seconds, max_seconds, samples in sorted(
+                entries, key=lambda entry: entry[2], reverse=True
+            )
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _percentile(sorted_samples: List[float], ratio: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = max(math.ceil(len(sorted_samples) * ratio) - 1, 0)
+    return sorted_samples[index]
+
+
+statement_stats = StatementStats()
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def collect_query_stats() -> Iterator[QueryStats]:
+    """スコープ内で実行したSQLを集計する。リクエスト毎の集計は Middleware で行う"""
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def _record(statement: str, seconds: float) -> None:
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+    statement_stats.record(statement, seconds)
+    threshold_ms = settings.DB_SLOW_QUERY_THRESHOLD_MS
+    if threshold_ms > 0 and seconds * 1000 >= threshold_ms:
+        logger.warning(f"スロークエリ: {seconds * 1000:.1f}ms {fingerprint(statement)}")
+
+
+# NOTE: Engine クラスに登録し、プライマリ・レプリカ・非同期エンジンの全てを集計対象にする
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    conn.info.setdefault(_START_TIMES_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    start_times = conn.info.get(_START_TIMES_KEY)
+    if start_times:
+        _record(statement, time.perf_counter() - start_times.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context: ExceptionContext) -> None:
+    # NOTE: エラー時は after_cursor_execute が呼ばれないため、ここで集計して開始時刻を破棄する
+    if context.connection is None or context.statement is None:
+        return
+    start_times = context.connection.info.get(_START_TIMES_KEY)
+    if start_times:
+        _record(context.statement, time.perf_counter() - start_times.pop())
@@ -0,0 +1,94 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class TokenBucket:
+    """
+    トークンバケットによるレート制限。
+    1秒あたり rate 個のトークンが補充され、最大 capacity 個まで貯まる。
+    複数スレッドから共有されるため、操作はロックで保護する。
+
+    Args:
+        rate: 1秒あたりに許可する呼び出し数。0以下の場合は制限しない。
+        capacity: 連続して許可する呼び出し数の上限（省略時は rate と同じ）
+        clock: 単調増加する現在時刻を返す関数
+        sleep: 待機に使う関数
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        トークンを1つ取得する。トークンがない場合は補充されるまで待機する。
+
+        Returns:
+            float: 待機した秒数
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            # NOTE: 先にトークンを消費して待ち時間を確定させ、待機はロックの外で行う
+            self._tokens -= 1
+            wait_seconds = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait_seconds > 0:
+            self._sleep(wait_seconds)
+        return wait_seconds
+
+
+def backoff_delay(
+    attempt: int,
+    base_seconds: float,
+    max_seconds: float,
+    rand: Callable[[float, float], float] = random.uniform,
+) -> float:
+    """指数バックオフの待機時間（Full Jitter）。attempt は0始まりのリトライ回数"""
+    return rand(0, min(max_seconds, base_seconds * 2**attempt))
+
+
+class RateLimitStats:
+    """API毎の呼び出し数・スロットリング回数・待機時間を集計する"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def record(
+        self,
+        api: str,
+        calls: int = 0,
+        throttled: int = 0,
+        failed: int = 0,
+        wait_seconds: float = 0.0,
+    ) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(
+                api, {"calls": 0, "throttled": 0, "failed": 0, "wait_seconds": 0.0}
+            )
+            stats["calls"] += calls
+            stats["throttled"] += throttled
+            stats["failed"] += failed
+            stats["wait_seconds"] += wait_seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {api: dict(stats) for api, stats in self._stats.items()}
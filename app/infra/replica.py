@@ -0,0 +1,187 @@
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import Engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.infra.engine import (
+    create_async_db_engine,
+    create_db_engine,
+    get_pool_stats,
+    to_async_database_url,
+)
+
+logger = logging.getLogger(__name__)
+
+ROUND_ROBIN = "round_robin"
+LEAST_CONNECTIONS = "least_connections"
+
+
+class Replica:
+    """
+    リードレプリカ1台分の接続先。
+    エンジンはレプリカ毎に持ち、最初に使われた時に作成する。
+    """
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.healthy = True
+        self.checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._engine: Optional[Engine] = None
+        self._async_engine: Optional[AsyncEngine] = None
+        self._session_local: Optional[sessionmaker[Session]] = None
+        self._async_session_local: Optional[async_sessionmaker[AsyncSession]] = None
+
+    @property
+    def engine(self) -> Engine:
+        with self._lock:
+            if self._engine is None:
+                self._engine = create_db_engine(
+                    self.url,
+                    connect_timeout_seconds=settings.DB_REPLICA_CONNECT_TIMEOUT_SECONDS,
+                )
+            return self._engine
+
+    @property
+    def async_engine(self) -> AsyncEngine:
+        with self._lock:
+            if self._async_engine is None:
+                self._async_engine = create_async_db_engine(
+                    to_async_database_url(self.url),
+                    connect_timeout_seconds=settings.DB_REPLICA_CONNECT_TIMEOUT_SECONDS,
+                )
+            return self._async_engine
+
+    def create_session(self) -> Session:
+        if self._session_local is None:
+            self._session_local = sessionmaker(
+                autocommit=False, autoflush=False, bind=self.engine
+            )
+        return self._session_local()
+
+    def create_async_session(self) -> AsyncSession:
+        if self._async_session_local is None:
+            self._async_session_local = async_sessionmaker(
+                bind=self.async_engine, autoflush=False, expire_on_commit=False
+            )
+        return self._async_session_local()
+
+    def ping(self) -> bool:
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            return True
+        except Exception as e:
+            logger.warning(f"リードレプリカに接続できません: {e}")
+            return False
+
+    def in_use(self) -> int:
+        """使用中のコネクション数（同期・非同期エンジンの合計）"""
+        count = 0
+        for engine in (self._engine, self._async_engine):
+            pool = engine.pool if engine is not None else None
+            if isinstance(pool, QueuePool):
+                count += pool.checkedout()
+        return count
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"healthy": self.healthy, "in_use": self.in_use()}
+        if self._engine is not None:
+            stats.update(get_pool_stats(self._engine))
+        return stats
+
+    def dispose(self) -> None:
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+            self._session_local = None
+
+    async def dispose_async(self) -> None:
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+            self._async_engine = None
+            self._async_session_local = None
+
+
+class ReplicaRouter:
+    """
+    読み取り専用のセッションの接続先となるリードレプリカを選択する。
+
+    - policy が round_robin の場合は順番に、least_connections の場合は
+      使用中のコネクションが最も少ないレプリカを選ぶ。
+    - ヘルスチェックは間隔毎に行い、異常なレプリカは次のチェックまで選ばない。
+    - 利用できるレプリカがない場合は None を返し、呼び出し元はプライマリを使う。
+    """
+
+    def __init__(
+        self,
+        replicas: List[Replica],
+        policy: str = ROUND_ROBIN,
+        health_check_interval_seconds: float = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if policy not in (ROUND_ROBIN, LEAST_CONNECTIONS):
+            raise ValueError(f"不明なレプリカの選択方法です: {policy}")
+        self.replicas = replicas
+        self._policy = policy
+        self._health_check_interval_seconds = health_check_interval_seconds
+        self._clock = clock
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def choose(self) -> Optional[Replica]:
+        candidates = [replica for replica in self.replicas if self._is_healthy(replica)]
+        if not candidates:
+            return None
+        if self._policy == LEAST_CONNECTIONS:
+            return min(candidates, key=lambda replica: replica.in_use())
+        with self._lock:
+            index = next(self._counter)
+        return candidates[index % len(candidates)]
+
+    async def choose_async(self) -> Optional[Replica]:
+        # NOTE: ヘルスチェックはブロッキングな接続を伴うため、必要な場合のみスレッドプールで行う
+        if any(self._needs_health_check(replica) for replica in self.replicas):
+            return await run_in_threadpool(self.choose)
+        return self.choose()
+
+    def mark_unhealthy(self, replica: Replica) -> None:
+        """接続エラーが発生したレプリカを、次のヘルスチェックまで選ばないようにする"""
+        logger.warning(f"リードレプリカを切り離します: {replica.url.split('@')[-1]}")
+        replica.healthy = False
+        replica.checked_at = self._clock()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [replica.to_dict() for replica in self.replicas]
+
+    def _needs_health_check(self, replica: Replica) -> bool:
+        return (
+            replica.checked_at is None
+            or self._clock() - replica.checked_at >= self._health_check_interval_seconds
+        )
+
+    def _is_healthy(self, replica: Replica) -> bool:
+        if self._needs_health_check(replica):
+            replica.checked_at = self._clock()
+            replica.healthy = replica.ping()
+        return replica.healthy
+
+
+def create_replica_router() -> ReplicaRouter:
+    urls = [url.strip() for url in settings.DB_REPLICA_URLS.split(",") if url.strip()]
+    return ReplicaRouter(
+        replicas=[Replica(url) for url in urls],
+        policy=settings.DB_REPLICA_POLICY,
+        health_check_interval_seconds=settings.DB_REPLICA_HEALTH_CHECK_INTERVAL_SECONDS,
+    )
+
+
+replica_router = create_replica_router()
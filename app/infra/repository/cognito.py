@@ -1,17 +1,49 @@
+import asyncio
 import logging
-from typing import cast
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, TypeVar, cast
 from unittest.mock import MagicMock
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from botocore.exceptions import ConnectionError as BotocoreConnectionError
+from botocore.exceptions import HTTPClientError
 from mypy_boto3_cognito_idp import CognitoIdentityProviderClient
 
 from app.config import settings
+from app.infra.rate_limiter import RateLimitStats, TokenBucket, backoff_delay
 from app.infra.repository.error_codes import CognitoErrorCode
 from app.usecase.error import EntityNotFoundError
 
 logger = logging.getLogger(__name__)
 
+_cognito_client: Optional[CognitoIdentityProviderClient] = None
+_cognito_executor: Optional[ThreadPoolExecutor] = None
+_rate_limiters: Dict[str, TokenBucket] = {}
+_lock = threading.Lock()
+
+T = TypeVar("T")
+
+THROTTLING_ERROR_CODES = {
+    CognitoErrorCode.TOO_MANY_REQUESTS_EXCEPTION,
+    CognitoErrorCode.THROTTLING_EXCEPTION,
+}
+
+# 通信の切断・タイムアウト（botocore の標準のリトライと同じく、一時的なエラーとして扱う）
+TRANSIENT_ERRORS = (BotocoreConnectionError, HTTPClientError)
+
+cognito_rate_limit_stats = RateLimitStats()
+
+
+class CognitoApi:
+    SIGN_UP = "SignUp"
+    ADMIN_DISABLE_USER = "AdminDisableUser"
+    ADMIN_ENABLE_USER = "AdminEnableUser"
+    ADMIN_DELETE_USER = "AdminDeleteUser"
+
 
 def create_cognito_client() -> CognitoIdentityProviderClient:
     try:
@@ -36,18 +68,149 @@ def create_cognito_client() -> CognitoIdentityProviderClient:
                 aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
                 aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
                 aws_session_token=settings.AWS_SESSION_TOKEN,
+                config=Config(
+                    max_pool_connections=settings.COGNITO_MAX_POOL_CONNECTIONS,
+                    retries={
+                        # NOTE: スロットリング・通信エラー・5xx のリトライは
+                        # call_cognito_api のレート制限とバックオフで扱う。
+                        # botocore 側でもリトライするとリトライが入れ子になり、
+                        # リトライ分の呼び出しがレート制限を通らないため、botocore ではリトライしない
+                        # （max_attempts はリトライ回数として扱われるため、total_max_attempts で指定する）
+                        "mode": "standard",
+                        "total_max_attempts": 1,
+                    },
+                    connect_timeout=settings.COGNITO_CONNECT_TIMEOUT_SECONDS,
+                    read_timeout=settings.COGNITO_READ_TIMEOUT_SECONDS,
+                ),
             )
     except Exception as e:
         raise RuntimeError(f"Failed to create a Cognito client: {e}")
 
 
+def get_cognito_client() -> CognitoIdentityProviderClient:
+    """
+    プロセス全体で共有する Cognito クライアントを取得する。
+    boto3 のクライアントはスレッドセーフなため、コネクションプールを使い回す。
+    """
+    global _cognito_client
+    if _cognito_client is None:
+        with _lock:
+            if _cognito_client is None:
+                _cognito_client = create_cognito_client()
+    return _cognito_client
+
+
+def get_cognito_executor() -> ThreadPoolExecutor:
+    """Cognito の非同期版の呼び出しとユーザーの一括作成で共有するスレッドプール"""
+    global _cognito_executor
+    if _cognito_executor is None:
+        with _lock:
+            if _cognito_executor is None:
+                _cognito_executor = ThreadPoolExecutor(
+                    max_workers=settings.COGNITO_MAX_POOL_CONNECTIONS,
+                    thread_name_prefix="cognito",
+                )
+    return _cognito_executor
+
+
+def shutdown_cognito_executor() -> None:
+    global _cognito_executor
+    with _lock:
+        if _cognito_executor is not None:
+            _cognito_executor.shutdown(wait=True)
+            _cognito_executor = None
+
+
+def get_rate_limiter(api: str) -> TokenBucket:
+    """Cognito API 毎のレート制限（プロセス内で共有する）"""
+    with _lock:
+        if api not in _rate_limiters:
+            rate_limits = {
+                CognitoApi.SIGN_UP: settings.COGNITO_SIGN_UP_RATE_LIMIT,
+                CognitoApi.ADMIN_DISABLE_USER: settings.COGNITO_ADMIN_DISABLE_USER_RATE_LIMIT,
+                CognitoApi.ADMIN_ENABLE_USER: settings.COGNITO_ADMIN_ENABLE_USER_RATE_LIMIT,
+                CognitoApi.ADMIN_DELETE_USER: settings.COGNITO_ADMIN_DELETE_USER_RATE_LIMIT,
+            }
+            _rate_limiters[api] = TokenBucket(rate=rate_limits[api])
+        return _rate_limiters[api]
+
+
+def is_retryable_error(e: Exception) -> bool:
+    """スロットリング以外でリトライする一時的なエラー（通信エラー・5xx）か"""
+    if isinstance(e, TRANSIENT_ERRORS):
+        return True
+    if isinstance(e, ClientError):
+        status_code = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        return status_code >= 500
+    return False
+
+
+def call_cognito_api(api: str, call: Callable[[], T]) -> T:
+    """
+    Cognito API をレート制限付きで呼び出す。
+    スロットリング・通信エラー・5xx の場合は、ジッター付きの指数バックオフでリトライする。
+    """
+    limiter = get_rate_limiter(api)
+    attempt = 0
+    while True:
+        wait_seconds = limiter.acquire()
+        try:
+            result = call()
+        except (ClientError, *TRANSIENT_ERRORS) as e:
+            throttled = isinstance(e, ClientError) and (
+                e.response["Error"]["Code"] in THROTTLING_ERROR_CODES
+            )
+            if not throttled and not is_retryable_error(e):
+                cognito_rate_limit_stats.record(api, calls=1, wait_seconds=wait_seconds)
+                raise
+            if attempt >= settings.COGNITO_THROTTLE_MAX_RETRIES:
+                logger.error(
+                    f"Cognito API の呼び出しがリトライしても成功しません: {api}, {e}"
+                )
+                cognito_rate_limit_stats.record(
+                    api,
+                    calls=1,
+                    throttled=int(throttled),
+                    failed=1,
+                    wait_seconds=wait_seconds,
+                )
+                raise
+            delay = backoff_delay(
+                attempt,
+                base_seconds=settings.COGNITO_THROTTLE_BASE_DELAY_SECONDS,
+                max_seconds=settings.COGNITO_THROTTLE_MAX_DELAY_SECONDS,
+            )
+            if throttled:
+                logger.warning(
+                    f"Cognito API がスロットリングされました。{delay:.2f}秒後にリトライします: {api}"
+                )
+            else:
+                logger.warning(
+                    f"Cognito API の呼び出しに失敗しました。{delay:.2f}秒後にリトライします: {api}, {e}"
+                )
+            cognito_rate_limit_stats.record(
+                api,
+                calls=1,
+                throttled=int(throttled),
+                wait_seconds=wait_seconds + delay,
+            )
+            time.sleep(delay)
+            attempt += 1
+            continue
+        cognito_rate_limit_stats.record(api, calls=1, wait_seconds=wait_seconds)
+        return result
+
+
 def disable_user(cognito_user_id: str) -> None:
     """Cognito上のユーザーを無効化する"""
     try:
-        cognito_client = create_cognito_client()
-        cognito_client.admin_disable_user(
-            UserPoolId=settings.COGNITO_USER_POOL_ID,
-            Username=cognito_user_id,
+        cognito_client = get_cognito_client()
+        call_cognito_api(
+            CognitoApi.ADMIN_DISABLE_USER,
+            lambda: cognito_client.admin_disable_user(
+                UserPoolId=settings.COGNITO_USER_POOL_ID,
+                Username=cognito_user_id,
+            ),
         )
         logger.info(f"Cognitoユーザーを無効化しました: {cognito_user_id}")
     except ClientError as e:
@@ -72,10 +235,13 @@ def disable_user(cognito_user_id: str) -> None:
 def enable_user(cognito_user_id: str) -> None:
     """Cognito上のユーザーを再有効化する"""
     try:
-        cognito_client = create_cognito_client()
-        cognito_client.admin_enable_user(
-            UserPoolId=settings.COGNITO_USER_POOL_ID,
-            Username=cognito_user_id,
+        cognito_client = get_cognito_client()
+        call_cognito_api(
+            CognitoApi.ADMIN_ENABLE_USER,
+            lambda: cognito_client.admin_enable_user(
+                UserPoolId=settings.COGNITO_USER_POOL_ID,
+                Username=cognito_user_id,
+            ),
         )
         logger.info(f"Cognitoユーザーを再有効化しました: {cognito_user_id}")
     except ClientError as e:
@@ -98,10 +264,13 @@ def enable_user(cognito_user_id: str) -> None:
 def delete_user(cognito_user_id: str) -> None:
     """Cognito上のユーザーを完全に削除する"""
     try:
-        cognito_client = create_cognito_client()
-        cognito_client.admin_delete_user(
-            UserPoolId=settings.COGNITO_USER_POOL_ID,
-            Username=cognito_user_id,
+        cognito_client = get_cognito_client()
+        call_cognito_api(
+            CognitoApi.ADMIN_DELETE_USER,
+            lambda: cognito_client.admin_delete_user(
+                UserPoolId=settings.COGNITO_USER_POOL_ID,
+                Username=cognito_user_id,
+            ),
         )
         logger.info(f"Cognitoユーザーを削除しました: {cognito_user_id}")
     except ClientError as e:
@@ -114,3 +283,21 @@ def delete_user(cognito_user_id: str) -> None:
     except Exception as e:
         logger.error(f"エラーが発生しました（Cognito削除）: {e}")
         raise
+
+
+async def disable_user_async(cognito_user_id: str) -> None:
+    """disable_user の非同期版"""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(get_cognito_executor(), disable_user, cognito_user_id)
+
+
+async def enable_user_async(cognito_user_id: str) -> None:
+    """enable_user の非同期版"""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(get_cognito_executor(), enable_user, cognito_user_id)
+
+
+async def delete_user_async(cognito_user_id: str) -> None:
+    """delete_user の非同期版"""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(get_cognito_executor(), delete_user, cognito_user_id)
@@ -1,16 +1,246 @@
-from contextlib import contextmanager
-from typing import Generator
+import functools
+import logging
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Coroutine,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    ParamSpec,
+    TypeVar,
+)
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
+from starlette.concurrency import run_in_threadpool
 
-from app.config import settings
+from app.infra.engine import engine, get_async_engine
+from app.infra.replica import Replica, replica_router
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+T = TypeVar("T")
 
-engine = create_engine(
-    f"postgresql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
-)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+_async_session_local: Optional[async_sessionmaker[AsyncSession]] = None
+
+_AFTER_COMMIT_CALLBACKS_KEY = "after_commit_callbacks"
+
+
+def run_after_commit(db: Session, callback: Callable[[], None]) -> None:
+    """
+    トランザクションのコミット後に callback を実行する。
+    キャッシュの破棄など、コミット前に行うと他のリクエストが古い値を参照しうる処理に使う。
+
+    NOTE: 最も外側のトランザクションがロールバックされた場合は実行しない。
+    入れ子のスコープ（セーブポイント）のみがロールバックされた場合は実行されるため、
+    余分に実行されても問題ない処理のみ登録すること。
+    """
+    callbacks: List[Callable[[], None]] = db.info.setdefault(
+        _AFTER_COMMIT_CALLBACKS_KEY, []
+    )
+    callbacks.append(callback)
+
+
+# NOTE: Session クラスに登録し、同期・非同期（AsyncSession.sync_session）の全てのセッションを対象にする
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session) -> None:
+    # セーブポイントの解放でも呼ばれるため、最も外側のトランザクションのコミットのみ対象にする
+    if session.in_nested_transaction():
+        return
+    for callback in session.info.pop(_AFTER_COMMIT_CALLBACKS_KEY, []):
+        callback()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_commit_callbacks(
+    session: Session, previous_transaction: SessionTransaction
+) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_AFTER_COMMIT_CALLBACKS_KEY, None)
+
+
+class RequestDBContext:
+    """
+    リクエスト内で共有するDBの状態（Unit of Work）。
+    リクエスト内のリポジトリ呼び出しは、このセッションを共有して1つの接続で処理する。
+    スレッドプールで実行される処理からも更新できるよう、ミュータブルなオブジェクトで持つ。
+
+    NOTE: セッションはスレッドセーフではないため、1リクエスト内でDBアクセスを並行に行わないこと。
+    """
+
+    def __init__(self) -> None:
+        # 書き込み後はレプリカの遅延を避けるため、読み取りもプライマリで行う
+        self.primary_pinned = False
+        self.write_depth = 0
+        self.read_depth = 0
+        self.replica: Optional[Replica] = None
+        self._session: Optional[Session] = None
+        self._async_session: Optional[AsyncSession] = None
+        self._replica_sessions: Dict[Replica, Session] = {}
+        self._async_replica_sessions: Dict[Replica, AsyncSession] = {}
+
+    def get_session(self) -> Session:
+        if self._session is None:
+            self._session = get_db_session()
+        return self._session
+
+    def get_replica_session(self, replica: Replica) -> Session:
+        if replica not in self._replica_sessions:
+            self._replica_sessions[replica] = replica.create_session()
+        return self._replica_sessions[replica]
+
+    def get_async_session(self) -> AsyncSession:
+        if self._async_session is None:
+            self._async_session = get_async_db_session()
+        return self._async_session
+
+    def get_async_replica_session(self, replica: Replica) -> AsyncSession:
+        if replica not in self._async_replica_sessions:
+            self._async_replica_sessions[replica] = replica.create_async_session()
+        return self._async_replica_sessions[replica]
+
+    def choose_replica(self) -> Optional[Replica]:
+        """
+        リクエスト内で使うレプリカを選ぶ。接続を使い回すため、同じレプリカを使い続ける。
+        プライマリに固定されている場合は None を返す。
+        """
+        if self.primary_pinned:
+            return None
+        if self.replica is None or not self.replica.healthy:
+            self.replica = replica_router.choose()
+        return self.replica
+
+    async def choose_replica_async(self) -> Optional[Replica]:
+        if self.primary_pinned:
+            return None
+        if self.replica is None or not self.replica.healthy:
+            self.replica = await replica_router.choose_async()
+        return self.replica
+
+    def should_end_read(self, failed: bool) -> bool:
+        """
+        読み取りのスコープを抜ける際に、トランザクションを終了するかどうか。
+        書き込みのスコープ内の場合は、書き込みのスコープでコミット・ロールバックする。
+        """
+        return self.write_depth == 0 and (failed or self.read_depth == 0)
+
+    def discard_replica(self, replica: Replica) -> None:
+        """接続エラーが発生したレプリカのセッションを破棄する"""
+        session = self._replica_sessions.pop(replica, None)
+        if session is not None:
+            session.close()
+
+    async def discard_replica_async(self, replica: Replica) -> None:
+        async_session = self._async_replica_sessions.pop(replica, None)
+        if async_session is not None:
+            await async_session.close()
+
+    async def close(self) -> None:
+        """未コミットの変更を破棄し、接続をプールに返す"""
+        sessions = list(self._replica_sessions.values())
+        if self._session is not None:
+            sessions.append(self._session)
+        for session in sessions:
+            # NOTE: 接続の返却はブロッキングな処理のため、スレッドプールで行う
+            await run_in_threadpool(session.close)
+
+        async_sessions = list(self._async_replica_sessions.values())
+        if self._async_session is not None:
+            async_sessions.append(self._async_session)
+        for async_session in async_sessions:
+            await async_session.close()
+
+
+_request_db_context: ContextVar[Optional[RequestDBContext]] = ContextVar(
+    "request_db_context", default=None
+)
+
+
+@asynccontextmanager
+async def request_db_context() -> AsyncGenerator[RequestDBContext, None]:
+    """リクエストの処理中に RequestDBContext を有効にし、終了時にセッションを閉じる"""
+    context = RequestDBContext()
+    token = _request_db_context.set(context)
+    try:
+        yield context
+    finally:
+        _request_db_context.reset(token)
+        await context.close()
+
+
+def pin_to_primary() -> None:
+    """リクエストの残りの読み取りをプライマリで行うようにする（read your writes）"""
+    context = _request_db_context.get()
+    if context is not None:
+        context.primary_pinned = True
+
+
+class ReplicaUnavailableError(Exception):
+    """リードレプリカとの接続が切れ、読み取りに失敗した場合のエラー"""
+
+
+# プライマリで読み取りをやり直している間は、レプリカを選ばない
+_read_from_primary: ContextVar[bool] = ContextVar("read_from_primary", default=False)
+
+
+def _is_disconnect(e: Optional[BaseException]) -> bool:
+    # NOTE: リポジトリで別の例外に変換されている場合があるため、原因の例外も確認する
+    if e is not None and not isinstance(e, exc.DBAPIError):
+        e = e.__cause__
+    return isinstance(e, exc.DBAPIError) and (
+        e.connection_invalidated or isinstance(e, exc.OperationalError)
+    )
+
+
+def retry_read_on_primary(func: Callable[P, T]) -> Callable[P, T]:
+    """
+    リードレプリカとの接続が切れて読み取りに失敗した場合に、プライマリで1度だけやり直す。
+    読み取りのみを行うリポジトリのメソッドに付ける（途中まで返したジェネレーターはやり直せないため使わない）。
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        try:
+            return func(*args, **kwargs)
+        except ReplicaUnavailableError as e:
+            logger.warning(f"プライマリで読み取りをやり直します: {e.__cause__}")
+            token = _read_from_primary.set(True)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _read_from_primary.reset(token)
+
+    return wrapper
+
+
+def async_retry_read_on_primary(
+    func: Callable[P, Coroutine[Any, Any, T]],
+) -> Callable[P, Coroutine[Any, Any, T]]:
+    """retry_read_on_primary の非同期版"""
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        try:
+            return await func(*args, **kwargs)
+        except ReplicaUnavailableError as e:
+            logger.warning(f"プライマリで読み取りをやり直します: {e.__cause__}")
+            token = _read_from_primary.set(True)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _read_from_primary.reset(token)
+
+    return wrapper
+
 
 def get_db_session() -> Session:
     """
@@ -31,32 +261,210 @@ def transaction_scope() -> Generator[Session, None, None]:
     """
     トランザクションスコープを管理するコンテキストマネージャ。
     トランザクションを開始し、エラー時にロールバック、正常終了時にコミットする。
+    リクエスト内ではリクエストのセッションを使い、入れ子の場合はセーブポイントを使う。
 
     Yields:
         Session: トランザクション中のセッションオブジェクト
     """
-    db = get_db_session()
+    pin_to_primary()
+    context = _request_db_context.get()
+    if context is None:
+        db = get_db_session()
+        try:
+            yield db
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise e
+        finally:
+            db.close()
+        return
+
+    db = context.get_session()
+    context.write_depth += 1
     try:
-        yield db
-        db.commit()
-    except Exception as e:
-        db.rollback()
-        raise e
+        if context.write_depth > 1:
+            # NOTE: 入れ子のスコープで失敗した場合は、そのスコープの変更のみロールバックする
+            with db.begin_nested():
+                yield db
+        else:
+            try:
+                yield db
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                raise e
     finally:
-        db.close()
+        context.write_depth -= 1
 
 
 @contextmanager
-def readonly_transaction_scope() -> Generator[Session, None, None]:
+def readonly_transaction_scope(primary: bool = False) -> Generator[Session, None, None]:
     """
     読み取り専用のトランザクションスコープを管理するコンテキストマネージャ。
-    トランザクションを開始するが、commit や rollback を行わない。
+    トランザクションを開始するが、読み取りのみのため commit は行わない。
+    リードレプリカが設定されている場合はレプリカに接続する。
+    リクエスト内ではリクエストのセッションを使い、書き込み中の場合は同じトランザクションで読み取る。
+
+    リクエスト内では、最も外側の読み取りのスコープを抜けた時点でトランザクションを終了し、
+    Cognito の呼び出しなどの間に接続を idle in transaction のままにしない。
+
+    レプリカとの接続が切れた場合は、そのレプリカを切り離して ReplicaUnavailableError を送出する。
+    呼び出し元のメソッドに retry_read_on_primary を付けると、プライマリでやり直す。
+
+    Args:
+        primary: レプリカの遅延が許されない読み取りの場合に True を指定し、プライマリで読み取る
 
     Yields:
         Session: トランザクション中のセッションオブジェクト
     """
-    db = get_db_session()
+    primary = primary or _read_from_primary.get()
+    context = _request_db_context.get()
+    if context is None:
+        replica = None if primary else replica_router.choose()
+        db = replica.create_session() if replica is not None else get_db_session()
+    else:
+        replica = None if primary else context.choose_replica()
+        db = (
+            context.get_replica_session(replica)
+            if replica is not None
+            else context.get_session()
+        )
+        context.read_depth += 1
+    failed = False
+    try:
+        yield db
+    except Exception as e:
+        failed = True
+        if replica is not None and _is_disconnect(e):
+            replica_router.mark_unhealthy(replica)
+            if context is not None:
+                context.discard_replica(replica)
+            raise ReplicaUnavailableError(
+                "リードレプリカでの読み取りに失敗しました"
+            ) from e
+        raise
+    finally:
+        if context is None:
+            db.close()
+        else:
+            context.read_depth -= 1
+            # NOTE: 失敗した場合もロールバックし、以降のスコープで PendingRollbackError にならないようにする
+            if context.should_end_read(failed):
+                db.rollback()
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """
+    非同期セッションのファクトリを取得する。
+    非同期エンジンと同じく、初回の呼び出し時に作成する。
+    """
+    global _async_session_local
+    if _async_session_local is None:
+        # NOTE: コミット後にエンティティへ変換するため、コミット時に属性を失効させない
+        _async_session_local = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_local
+
+
+def get_async_db_session() -> AsyncSession:
+    """
+    新しい非同期セッションオブジェクトを取得する。
+
+    Returns:
+        AsyncSession: SQLAlchemyの非同期セッションオブジェクト
+    """
+    try:
+        return get_async_sessionmaker()()
+    except Exception as e:
+        raise RuntimeError(f"Failed to create an async database session: {e}")
+
+
+@asynccontextmanager
+async def async_transaction_scope() -> AsyncGenerator[AsyncSession, None]:
+    """
+    transaction_scope の非同期版。
+    トランザクションを開始し、エラー時にロールバック、正常終了時にコミットする。
+
+    Yields:
+        AsyncSession: トランザクション中の非同期セッションオブジェクト
+    """
+    pin_to_primary()
+    context = _request_db_context.get()
+    if context is None:
+        db = get_async_db_session()
+        try:
+            yield db
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            raise e
+        finally:
+            await db.close()
+        return
+
+    db = context.get_async_session()
+    context.write_depth += 1
+    try:
+        if context.write_depth > 1:
+            async with db.begin_nested():
+                yield db
+        else:
+            try:
+                yield db
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                raise e
+    finally:
+        context.write_depth -= 1
+
+
+@asynccontextmanager
+async def async_readonly_transaction_scope(
+    primary: bool = False,
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    readonly_transaction_scope の非同期版。
+
+    Yields:
+        AsyncSession: トランザクション中の非同期セッションオブジェクト
+    """
+    primary = primary or _read_from_primary.get()
+    context = _request_db_context.get()
+    if context is None:
+        replica = None if primary else await replica_router.choose_async()
+        db = (
+            replica.create_async_session()
+            if replica is not None
+            else get_async_db_session()
+        )
+    else:
+        replica = None if primary else await context.choose_replica_async()
+        db = (
+            context.get_async_replica_session(replica)
+            if replica is not None
+            else context.get_async_session()
+        )
+        context.read_depth += 1
+    failed = False
     try:
         yield db
+    except Exception as e:
+        failed = True
+        if replica is not None and _is_disconnect(e):
+            replica_router.mark_unhealthy(replica)
+            if context is not None:
+                await context.discard_replica_async(replica)
+            raise ReplicaUnavailableError(
+                "リードレプリカでの読み取りに失敗しました"
+            ) from e
+        raise
     finally:
-        db.close()
+        if context is None:
+            await db.close()
+        else:
+            context.read_depth -= 1
+            if context.should_end_read(failed):
+                await db.rollback()
@@ -1,2 +1,4 @@
 class CognitoErrorCode:
     USER_NOT_FOUND_EXCEPTION = "UserNotFoundException"
+    TOO_MANY_REQUESTS_EXCEPTION = "TooManyRequestsException"
+    THROTTLING_EXCEPTION = "ThrottlingException"
@@ -1,16 +1,30 @@
 import logging
 from datetime import datetime
-from typing import cast
+from typing import Any, Dict, Optional, Set, cast
 
 import pytz
-from sqlalchemy import Column
+from injector import inject
+from sqlalchemy import Row, Select, select, update
 from sqlalchemy.exc import NoResultFound
+from sqlalchemy.sql.dml import ReturningUpdate
+from starlette.concurrency import run_in_threadpool
 
 from app.domain.constants import NOT_SPECIFIED_ID
+from app.domain.entity.organization import ORGANIZATION_LIST_ADAPTER
 from app.domain.entity.organization import Organization as OrganizationEntity
-from app.domain.i_repository.organization import OrganizationIRepository
+from app.domain.i_repository.organization import (
+    OrganizationAsyncIRepository,
+    OrganizationIRepository,
+)
 from app.infra.models.organization import Organization
-from app.infra.repository.db import readonly_transaction_scope, transaction_scope
+from app.infra.repository.db import (
+    async_readonly_transaction_scope,
+    async_retry_read_on_primary,
+    async_transaction_scope,
+    readonly_transaction_scope,
+    retry_read_on_primary,
+    transaction_scope,
+)
 from app.usecase.error import ConflictError, EntityNotFoundError
 
 japan_tz = pytz.timezone("Asia/Tokyo")
@@ -18,6 +32,51 @@ japan_tz = pytz.timezone("Asia/Tokyo")
 logger = logging.getLogger(__name__)
 
 
+def build_get_all_organizations_query(
+    exclude_deleted: bool, limit: Optional[int], after_id: Optional[int]
+) -> Select[Any]:
+    """一覧に必要な列のみを取得するクエリ。ORMのインスタンスは作らない"""
+    query = select(*Organization.__table__.columns)
+    if exclude_deleted:
+        query = query.filter(Organization.deleted.is_(False))
+    # NOTE: キーセットページネーション。OFFSETを使わず、前のページの最後のIDより後を取得する
+    if after_id is not None:
+        query = query.filter(Organization.id > after_id)
+    return query.order_by(Organization.id).limit(limit)
+
+
+def build_update_organization_query(
+    org: OrganizationEntity, now: datetime
+) -> ReturningUpdate[Any]:
+    """
+    組織を更新する UPDATE 文。
+    updated_at が指定された場合は、DB の値と一致する場合のみ更新する（楽観的排他制御）。
+    確認と更新を1つの文で行うため、確認後に他のユーザが更新する競合が起きない。
+    """
+    values: Dict[str, Any] = {"updated_at": now}
+    if org.deleted is not None:
+        values["deleted"] = org.deleted
+    query = update(Organization).where(Organization.id == org.id)
+    if org.updated_at:
+        query = query.where(Organization.updated_at == org.updated_at)
+    return query.values(values).returning(*Organization.__table__.columns)
+
+
+def to_update_organization_error(
+    org: OrganizationEntity, existing: Optional[Row[Any]]
+) -> Exception:
+    """更新された行がない場合に、組織が存在しないのか、他のユーザが先に更新したのかを判定する"""
+    if existing is None:
+        logger.error(f"指定された組織が見つかりません organization_id: {org.id}")
+        return EntityNotFoundError(
+            entity_name="OrganizationEntity",
+            entity_id=org.id,
+            message=f"指定された組織が見つかりません organization_id: {org.id}",
+        )
+    logger.error(f"他のユーザが先に更新したため、{existing.name}の更新に失敗しました。")
+    return ConflictError(entity_name=cast(str, existing.name))
+
+
 class OrganizationRepository(OrganizationIRepository):
     def save_organization(self, org: OrganizationEntity) -> OrganizationEntity:
         now_utc = datetime.now(pytz.utc)
@@ -32,39 +91,20 @@ class OrganizationRepository(OrganizationIRepository):
                     updated_at=now,
                 )
                 db.add(org_rec)
-            else:
-                # 既存のレコードを更新
-                try:
-                    existing_org = (
-                        db.query(Organization).filter(Organization.id == org.id).one()
-                    )
+                db.flush()
+                db.refresh(org_rec)
+                return self.convert_organization_model_to_entity(org_rec)
 
-                    if org.updated_at and (
-                        cast(datetime, existing_org.updated_at) != org.updated_at
-                    ):
-                        logger.error(
-                            f"他のユーザが先に更新したため、{existing_org.name}の更新に失敗しました。"
-                        )
-                        raise ConflictError(entity_name=cast(str, existing_org.name))
-                    existing_org.billing_phone = cast(Column[str], org.billing_phone)
-                    if org.deleted is not None:
-                        existing_org.deleted = cast(Column[bool], org.deleted)
-                    existing_org.updated_at = now
-
-                    org_rec = existing_org
-                except NoResultFound:
-                    logger.error(
-                        f"指定された組織が見つかりません organization_id: {org.id}"
-                    )
-                    raise EntityNotFoundError(
-                        entity_name="OrganizationEntity",
-                        entity_id=org.id if org.id is not None else NOT_SPECIFIED_ID,
-                        message=f"指定された組織が見つかりません organization_id: {org.id}",
-                    )
-            db.flush()
-            db.refresh(org_rec)
-            return self.convert_organization_model_to_entity(org_rec)
+            # 既存のレコードを更新
+            row = db.execute(build_update_organization_query(org, now)).one_or_none()
+            if row is None:
+                existing = db.execute(
+                    select(Organization.name).filter(Organization.id == org.id)
+                ).one_or_none()
+                raise to_update_organization_error(org, existing)
+            return OrganizationEntity.model_validate(row)
 
+    @retry_read_on_primary
     def get_organization(
         self, organization_id: int, exclude_deleted: bool = False
     ) -> OrganizationEntity:
@@ -87,20 +127,19 @@ class OrganizationRepository(OrganizationIRepository):
                     message=f"指定された組織が見つかりません organization_id: {organization_id}",
                 )
 
+    @retry_read_on_primary
     def get_all_organizations(
-        self, exclude_deleted: bool = False
+        self,
+        exclude_deleted: bool = False,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
     ) -> list[OrganizationEntity]:
+        query = build_get_all_organizations_query(exclude_deleted, limit, after_id)
         with readonly_transaction_scope() as db:
-            query = db.query(Organization)
-            if exclude_deleted:
-                query = query.filter(Organization.deleted.is_(False))
-            db_organizations = query.all()
-            organization_list: list[OrganizationEntity] = [
-                self.convert_organization_model_to_entity(db_org)
-                for db_org in db_organizations
-            ]
-            return organization_list
+            rows = db.execute(query).all()
+            return ORGANIZATION_LIST_ADAPTER.validate_python(rows, from_attributes=True)
 
+    @retry_read_on_primary
     def is_organization_exist(self, organization_id: int) -> bool:
         with readonly_transaction_scope() as db:
             db_organization = (
@@ -111,6 +150,17 @@ class OrganizationRepository(OrganizationIRepository):
 
             return db_organization is not None
 
+    @retry_read_on_primary
+    def get_existing_organization_ids(self, organization_ids: Set[int]) -> Set[int]:
+        """指定された組織IDのうち、存在するものを1回のクエリで取得する"""
+        if not organization_ids:
+            return set()
+        with readonly_transaction_scope() as db:
+            rows = db.execute(
+                select(Organization.id).filter(Organization.id.in_(organization_ids))
+            ).all()
+            return {row.id for row in rows}
+
     def convert_organization_model_to_entity(
         self, db_org: Organization
     ) -> OrganizationEntity:
@@ -123,3 +173,121 @@ class OrganizationRepository(OrganizationIRepository):
         )
 
         return OrganizationEntity.model_validate(org_entity)
+
+
+class OrganizationAsyncRepository(OrganizationAsyncIRepository):
+    """AsyncSession（asyncpg）を使う OrganizationAsyncIRepository の実装"""
+
+    async def save_organization(self, org: OrganizationEntity) -> OrganizationEntity:
+        now_utc = datetime.now(pytz.utc)
+        now = now_utc.astimezone(japan_tz)
+
+        async with async_transaction_scope() as db:
+            if org.id == NOT_SPECIFIED_ID:
+                # 新しいレコードを作成
+                org_rec = Organization(
+                    name=org.name,
+                    created_at=now,
+                    updated_at=now,
+                )
+                db.add(org_rec)
+                await db.flush()
+                await db.refresh(org_rec)
+                return OrganizationEntity.model_validate(org_rec)
+
+            # 既存のレコードを更新
+            row = (
+                await db.execute(build_update_organization_query(org, now))
+            ).one_or_none()
+            if row is None:
+                existing = (
+                    await db.execute(
+                        select(Organization.name).filter(Organization.id == org.id)
+                    )
+                ).one_or_none()
+                raise to_update_organization_error(org, existing)
+            return OrganizationEntity.model_validate(row)
+
+    @async_retry_read_on_primary
+    async def get_organization(
+        self, organization_id: int, exclude_deleted: bool = False
+    ) -> OrganizationEntity:
+        async with async_readonly_transaction_scope() as db:
+            query = select(Organization).filter(Organization.id == organization_id)
+            if exclude_deleted:
+                query = query.filter(Organization.deleted.is_(False))
+            try:
+                db_organization = (await db.execute(query)).scalar_one()
+            except NoResultFound:
+                logger.error(
+                    f"指定された組織が見つかりません organization_id: {organization_id}"
+                )
+                raise EntityNotFoundError(
+                    entity_name="OrganizationEntity",
+                    entity_id=organization_id,
+                    message=f"指定された組織が見つかりません organization_id: {organization_id}",
+                )
+            return OrganizationEntity.model_validate(db_organization)
+
+    @async_retry_read_on_primary
+    async def get_all_organizations(
+        self,
+        exclude_deleted: bool = False,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+    ) -> list[OrganizationEntity]:
+        query = build_get_all_organizations_query(exclude_deleted, limit, after_id)
+        async with async_readonly_transaction_scope() as db:
+            rows = (await db.execute(query)).all()
+            return ORGANIZATION_LIST_ADAPTER.validate_python(rows, from_attributes=True)
+
+    @async_retry_read_on_primary
+    async def is_organization_exist(self, organization_id: int) -> bool:
+        async with async_readonly_transaction_scope() as db:
+            organization_id_or_none = await db.scalar(
+                select(Organization.id).filter(Organization.id == organization_id)
+            )
+            return organization_id_or_none is not None
+
+
+@inject
+class OrganizationThreadpoolRepository(OrganizationAsyncIRepository):
+    """
+    同期版のリポジトリをスレッドプールで実行する OrganizationAsyncIRepository の実装。
+    DB_ASYNC_ENABLED が無効な場合に使い、イベントループをブロックしないようにする。
+    """
+
+    def __init__(self, organization_repository: OrganizationIRepository):
+        self.organization_repository = organization_repository
+
+    async def save_organization(self, org: OrganizationEntity) -> OrganizationEntity:
+        return await run_in_threadpool(
+            self.organization_repository.save_organization, org
+        )
+
+    async def get_organization(
+        self, organization_id: int, exclude_deleted: bool = False
+    ) -> OrganizationEntity:
+        return await run_in_threadpool(
+            self.organization_repository.get_organization,
+            organization_id,
+            exclude_deleted,
+        )
+
+    async def get_all_organizations(
+        self,
+        exclude_deleted: bool = False,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+    ) -> list[OrganizationEntity]:
+        return await run_in_threadpool(
+            self.organization_repository.get_all_organizations,
+            exclude_deleted,
+            limit,
+            after_id,
+        )
+
+    async def is_organization_exist(self, organization_id: int) -> bool:
+        return await run_in_threadpool(
+            self.organization_repository.is_organization_exist, organization_id
+        )
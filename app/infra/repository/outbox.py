@@ -0,0 +1,91 @@
+import logging
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.domain.entity.outbox import OutboxEvent, OutboxEventType, OutboxStatus
+from app.domain.i_repository.outbox import OutboxIRepository
+from app.infra.models.outbox import Outbox
+from app.infra.repository.db import transaction_scope
+
+logger = logging.getLogger(__name__)
+
+# last_error に保存するエラーメッセージの最大長
+MAX_ERROR_LENGTH = 1000
+
+
+class OutboxRepository(OutboxIRepository):
+    def add_event(
+        self, db: Session, event_type: OutboxEventType, payload: Dict[str, Any]
+    ) -> None:
+        """
+        イベントを登録する。呼び出し元のトランザクションでコミットされるため、
+        業務データの変更と同時にコミットされた場合のみ処理される。
+        """
+        db.execute(
+            insert(Outbox).values(
+                event_type=event_type,
+                payload=payload,
+                status=OutboxStatus.PENDING,
+                attempts=0,
+            )
+        )
+
+    def claim_pending_events(self, limit: int, lease_seconds: int) -> List[OutboxEvent]:
+        """
+        処理待ちのイベントを取得し、試行回数を増やして lease_seconds の間は他から取得されないようにする。
+        リースの期限までに mark_done / mark_failed されなかった場合は、再度取得される。
+
+        NOTE: 複数のプロセスで同時に実行しても、SKIP LOCKED により同じイベントは取得されない
+        """
+        with transaction_scope() as db:
+            pending_ids = (
+                select(Outbox.id)
+                .where(
+                    Outbox.status == OutboxStatus.PENDING,
+                    Outbox.next_attempt_at <= func.now(),
+                )
+                .order_by(Outbox.next_attempt_at, Outbox.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            rows = db.execute(
+                update(Outbox)
+                .where(Outbox.id.in_(pending_ids.scalar_subquery()))
+                .values(
+                    attempts=Outbox.attempts + 1,
+                    next_attempt_at=func.now() + timedelta(seconds=lease_seconds),
+                )
+                .returning(*Outbox.__table__.columns)
+            ).all()
+        return sorted(
+            (OutboxEvent.model_validate(row) for row in rows),
+            key=lambda event: event.id,
+        )
+
+    def mark_done(self, event_id: int) -> None:
+        with transaction_scope() as db:
+            db.execute(
+                update(Outbox)
+                .where(Outbox.id == event_id)
+                .values(status=OutboxStatus.DONE, last_error=None)
+            )
+
+    def mark_failed(
+        self, event_id: int, error: str, retry_after_seconds: Optional[float]
+    ) -> None:
+        """
+        処理に失敗したイベントを記録する。
+        retry_after_seconds 秒後に再度処理し、None の場合はリトライしない。
+        """
+        values: Dict[str, Any] = {"last_error": error[:MAX_ERROR_LENGTH]}
+        if retry_after_seconds is None:
+            values["status"] = OutboxStatus.FAILED
+        else:
+            values["next_attempt_at"] = func.now() + timedelta(
+                seconds=retry_after_seconds
+            )
+        with transaction_scope() as db:
+            db.execute(update(Outbox).where(Outbox.id == event_id).values(**values))
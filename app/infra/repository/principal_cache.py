@@ -0,0 +1,50 @@
+import threading
+from typing import Optional
+
+from app.cache import TTLCache
+from app.config import settings
+from app.domain.entity.principal import Principal
+
+# NOTE: 認可判定のたびにDBを参照しないよう、メールアドレスをキーに短時間キャッシュする。
+# プロセス毎のキャッシュのため、他タスクでの変更は最大でTTLの間反映されない。
+principal_cache: TTLCache[str, Principal] = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAXSIZE
+)
+
+# NOTE: 取得中に破棄された古い値をキャッシュしないよう、破棄の度に世代を進める
+_generation_lock = threading.Lock()
+_generation = 0
+
+
+def get_cached_principal(email: str) -> Optional[Principal]:
+    return principal_cache.get(email)
+
+
+def get_principal_generation() -> int:
+    """DBから取得する前に呼び出し、cache_principal に渡す"""
+    return _generation
+
+
+def cache_principal(email: str, principal: Principal, generation: int) -> None:
+    """
+    取得した Principal をキャッシュする。
+    取得を開始してから破棄が行われた場合は、取得した値が古い可能性があるためキャッシュしない。
+    """
+    with _generation_lock:
+        if generation != _generation:
+            return
+        principal_cache.set(
+            email, principal, ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS
+        )
+
+
+def invalidate_principal(user_id: int) -> None:
+    """
+    ユーザーや所属組織が変更された場合に、該当ユーザーのキャッシュを破棄する。
+    コミット前に破棄すると、他のリクエストが変更前の値を再度キャッシュしうるため、
+    run_after_commit でコミット後に呼び出すこと。
+    """
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        principal_cache.delete_if(lambda _, principal: principal.user.id == user_id)
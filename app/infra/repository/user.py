@@ -1,92 +1,187 @@
 import logging
-import re
+from concurrent.futures import FIRST_COMPLETED, Future, as_completed, wait
 from datetime import datetime
-from typing import Any, List, Optional
+from functools import partial
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, TypeVar
 
 import pytz
 from botocore.exceptions import ClientError
 from injector import inject
-from sqlalchemy import exc
+from sqlalchemy import Select, delete, desc, exc, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 
 from app.config import settings
+from app.domain.entity.principal import Principal
+from app.domain.entity.user import USER_LIST_ADAPTER
 from app.domain.entity.user import User as UserEntity
-from app.domain.entity.user_organization import UserRole
-from app.domain.i_repository.user import UserIRepository
+from app.domain.entity.user import UserBulkCreateItem, UserBulkCreateResult
+from app.domain.entity.user_organization import (
+    UserOrganization as UserOrganizationEntity,
+)
+from app.domain.entity.user_organization import (
+    UserRole,
+)
+from app.domain.i_repository.user import UserAsyncIRepository, UserIRepository
 from app.domain.i_repository.user_organization import UserOrganizationIRepository
 from app.infra.models.user import User
+from app.infra.models.user_organization import UserOrganization
 from app.infra.repository.cognito import (
-    create_cognito_client,
+    CognitoApi,
+    call_cognito_api,
     delete_user,
+    delete_user_async,
     disable_user,
+    disable_user_async,
     enable_user,
+    enable_user_async,
+    get_cognito_client,
+    get_cognito_executor,
+)
+from app.infra.repository.db import (
+    async_readonly_transaction_scope,
+    async_retry_read_on_primary,
+    readonly_transaction_scope,
+    retry_read_on_primary,
+    run_after_commit,
+    transaction_scope,
+)
+from app.infra.repository.principal_cache import (
+    cache_principal,
+    get_cached_principal,
+    get_principal_generation,
+    invalidate_principal,
 )
-from app.infra.repository.db import readonly_transaction_scope, transaction_scope
 from app.usecase.error import DuplicateError, EntityNotFoundError
 
 logger = logging.getLogger(__name__)
 japan_tz = pytz.timezone("Asia/Tokyo")
 
+T = TypeVar("T")
+
+# エクスポート時にサーバーサイドカーソルから1度に取得する行数
+EXPORT_BATCH_SIZE = 1000
+# 一括作成時に1つの INSERT 文で登録する行数
+BULK_INSERT_BATCH_SIZE = 1000
+
+
+# 一覧・エクスポートで取得する列
+USER_COLUMNS = (
+    User.id,
+    User.cognito_user_id,
+    User.email,
+    User.display_name,
+    User.deleted,
+    User.created_at,
+    User.updated_at,
+)
+
+
+def build_get_users_query(
+    limit: Optional[int], after_id: Optional[int], organization_id: Optional[int]
+) -> Select[Any]:
+    """一覧に必要な列のみを取得するクエリ。ORMのインスタンスは作らない"""
+    query = select(*USER_COLUMNS)
+    if organization_id is not None:
+        query = query.join(
+            UserOrganization, UserOrganization.user_id == User.id
+        ).filter(UserOrganization.organization_id == organization_id)
+    # NOTE: キーセットページネーション。OFFSETを使わず、前のページの最後のIDより後を取得する
+    if after_id is not None:
+        query = query.filter(User.id > after_id)
+    return query.order_by(User.id).limit(limit)
+
+
+def build_export_users_query(organization_id: Optional[int]) -> Select[Any]:
+    """エクスポートする列のみを取得するクエリ。ORMのインスタンスは作らない"""
+    query = select(*USER_COLUMNS)
+    if organization_id is not None:
+        query = query.join(
+            UserOrganization, UserOrganization.user_id == User.id
+        ).filter(UserOrganization.organization_id == organization_id)
+    return query.order_by(User.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+
+def _chunks(values: List[T], size: int) -> Iterator[List[T]]:
+    for start in range(0, len(values), size):
+        end = start + size
+        yield values[start:end]
+
 
 @inject
 class UserRepository(UserIRepository):
     def __init__(self, user_organization_repository: UserOrganizationIRepository):
         self.user_organization_repository = user_organization_repository
-        self.cognito_client = create_cognito_client()
+        self.cognito_client = get_cognito_client()
 
     def create_user(self, db: Session, user: UserEntity) -> UserEntity:
         # NOTE: 呼び出し元でトランザクションを管理しているため、ここではトランザクションを管理しない
+        # NOTE: 重複は例外ではなく INSERT の結果で判定し、失敗した文でトランザクションを中断させない
+        now_utc = datetime.now(pytz.utc)
+        now = now_utc.astimezone(japan_tz)
         try:
-            now_utc = datetime.now(pytz.utc)
-            now = now_utc.astimezone(japan_tz)
-            db_user = User(
-                cognito_user_id=user.cognito_user_id,
-                email=user.email,
-                display_name=user.display_name,
-                deleted=user.deleted,
-                created_at=now,
-                updated_at=now,
-            )
-            db.add(db_user)
-            db.flush()
-            db.refresh(db_user)
-            return UserEntity.model_validate(db_user)
+            row = db.execute(
+                insert(User)
+                .values(
+                    cognito_user_id=user.cognito_user_id,
+                    email=user.email,
+                    display_name=user.display_name,
+                    deleted=bool(user.deleted),
+                    created_at=now,
+                    updated_at=now,
+                )
+                .on_conflict_do_nothing()
+                .returning(*User.__table__.columns)
+            ).one_or_none()
         except exc.IntegrityError as e:
-            constraint_name = getattr(
-                getattr(e.orig, "diag", None), "constraint_name", ""
+            logger.error(
+                f"ユーザー作成中にデータベースのエラーが発生しました。: {e.orig}"
             )
-            if constraint_name == "ix_user_email":
-                logger.error(
-                    f"このメールアドレスは既に登録されています。 email: {user.email}"
-                )
-                raise DuplicateError(
-                    message=f"このメールアドレスは既に登録されています。 email: {user.email}"
-                )
-            elif constraint_name == "ix_user_cognito_user_id":
-                logger.error(f"ユーザーは既に存在します: {user.cognito_user_id}")
-                raise DuplicateError(
-                    message=f"ユーザーは既に存在します: {user.cognito_user_id}"
-                )
-            elif constraint_name == "user_pkey":
-                match = re.search(r"Key \(id\)=\((\d+)\)", str(e.orig))
-                conflicting_id = match.group(1) if match else "不明"
-                logger.error(f"ユーザーIDが重複しています。 id: {conflicting_id}")
-                raise DuplicateError(
-                    message=f"ユーザーIDが重複しています。 id: {conflicting_id}"
-                )
-            else:
-                logger.error(
-                    f"ユーザー作成中にデータベースのエラーが発生しました。: {e.orig}"
-                )
-                raise Exception(
-                    f"ユーザー作成中にデータベースのエラーが発生しました。: {e.orig}"
+            raise Exception(
+                f"ユーザー作成中にデータベースのエラーが発生しました。: {e.orig}"
+            )
+        if row is None:
+            raise self._to_duplicate_error(db, user)
+        return UserEntity.model_validate(row)
+
+    def _to_duplicate_error(self, db: Session, user: UserEntity) -> DuplicateError:
+        """重複により INSERT されなかったユーザーについて、重複した項目を特定する"""
+        existing = db.execute(
+            select(User.email, User.cognito_user_id).filter(
+                or_(
+                    User.email == user.email,
+                    User.cognito_user_id == user.cognito_user_id,
                 )
+            )
+        ).first()
+        if existing is not None and existing.email == user.email:
+            message = f"このメールアドレスは既に登録されています。 email: {user.email}"
+        elif existing is not None:
+            message = f"ユーザーは既に存在します: {user.cognito_user_id}"
+        else:
+            # NOTE: メールアドレス・cognitoのユーザIDのどちらでもない場合は、
+            # シーケンスで採番したIDが既存のユーザーと重複している
+            conflicting_id = db.execute(
+                select(func.currval(func.pg_get_serial_sequence('"user"', "id")))
+            ).scalar()
+            message = f"ユーザーIDが重複しています。 id: {conflicting_id}"
+        logger.error(message)
+        return DuplicateError(message=message)
 
-    def get_users(self, db: Session) -> List[UserEntity]:
+    def get_users(
+        self,
+        db: Session,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        organization_id: Optional[int] = None,
+    ) -> List[UserEntity]:
         try:
-            db_users = db.query(User).all()
-            return [UserEntity.model_validate(user) for user in db_users]
+            rows = db.execute(
+                build_get_users_query(limit, after_id, organization_id)
+            ).all()
+            return USER_LIST_ADAPTER.validate_python(rows, from_attributes=True)
         except SQLAlchemyError as e:
             logger.error(f"ユーザの取得中にエラーが発生しました: {e}")
             raise Exception("ユーザの取得に失敗しました") from e
@@ -102,6 +197,7 @@ class UserRepository(UserIRepository):
         if not db_user:
             return None
         db_user.display_name = user.display_name
+        run_after_commit(db, partial(invalidate_principal, db_user.id))
         db.commit()
         db.refresh(db_user)
         return UserEntity.model_validate(db_user)
@@ -118,7 +214,9 @@ class UserRepository(UserIRepository):
             )
             if db_user:
                 db_user.deleted = True
-                db.commit()
+                # NOTE: 呼び出し元のトランザクションでコミットする
+                db.flush()
+                run_after_commit(db, partial(invalidate_principal, db_user.id))
             else:
                 logger.error(
                     f"指定されたIDのユーザーは存在しません。 user_id: {cognito_user_id}"
@@ -140,6 +238,19 @@ class UserRepository(UserIRepository):
             )
             raise
 
+    def stream_users(
+        self, organization_id: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        ユーザーをサーバーサイドカーソルで EXPORT_BATCH_SIZE 件ずつ取得する。
+        全件をメモリに載せないため、件数によらずメモリ使用量は一定になる。
+        """
+        with readonly_transaction_scope() as db:
+            result = db.execute(build_export_users_query(organization_id))
+            for partition in result.mappings().partitions():
+                yield [dict(row) for row in partition]
+
+    @retry_read_on_primary
     def get_user_by_email(self, email: str) -> UserEntity:
         with readonly_transaction_scope() as db:
             try:
@@ -159,6 +270,47 @@ class UserRepository(UserIRepository):
                 )
             return UserEntity.model_validate(db_user)
 
+    def get_principal_by_email(self, email: str) -> Principal:
+        """
+        ユーザーと所属組織・ロールを1回のクエリでまとめて取得する。
+        認可判定で繰り返し参照されるため、短時間キャッシュする。
+        """
+        principal = get_cached_principal(email)
+        if principal is not None:
+            return principal
+
+        # NOTE: キャッシュするため、レプリカの遅延で古い値を取得しないようプライマリで読み取る
+        generation = get_principal_generation()
+        with readonly_transaction_scope(primary=True) as db:
+            # TODO: updated_at列の値でソートしているが暫定的な処理である。対応方針を検討する必要あり。
+            rows = (
+                db.query(User, UserOrganization)
+                .outerjoin(UserOrganization, UserOrganization.user_id == User.id)
+                .filter(User.email == email, User.deleted.is_(False))
+                .order_by(desc(UserOrganization.updated_at))
+                .all()
+            )
+            if not rows:
+                logger.error(
+                    f"指定されたメールアドレスのユーザーは存在しません。 email: {email}"
+                )
+                raise EntityNotFoundError(
+                    entity_name="User",
+                    entity_id=0,
+                    message=f"指定されたメールアドレスのユーザーは存在しません。 email: {email}",
+                )
+            principal = Principal(
+                user=UserEntity.model_validate(rows[0][0]),
+                user_organizations=[
+                    UserOrganizationEntity.model_validate(db_user_organization)
+                    for _, db_user_organization in rows
+                    if db_user_organization is not None
+                ],
+            )
+
+        cache_principal(email, principal, generation)
+        return principal
+
     def create_cognito_user(self, user: UserEntity, password: str) -> None:
         if user.cognito_user_id is None:
             raise ValueError("cognito_user_id is required")
@@ -166,13 +318,17 @@ class UserRepository(UserIRepository):
             raise ValueError("email is required")
 
         try:
-            self.cognito_client.sign_up(
-                ClientId=settings.COGNITO_CLIENT_ID,  # App Client ID
-                Username=user.cognito_user_id,
-                Password=password,
-                UserAttributes=[
-                    {"Name": "email", "Value": user.email},
-                ],
+            cognito_user_id, email = user.cognito_user_id, user.email
+            call_cognito_api(
+                CognitoApi.SIGN_UP,
+                lambda: self.cognito_client.sign_up(
+                    ClientId=settings.COGNITO_CLIENT_ID,  # App Client ID
+                    Username=cognito_user_id,
+                    Password=password,
+                    UserAttributes=[
+                        {"Name": "email", "Value": email},
+                    ],
+                ),
             )
         except ClientError as e:
             error_code = e.response["Error"]["Code"]
@@ -222,6 +378,193 @@ class UserRepository(UserIRepository):
                     message=e.message,
                 )
 
+    def bulk_create_users_with_user_organization(
+        self, items: List[UserBulkCreateItem]
+    ) -> List[UserBulkCreateResult]:
+        """
+        ユーザーとユーザー組織を一括で作成し、1件毎の結果を返す。
+
+        1. 既存のユーザーとメールアドレス・cognitoのユーザIDが重複するものを除く
+        2. ユーザーとユーザー組織を BULK_INSERT_BATCH_SIZE 件ずつ複数行の INSERT で登録し、コミットする
+        3. Cognito へのサインアップを、トランザクションの外で COGNITO_SIGN_UP_CONCURRENCY 件まで並行して行う
+        4. サインアップに失敗したユーザーを、別のトランザクションで削除する
+
+        1件ずつ作成する場合と同じく、DB と Cognito の両方に登録できたユーザーのみ作成する。
+
+        NOTE: サインアップは時間がかかるため、トランザクション（接続・ロック）を保持したまま行わない。
+        先にコミットすることで、コミットに失敗して Cognito のユーザーのみが残ることもない。
+        """
+        errors: Dict[int, str] = {}
+        with transaction_scope() as db:
+            pending = self._exclude_existing_users(db, items, errors)
+            created_users = self._insert_users_with_user_organization(
+                db, pending, errors
+            )
+
+        failed_user_ids = self._sign_up_cognito_users(
+            [item for item in pending if item.index in created_users],
+            created_users,
+            errors,
+        )
+
+        # NOTE: Cognito に登録できなかったユーザーは DB からも削除し、同じ状態に揃える
+        if failed_user_ids:
+            with transaction_scope() as db:
+                for batch in _chunks(failed_user_ids, BULK_INSERT_BATCH_SIZE):
+                    db.execute(
+                        delete(UserOrganization).where(
+                            UserOrganization.user_id.in_(batch)
+                        )
+                    )
+                    db.execute(delete(User).where(User.id.in_(batch)))
+
+        logger.info(
+            f"ユーザーを一括作成しました。 作成: {len(created_users)}件, 失敗: {len(errors)}件"
+        )
+        return [
+            UserBulkCreateResult(
+                index=item.index,
+                cognito_user_id=item.user.cognito_user_id,
+                email=item.user.email,
+                user=created_users.get(item.index),
+                error=errors.get(item.index),
+            )
+            for item in items
+        ]
+
+    def _exclude_existing_users(
+        self, db: Session, items: List[UserBulkCreateItem], errors: Dict[int, str]
+    ) -> List[UserBulkCreateItem]:
+        """既存のユーザーと重複するものを1回のクエリでまとめて確認し、errors に理由を設定する"""
+        if not items:
+            return []
+        rows = db.execute(
+            select(User.email, User.cognito_user_id).filter(
+                or_(
+                    User.email.in_([item.user.email for item in items]),
+                    User.cognito_user_id.in_(
+                        [item.user.cognito_user_id for item in items]
+                    ),
+                )
+            )
+        ).all()
+        existing_emails = {row.email for row in rows}
+        existing_cognito_user_ids = {row.cognito_user_id for row in rows}
+
+        pending = []
+        for item in items:
+            if item.user.email in existing_emails:
+                errors[item.index] = (
+                    f"このメールアドレスは既に登録されています。 email: {item.user.email}"
+                )
+            elif item.user.cognito_user_id in existing_cognito_user_ids:
+                errors[item.index] = (
+                    f"ユーザーは既に存在します: {item.user.cognito_user_id}"
+                )
+            else:
+                pending.append(item)
+        return pending
+
+    def _insert_users_with_user_organization(
+        self, db: Session, items: List[UserBulkCreateItem], errors: Dict[int, str]
+    ) -> Dict[int, UserEntity]:
+        """ユーザーとユーザー組織を複数行の INSERT で登録し、作成したユーザーを index 毎に返す"""
+        now_utc = datetime.now(pytz.utc)
+        now = now_utc.astimezone(japan_tz)
+        created_users: Dict[int, UserEntity] = {}
+        for batch in _chunks(items, BULK_INSERT_BATCH_SIZE):
+            # NOTE: 事前の確認後に他のリクエストで登録された場合は、エラーにせずその行のみ除く
+            rows = db.execute(
+                insert(User)
+                .values(
+                    [
+                        {
+                            "cognito_user_id": item.user.cognito_user_id,
+                            "email": item.user.email,
+                            "display_name": item.user.display_name,
+                            "deleted": False,
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                        for item in batch
+                    ]
+                )
+                .on_conflict_do_nothing()
+                .returning(User.id, User.cognito_user_id)
+            ).all()
+            user_ids = {row.cognito_user_id: row.id for row in rows}
+
+            user_organizations = []
+            for item in batch:
+                user_id = user_ids.get(item.user.cognito_user_id)
+                if user_id is None:
+                    errors[item.index] = (
+                        f"ユーザーは既に存在します: {item.user.cognito_user_id}"
+                    )
+                    continue
+                created_users[item.index] = UserEntity(
+                    id=user_id,
+                    cognito_user_id=item.user.cognito_user_id,
+                    email=item.user.email,
+                    display_name=item.user.display_name,
+                    deleted=False,
+                    created_at=now,
+                    updated_at=now,
+                )
+                user_organizations.append(
+                    {
+                        "user_id": user_id,
+                        "organization_id": item.organization_id,
+                        "role": item.role,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+            if user_organizations:
+                db.execute(insert(UserOrganization).values(user_organizations))
+        return created_users
+
+    def _sign_up_cognito_users(
+        self,
+        items: List[UserBulkCreateItem],
+        created_users: Dict[int, UserEntity],
+        errors: Dict[int, str],
+    ) -> List[int]:
+        """
+        Cognito へのサインアップを並行して行い、失敗したユーザーのIDを返す。
+        失敗したユーザーは created_users から除き、errors に理由を設定する。
+
+        NOTE: Cognito 共有のスレッドプールを使う。他の Cognito の呼び出しを待たせないよう、
+        実行中のサインアップを COGNITO_SIGN_UP_CONCURRENCY 件までに制限する。
+        """
+        failed_user_ids: List[int] = []
+
+        def handle_result(future: Future[None], item: UserBulkCreateItem) -> None:
+            try:
+                future.result()
+                return
+            except DuplicateError as e:
+                errors[item.index] = e.message
+            except Exception as e:
+                errors[item.index] = f"サインアップに失敗しました。: {e}"
+            failed_user_ids.append(created_users.pop(item.index).id)
+
+        executor = get_cognito_executor()
+        futures: Dict[Future[None], UserBulkCreateItem] = {}
+        for item in items:
+            if len(futures) >= settings.COGNITO_SIGN_UP_CONCURRENCY:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    handle_result(future, futures.pop(future))
+            futures[
+                executor.submit(
+                    self.create_cognito_user, user=item.user, password=item.password
+                )
+            ] = item
+        for future in as_completed(futures):
+            handle_result(future, futures[future])
+        return failed_user_ids
+
     def disable_user_on_cognito(self, cognito_user_id: str) -> None:
         disable_user(cognito_user_id)
 
@@ -230,3 +573,159 @@ class UserRepository(UserIRepository):
 
     def delete_user_on_cognito(self, cognito_user_id: str) -> None:
         delete_user(cognito_user_id)
+
+
+class UserAsyncRepository(UserAsyncIRepository):
+    """AsyncSession（asyncpg）を使う UserAsyncIRepository の実装"""
+
+    @async_retry_read_on_primary
+    async def get_users(
+        self,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        organization_id: Optional[int] = None,
+    ) -> List[UserEntity]:
+        query = build_get_users_query(limit, after_id, organization_id)
+        async with async_readonly_transaction_scope() as db:
+            try:
+                rows = (await db.execute(query)).all()
+                return USER_LIST_ADAPTER.validate_python(rows, from_attributes=True)
+            except SQLAlchemyError as e:
+                logger.error(f"ユーザの取得中にエラーが発生しました: {e}")
+                raise Exception("ユーザの取得に失敗しました") from e
+
+    async def stream_users(
+        self, organization_id: Optional[int] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        async with async_readonly_transaction_scope() as db:
+            result = await db.stream(build_export_users_query(organization_id))
+            async for partition in result.mappings().partitions():
+                yield [dict(row) for row in partition]
+
+    @async_retry_read_on_primary
+    async def get_user_by_email(self, email: str) -> UserEntity:
+        async with async_readonly_transaction_scope() as db:
+            try:
+                db_user = (
+                    await db.execute(
+                        select(User).filter(
+                            User.email == email, User.deleted.is_(False)
+                        )
+                    )
+                ).scalar_one()
+            except exc.NoResultFound:
+                logger.error(
+                    f"指定されたメールアドレスのユーザーは存在しません。 email: {email}"
+                )
+                raise EntityNotFoundError(
+                    entity_name="User",
+                    entity_id=0,
+                    message=f"指定されたメールアドレスのユーザーは存在しません。 email: {email}",
+                )
+            return UserEntity.model_validate(db_user)
+
+    async def get_principal_by_email(self, email: str) -> Principal:
+        """UserRepository.get_principal_by_email の非同期版。キャッシュも共有する。"""
+        principal = get_cached_principal(email)
+        if principal is not None:
+            return principal
+
+        generation = get_principal_generation()
+        async with async_readonly_transaction_scope(primary=True) as db:
+            # TODO: updated_at列の値でソートしているが暫定的な処理である。対応方針を検討する必要あり。
+            rows = (
+                await db.execute(
+                    select(User, UserOrganization)
+                    .outerjoin(UserOrganization, UserOrganization.user_id == User.id)
+                    .filter(User.email == email, User.deleted.is_(False))
+                    .order_by(desc(UserOrganization.updated_at))
+                )
+            ).all()
+            if not rows:
+                logger.error(
+                    f"指定されたメールアドレスのユーザーは存在しません。 email: {email}"
+                )
+                raise EntityNotFoundError(
+                    entity_name="User",
+                    entity_id=0,
+                    message=f"指定されたメールアドレスのユーザーは存在しません。 email: {email}",
+                )
+            principal = Principal(
+                user=UserEntity.model_validate(rows[0][0]),
+                user_organizations=[
+                    UserOrganizationEntity.model_validate(db_user_organization)
+                    for _, db_user_organization in rows
+                    if db_user_organization is not None
+                ],
+            )
+
+        cache_principal(email, principal, generation)
+        return principal
+
+    async def disable_user_on_cognito(self, cognito_user_id: str) -> None:
+        await disable_user_async(cognito_user_id)
+
+    async def enable_user_on_cognito(self, cognito_user_id: str) -> None:
+        await enable_user_async(cognito_user_id)
+
+    async def delete_user_on_cognito(self, cognito_user_id: str) -> None:
+        await delete_user_async(cognito_user_id)
+
+
+@inject
+class UserThreadpoolRepository(UserAsyncIRepository):
+    """
+    同期版のリポジトリをスレッドプールで実行する UserAsyncIRepository の実装。
+    DB_ASYNC_ENABLED が無効な場合に使う。
+    """
+
+    def __init__(self, user_repository: UserIRepository):
+        self.user_repository = user_repository
+
+    async def get_users(
+        self,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        organization_id: Optional[int] = None,
+    ) -> List[UserEntity]:
+        return await run_in_threadpool(
+            self._get_users, limit, after_id, organization_id
+        )
+
+    async def stream_users(
+        self, organization_id: Optional[int] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        # NOTE: スレッドプールへの切り替えはバッチ毎に行う
+        async for batch in iterate_in_threadpool(
+            self.user_repository.stream_users(organization_id)
+        ):
+            yield batch
+
+    async def get_user_by_email(self, email: str) -> UserEntity:
+        return await run_in_threadpool(self.user_repository.get_user_by_email, email)
+
+    async def get_principal_by_email(self, email: str) -> Principal:
+        return await run_in_threadpool(
+            self.user_repository.get_principal_by_email, email
+        )
+
+    async def disable_user_on_cognito(self, cognito_user_id: str) -> None:
+        await disable_user_async(cognito_user_id)
+
+    async def enable_user_on_cognito(self, cognito_user_id: str) -> None:
+        await enable_user_async(cognito_user_id)
+
+    async def delete_user_on_cognito(self, cognito_user_id: str) -> None:
+        await delete_user_async(cognito_user_id)
+
+    @retry_read_on_primary
+    def _get_users(
+        self,
+        limit: Optional[int],
+        after_id: Optional[int],
+        organization_id: Optional[int],
+    ) -> List[UserEntity]:
+        with readonly_transaction_scope() as db:
+            return self.user_repository.get_users(
+                db, limit=limit, after_id=after_id, organization_id=organization_id
+            )
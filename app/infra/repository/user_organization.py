@@ -1,11 +1,15 @@
 import logging
 from datetime import datetime
+from functools import partial
 from typing import List
 
 import pytz
+from injector import inject
 from psycopg2 import errors as psycopg2_errors
-from sqlalchemy import desc, exc
+from sqlalchemy import desc, exc, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.domain.entity.user_organization import (
     UserOrganization as UserOrganizationEntity,
@@ -13,10 +17,20 @@ from app.domain.entity.user_organization import (
 from app.domain.entity.user_organization import (
     UserRole,
 )
-from app.domain.i_repository.user_organization import UserOrganizationIRepository
+from app.domain.i_repository.user_organization import (
+    UserOrganizationAsyncIRepository,
+    UserOrganizationIRepository,
+)
 from app.infra.models.user_organization import UserOrganization
 from app.infra.models.user_organization import UserOrganization as UserOrganizationModel
-from app.infra.repository.db import readonly_transaction_scope
+from app.infra.repository.db import (
+    async_readonly_transaction_scope,
+    async_retry_read_on_primary,
+    readonly_transaction_scope,
+    retry_read_on_primary,
+    run_after_commit,
+)
+from app.infra.repository.principal_cache import invalidate_principal
 from app.usecase.error import (
     DuplicateError,
     EntityNotFoundError,
@@ -28,6 +42,7 @@ japan_tz = pytz.timezone("Asia/Tokyo")
 
 
 class UserOrganizationRepository(UserOrganizationIRepository):
+    @retry_read_on_primary
     def get_role_by_user_id_and_organization_id(
         self, user_id: int, organization_id: int
     ) -> UserRole:
@@ -54,21 +69,24 @@ class UserOrganizationRepository(UserOrganizationIRepository):
         self, user_id: int, organization_id: int, role: UserRole, db: Session
     ) -> UserOrganizationEntity:
         # NOTE: 呼び出し元でトランザクションを管理しているため、ここではトランザクションを管理しない
+        now_utc = datetime.now(pytz.utc)
+        now = now_utc.astimezone(japan_tz)
         try:
-            now_utc = datetime.now(pytz.utc)
-            now = now_utc.astimezone(japan_tz)
-            db_user_organization = UserOrganizationModel(
-                user_id=user_id,
-                organization_id=organization_id,
-                role=role.value,
-                created_at=now,
-                updated_at=now,
-            )
-            db.add(db_user_organization)
-            db.flush()
-            db.refresh(db_user_organization)
-            return UserOrganizationEntity.model_validate(db_user_organization)
+            # NOTE: 一意性制約違反は例外ではなく INSERT の結果で判定する
+            row = db.execute(
+                insert(UserOrganizationModel)
+                .values(
+                    user_id=user_id,
+                    organization_id=organization_id,
+                    role=role,
+                    created_at=now,
+                    updated_at=now,
+                )
+                .on_conflict_do_nothing()
+                .returning(*UserOrganizationModel.__table__.columns)
+            ).one_or_none()
         except exc.IntegrityError as e:
+            # NOTE: ON CONFLICT は外部キー制約違反には適用されないため、例外で判定する
             if isinstance(e.orig, psycopg2_errors.ForeignKeyViolation):
                 # 外部キー制約違反の場合
                 logger.error(f"外部キー制約違反が発生しました: {str(e)}")
@@ -77,17 +95,21 @@ class UserOrganizationRepository(UserOrganizationIRepository):
                     entity_id=organization_id,
                     message=f"指定された組織が存在しないか、組織にユーザーが所属していません。 user_id: {user_id}, organization_id: {organization_id}",
                 )
-            elif isinstance(e.orig, psycopg2_errors.UniqueViolation):
-                # 一意性制約違反の場合
-                logger.error(f"一意性制約違反が発生しました: {str(e)}")
-                raise DuplicateError(
-                    message=f"指定されたユーザーは既に組織に所属しています。 user_id: {user_id}, organization_id: {organization_id}"
-                )
             else:
                 # その他のIntegrityErrorの場合
                 logger.error(f"予期せぬエラーが発生しました: {str(e)}")
                 raise e
+        if row is None:
+            logger.error(
+                f"指定されたユーザーは既に組織に所属しています。 user_id: {user_id}, organization_id: {organization_id}"
+            )
+            raise DuplicateError(
+                message=f"指定されたユーザーは既に組織に所属しています。 user_id: {user_id}, organization_id: {organization_id}"
+            )
+        run_after_commit(db, partial(invalidate_principal, user_id))
+        return UserOrganizationEntity.model_validate(row)
 
+    @retry_read_on_primary
     def get_user_organizations_by_user_id(
         self, user_id: int
     ) -> List[UserOrganizationEntity]:
@@ -107,6 +129,7 @@ class UserOrganizationRepository(UserOrganizationIRepository):
                     for user_organization in db_user_organizations
                 ]
 
+    @retry_read_on_primary
     def is_user_in_organization_exist(self, user_id: int, organization_id: int) -> bool:
         with readonly_transaction_scope() as db:
             db_user_org = (
@@ -117,3 +140,107 @@ class UserOrganizationRepository(UserOrganizationIRepository):
             )
 
             return db_user_org is not None
+
+
+class UserOrganizationAsyncRepository(UserOrganizationAsyncIRepository):
+    """AsyncSession（asyncpg）を使う UserOrganizationAsyncIRepository の実装"""
+
+    @async_retry_read_on_primary
+    async def get_role_by_user_id_and_organization_id(
+        self, user_id: int, organization_id: int
+    ) -> UserRole:
+        async with async_readonly_transaction_scope() as db:
+            try:
+                role = (
+                    await db.execute(
+                        select(UserOrganizationModel.role)
+                        .filter(UserOrganizationModel.user_id == user_id)
+                        .filter(
+                            UserOrganizationModel.organization_id == organization_id
+                        )
+                    )
+                ).scalar_one()
+                return UserRole(role)
+            except exc.NoResultFound:
+                logger.error(
+                    f"指定された組織が存在しないか、組織にユーザーが所属していません。 user_id: {user_id}, organization_id: {organization_id}"
+                )
+                raise EntityNotFoundError(
+                    entity_name="UserOrganization",
+                    entity_id=organization_id,
+                    message=f"指定された組織が存在しないか、組織にユーザーが所属していません。 user_id: {user_id}, organization_id: {organization_id}",
+                )
+
+    @async_retry_read_on_primary
+    async def get_user_organizations_by_user_id(
+        self, user_id: int
+    ) -> List[UserOrganizationEntity]:
+        async with async_readonly_transaction_scope() as db:
+            # TODO: updated_at列の値でソートしているが暫定的な処理である。対応方針を検討する必要あり。
+            db_user_organizations = (
+                (
+                    await db.execute(
+                        select(UserOrganization)
+                        .filter(UserOrganization.user_id == user_id)
+                        .order_by(desc(UserOrganization.updated_at))
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            if not db_user_organizations:
+                raise GetListUserOrganizationByUserIdEmptyError(user_id=user_id)
+            return [
+                UserOrganizationEntity.model_validate(user_organization)
+                for user_organization in db_user_organizations
+            ]
+
+    @async_retry_read_on_primary
+    async def is_user_in_organization_exist(
+        self, user_id: int, organization_id: int
+    ) -> bool:
+        async with async_readonly_transaction_scope() as db:
+            db_user_id = await db.scalar(
+                select(UserOrganization.user_id)
+                .filter(UserOrganization.user_id == user_id)
+                .filter(UserOrganization.organization_id == organization_id)
+                .limit(1)
+            )
+            return db_user_id is not None
+
+
+@inject
+class UserOrganizationThreadpoolRepository(UserOrganizationAsyncIRepository):
+    """
+    同期版のリポジトリをスレッドプールで実行する UserOrganizationAsyncIRepository の実装。
+    DB_ASYNC_ENABLED が無効な場合に使う。
+    """
+
+    def __init__(self, user_organization_repository: UserOrganizationIRepository):
+        self.user_organization_repository = user_organization_repository
+
+    async def get_role_by_user_id_and_organization_id(
+        self, user_id: int, organization_id: int
+    ) -> UserRole:
+        return await run_in_threadpool(
+            self.user_organization_repository.get_role_by_user_id_and_organization_id,
+            user_id,
+            organization_id,
+        )
+
+    async def get_user_organizations_by_user_id(
+        self, user_id: int
+    ) -> List[UserOrganizationEntity]:
+        return await run_in_threadpool(
+            self.user_organization_repository.get_user_organizations_by_user_id,
+            user_id,
+        )
+
+    async def is_user_in_organization_exist(
+        self, user_id: int, organization_id: int
+    ) -> bool:
+        return await run_in_threadpool(
+            self.user_organization_repository.is_user_in_organization_exist,
+            user_id,
+            organization_id,
+        )
@@ -0,0 +1,76 @@
+from enum import Enum
+from typing import Any, Dict, List
+
+from anyio import to_thread
+from fastapi import APIRouter, Query
+
+from app.event_loop_monitor import event_loop_monitor
+from app.infra.engine import engine, get_pool_stats
+from app.infra.query_stats import MAX_FINGERPRINTS, statement_stats
+from app.infra.replica import replica_router
+from app.infra.repository.cognito import cognito_rate_limit_stats
+
+# NOTE: 運用・調査用のエンドポイント。SQLの形などを返すため、BasicAuthMiddleware で Basic 認証を要求する
+router = APIRouter()
+
+
+class QueryStatsOrder(str, Enum):
+    TOTAL = "total"
+    P95 = "p95"
+    MAX = "max"
+    COUNT = "count"
+
+
+QUERY_STATS_SORT_KEYS = {
+    QueryStatsOrder.TOTAL: "total_ms",
+    QueryStatsOrder.P95: "p95_ms",
+    QueryStatsOrder.MAX: "max_ms",
+    QueryStatsOrder.COUNT: "count",
+}
+
+
+@router.get("/db_pool", summary="コネクションプールの使用状況")
+async def db_pool_stats() -> Dict[str, Any]:
+    stats = get_pool_stats(engine)
+    if replica_router.replicas:
+        stats["replicas"] = replica_router.stats()
+    return stats
+
+
+@router.get("/db_query_stats", summary="SQLのフィンガープリント毎の実行時間")
+async def db_query_stats(
+    order_by: QueryStatsOrder = QueryStatsOrder.TOTAL,
+    limit: int = Query(50, ge=1, le=MAX_FINGERPRINTS),
+) -> List[Dict[str, Any]]:
+    key = QUERY_STATS_SORT_KEYS[order_by]
+    stats = sorted(
+        statement_stats.snapshot(), key=lambda entry: entry[key], reverse=True
+    )
+    return stats[:limit]
+
+
+@router.delete(
+    "/db_query_stats", status_code=204, summary="SQLの実行時間の集計をリセット"
+)
+async def reset_db_query_stats() -> None:
+    statement_stats.clear()
+
+
+@router.get(
+    "/cognito_rate_limit", summary="Cognito API の呼び出し数・スロットリング回数"
+)
+async def cognito_rate_limit() -> Dict[str, Dict[str, Any]]:
+    return cognito_rate_limit_stats.snapshot()
+
+
+@router.get("/event_loop", summary="イベントループの遅延とスレッドプールの使用状況")
+async def event_loop_stats() -> Dict[str, Any]:
+    limiter = to_thread.current_default_thread_limiter().statistics()
+    return {
+        "lag": event_loop_monitor.stats(),
+        "threadpool": {
+            "size": limiter.total_tokens,
+            "in_use": limiter.borrowed_tokens,
+            "waiting": limiter.tasks_waiting,
+        },
+    }
@@ -0,0 +1,89 @@
+import gzip
+from typing import Dict, cast
+
+import brotli
+import orjson
+from fastapi import APIRouter, FastAPI, Request, Response
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
+from fastapi.responses import HTMLResponse
+
+from app.router.middleware import select_content_encoding
+
+OPENAPI_URL = "/openapi.json"
+SWAGGER_UI_OAUTH2_REDIRECT_URL = "/docs/oauth2-redirect"
+
+# 圧縮しない場合のキー
+IDENTITY = "identity"
+
+
+class OpenAPIDocument:
+    """
+    OpenAPI のドキュメントを JSON にし、圧縮形式毎に圧縮した結果をキャッシュする。
+    ドキュメントは起動後に変わらないため、リクエスト毎にシリアライズ・圧縮しない。
+    """
+
+    def __init__(self) -> None:
+        self._bodies: Dict[str, bytes] = {}
+
+    def build(self, app: FastAPI) -> None:
+        """1度だけ行うため、圧縮率を優先する"""
+        body = orjson.dumps(app.openapi())
+        self._bodies = {
+            IDENTITY: body,
+            "gzip": gzip.compress(body, compresslevel=9),
+            "br": cast(bytes, brotli.compress(body, quality=11)),
+        }
+
+    def response(self, request: Request) -> Response:
+        # NOTE: 起動時（lifespan）に作成していない場合は、最初のリクエストで作成する
+        if not self._bodies:
+            self.build(request.app)
+        content_encoding = select_content_encoding(
+            request.headers.get("accept-encoding", "")
+        )
+        headers = {"Vary": "Accept-Encoding"}
+        if content_encoding is None:
+            return Response(
+                self._bodies[IDENTITY], media_type="application/json", headers=headers
+            )
+        headers["Content-Encoding"] = content_encoding
+        return Response(
+            self._bodies[content_encoding],
+            media_type="application/json",
+            headers=headers,
+        )
+
+
+openapi_document = OpenAPIDocument()
+
+# NOTE: FastAPI 標準の /openapi.json はリクエスト毎にシリアライズするため、
+# ドキュメントのエンドポイントは無効にし、こちらで提供する
+router = APIRouter(include_in_schema=False)
+
+
+@router.get(OPENAPI_URL)
+def get_openapi(request: Request) -> Response:
+    return openapi_document.response(request)
+
+
+@router.get("/docs")
+async def get_swagger_ui(request: Request) -> HTMLResponse:
+    return get_swagger_ui_html(
+        openapi_url=OPENAPI_URL,
+        title=f"{request.app.title} - Swagger UI",
+        oauth2_redirect_url=SWAGGER_UI_OAUTH2_REDIRECT_URL,
+    )
+
+
+@router.get(SWAGGER_UI_OAUTH2_REDIRECT_URL)
+async def get_swagger_ui_oauth2_redirect() -> HTMLResponse:
+    return get_swagger_ui_oauth2_redirect_html()
+
+
+@router.get("/redoc")
+async def get_redoc(request: Request) -> HTMLResponse:
+    return get_redoc_html(openapi_url=OPENAPI_URL, title=f"{request.app.title} - ReDoc")
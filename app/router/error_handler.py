@@ -1,8 +1,9 @@
 import traceback
+from typing import Dict, Type
 
-from fastapi import Request, Response, status
+from fastapi import status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.usecase.error import (
     AppAdminAccessDeniedError,
@@ -23,71 +24,72 @@ from app.util import setup_logger
 
 logger = setup_logger(__name__)
 
+# 例外とレスポンスのステータスコードの対応。登録されていない例外は 500 とする
+# NOTE: サブクラスは継承元の例外のステータスコードになる
+ERROR_STATUS_CODES: Dict[Type[BaseException], int] = {
+    ValidationParamError: status.HTTP_422_UNPROCESSABLE_ENTITY,
+    TypeError: status.HTTP_422_UNPROCESSABLE_ENTITY,
+    EntityNotFoundError: status.HTTP_404_NOT_FOUND,
+    GetListUserOrganizationByUserIdEmptyError: status.HTTP_404_NOT_FOUND,
+    ConflictError: status.HTTP_409_CONFLICT,
+    DuplicateError: status.HTTP_409_CONFLICT,
+    AppAdminAccessDeniedError: status.HTTP_401_UNAUTHORIZED,
+    OrgMemberAccessDeniedError: status.HTTP_401_UNAUTHORIZED,
+    GenerationAccessDeniedError: status.HTTP_401_UNAUTHORIZED,
+    MemberAccessDeniedError: status.HTTP_401_UNAUTHORIZED,
+    PermissionDeniedError: status.HTTP_403_FORBIDDEN,
+    AppAdminOnlyAccessError: status.HTTP_403_FORBIDDEN,
+    LackOfPlaceholderInOpenAIResponseError: status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+    LackOfRequiredAnswerError: status.HTTP_400_BAD_REQUEST,
+}
+
+
+def get_error_status_code(exc: Exception) -> int:
+    for exc_type in type(exc).__mro__:
+        status_code = ERROR_STATUS_CODES.get(exc_type)
+        if status_code is not None:
+            return status_code
+    return status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
+class ErrorHandler:
+    """
+    リクエストの処理中に発生した例外を、ERROR_STATUS_CODES に従ってエラーレスポンスに変換する Middleware。
+    想定されたエラー（4xx）はメッセージのみ、それ以外（5xx）はスタックトレースをログに出力する。
+
+    NOTE: レスポンスの送信開始後（ストリーミング中）に発生した例外は、ステータスを変更できないため再送出する。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_with_state(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
 
-class ErrorHandler(BaseHTTPMiddleware):
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
         try:
-            response: Response = await call_next(request)
-        except (ValidationParamError, TypeError) as exc:
-            logger.error(traceback.format_exc())
-            response = JSONResponse(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                content={"message": f"{str(exc)}"},
-            )
-        except (
-            EntityNotFoundError,
-            GetListUserOrganizationByUserIdEmptyError,
-        ) as exc:
-            logger.error(traceback.format_exc())
-            response = JSONResponse(
-                status_code=status.HTTP_404_NOT_FOUND,
-                content={"message": str(exc)},
-            )
-        except (ConflictError, DuplicateError) as exc:
-            logger.error(traceback.format_exc())
-            response = JSONResponse(
-                status_code=status.HTTP_409_CONFLICT,
-                content={"message": f"{str(exc)}"},
-            )
-        except (
-            AppAdminAccessDeniedError,
-            OrgMemberAccessDeniedError,
-            GenerationAccessDeniedError,
-            MemberAccessDeniedError,
-        ) as exc:
-            logger.error(traceback.format_exc())
-            response = JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={"message": str(exc)},
-            )
-        except (
-            PermissionDeniedError,
-            AppAdminOnlyAccessError,
-        ) as exc:
-            logger.error(traceback.format_exc())
-            response = JSONResponse(
-                status_code=status.HTTP_403_FORBIDDEN,
-                content={"message": str(exc)},
-            )
-        except LackOfPlaceholderInOpenAIResponseError as exc:
-            logger.error(traceback.format_exc())
-            response = JSONResponse(
-                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
-                content={"message": str(exc)},
-            )
-        except LackOfRequiredAnswerError as exc:
-            logger.error(traceback.format_exc())
-            response = JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={"message": str(exc)},
-            )
+            await self.app(scope, receive, send_with_state)
         except Exception as exc:
-            logger.error(traceback.format_exc())
+            status_code = get_error_status_code(exc)
+            if status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+                logger.error(traceback.format_exc())
+            else:
+                logger.warning(
+                    f"{scope['method']} {scope['path']} {status_code} "
+                    f"{type(exc).__name__}: {exc}"
+                )
+            if response_started:
+                raise
             response = JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={"message": f"{str(exc)}"},
+                status_code=status_code, content={"message": str(exc)}
             )
-
-        return response
+            await response(scope, receive, send)
@@ -0,0 +1,33 @@
+import csv
+import io
+from typing import Any, AsyncIterator, Dict, List, Sequence
+
+from pydantic_core import to_json, to_jsonable_python
+
+
+async def to_ndjson_chunks(
+    batches: AsyncIterator[List[Dict[str, Any]]],
+) -> AsyncIterator[bytes]:
+    """
+    行のバッチを NDJSON（1行1JSON）に変換する。バッチ毎に1つのチャンクを返す。
+    日時などの形式は通常のAPIのレスポンス（pydantic）に合わせる。
+    """
+    async for batch in batches:
+        yield b"".join(to_json(row) + b"\n" for row in batch)
+
+
+async def to_csv_chunks(
+    batches: AsyncIterator[List[Dict[str, Any]]], columns: Sequence[str]
+) -> AsyncIterator[str]:
+    """行のバッチを、ヘッダー行付きの CSV に変換する。バッチ毎に1つのチャンクを返す"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    async for batch in batches:
+        writer.writerows(to_jsonable_python(batch))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # NOTE: 0件の場合もヘッダー行は返す
+    if buffer.tell():
+        yield buffer.getvalue()
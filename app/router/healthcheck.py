@@ -6,11 +6,14 @@ from sqlalchemy.orm import Session
 
 from app.dependencies.db import get_db
 
+# NOTE: ロードバランサーから認証なしで呼ばれるため、死活監視のみを提供する。
+# 運用・調査用のエンドポイントは admin.router に置く
 router = APIRouter()
 
 
+# NOTE: 同期的なDBアクセスを行うため、スレッドプールで実行されるよう def で定義する
 @router.get("", summary="ヘルスチェック")
-async def health_check(
+def health_check(
     db: Session = Depends(get_db),
 ) -> Dict[str, Union[str, Dict[str, str]]]:
     try:
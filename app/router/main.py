@@ -1,67 +1,87 @@
-import base64
-from typing import Any
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
 
-from fastapi import FastAPI, Request
+from anyio import to_thread
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
+import app.router.admin as admin
+import app.router.docs as docs
 import app.router.healthcheck as healthcheck
 import app.router.organization as organization
 import app.router.user as user
 
 # import app.router.user_organization as user_organization
 from app.config import settings
+from app.dependencies.auth import close_jwks_http_client
+from app.dependencies.dependency_injector import (
+    get_shared_injector,
+    warm_up_injector,
+)
+from app.event_loop_monitor import event_loop_monitor
+from app.infra.engine import dispose_async_engine
+from app.infra.replica import replica_router
+from app.infra.repository.cognito import shutdown_cognito_executor
+from app.router.docs import openapi_document
 from app.router.error_handler import ErrorHandler
+from app.router.middleware import (
+    QUERY_COUNT_HEADER,
+    QUERY_TIME_HEADER,
+    BasicAuthMiddleware,
+    CompressionMiddleware,
+    QueryStatsMiddleware,
+    RequestDBContextMiddleware,
+)
+from app.router.util import NEXT_CURSOR_HEADER
+from app.usecase.outbox import OutboxUsecase
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    warm_up_injector()
+    openapi_document.build(app)
+    # NOTE: run_in_threadpool と同期的なエンドポイント・依存関係は、このスレッドプールで実行される
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    stop_event_loop_monitor = asyncio.Event()
+    monitor = asyncio.create_task(event_loop_monitor.run(stop_event_loop_monitor))
+    stop_outbox_worker = asyncio.Event()
+    outbox_worker: Optional[asyncio.Task[None]] = None
+    if settings.OUTBOX_WORKER_ENABLED:
+        outbox_usecase = get_shared_injector().get(OutboxUsecase)
+        outbox_worker = asyncio.create_task(
+            outbox_usecase.run_worker(stop_outbox_worker)
+        )
+    yield
+    stop_outbox_worker.set()
+    if outbox_worker is not None:
+        await outbox_worker
+    stop_event_loop_monitor.set()
+    await monitor
+    await close_jwks_http_client()
+    await dispose_async_engine()
+    shutdown_cognito_executor()
+    for replica in replica_router.replicas:
+        replica.dispose()
+        await replica.dispose_async()
+
 
 app = FastAPI(
     title="Product",
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json",
-    swagger_ui_oauth2_redirect_url="/docs/oauth2-redirect",
+    # NOTE: /docs, /redoc, /openapi.json は、圧縮済みの OpenAPI を返す docs.router で提供する
+    docs_url=None,
+    redoc_url=None,
+    openapi_url=None,
+    lifespan=lifespan,
 )
 
 app.add_middleware(ErrorHandler)
 
+app.add_middleware(CompressionMiddleware)
 
-# Basic 認証の Middleware（/docs, /redoc, /openapi.json のみ適用）
-@app.middleware("http")
-async def basic_auth_middleware(request: Request, call_next: Any) -> Any:
-    """
-    /docs, /redoc, /openapi.json へのアクセス時に Basic 認証を要求する Middleware
-    """
-    if settings.SERVICE_ENV != "local" and request.url.path in [
-        "/docs",
-        "/redoc",
-        "/openapi.json",
-    ]:
-        auth = request.headers.get("Authorization")
-        if not auth or not auth.startswith("Basic "):
-            return JSONResponse(
-                status_code=401,
-                content={"detail": "Unauthorized"},
-                headers={"WWW-Authenticate": "Basic"},
-            )
-
-        # Basic 認証の検証
-        try:
-            decoded = base64.b64decode(auth.split(" ")[1]).decode("utf-8")
-            username, password = decoded.split(":", 1)
-            if (
-                username != settings.BASIC_USERNAME
-                or password != settings.BASIC_PASSWORD
-            ):
-                raise ValueError
-        except Exception:
-            return JSONResponse(
-                status_code=401,
-                content={"detail": "Invalid credentials"},
-                headers={"WWW-Authenticate": "Basic"},
-            )
-
-    response = await call_next(request)
-    return response
 
+# Basic 認証の Middleware（/docs, /redoc, /openapi.json, /admin のみ適用）
+app.add_middleware(BasicAuthMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -69,10 +89,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, QUERY_COUNT_HEADER, QUERY_TIME_HEADER],
 )
 
+app.add_middleware(RequestDBContextMiddleware)
+
+app.add_middleware(QueryStatsMiddleware)
+
+app.include_router(docs.router)
+
 app.include_router(healthcheck.router, prefix="/health", tags=["health_check"])
 
+app.include_router(admin.router, prefix="/admin", tags=["admin"])
+
 app.include_router(
     organization.router, prefix="/api/organization", tags=["organization"]
 )
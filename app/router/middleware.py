@@ -0,0 +1,307 @@
+import base64
+import binascii
+import secrets
+import zlib
+from typing import Dict, Optional, Tuple, Union, cast
+
+import brotli
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.infra.query_stats import collect_query_stats
+from app.infra.repository.db import request_db_context
+from app.util import setup_logger
+
+logger = setup_logger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Query-Time-Ms"
+
+# Basic 認証を要求するパス（配下のパスを含む）。ドキュメントと運用・調査用のエンドポイント
+BASIC_AUTH_PATHS = ("/docs", "/redoc", "/openapi.json", "/admin")
+
+# 対応する圧縮形式（Accept-Encoding の q 値が同じ場合は先に書いたものを優先する）
+CONTENT_ENCODINGS = ("br", "gzip")
+
+
+class RequestDBContextMiddleware:
+    """
+    リクエスト毎に RequestDBContext を用意する Middleware。
+    リクエスト内のリポジトリ呼び出しでセッション（接続）を共有し、終了時にプールへ返す。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async with request_db_context():
+            await self.app(scope, receive, send)
+
+
+class QueryStatsMiddleware:
+    """
+    リクエスト毎に実行したSQLの件数・合計時間を集計し、レスポンスヘッダーとログに出力する Middleware。
+    同じSQLが DB_N_PLUS_ONE_THRESHOLD 回以上実行された場合は、N+1 の可能性として警告する。
+
+    NOTE: ヘッダーはレスポンスの開始時点の値のため、ストリーミング中に実行したSQLはログにのみ含まれる。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with collect_query_stats() as stats:
+
+            async def send_with_query_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append(QUERY_COUNT_HEADER, str(stats.count))
+                    headers.append(
+                        QUERY_TIME_HEADER, f"{stats.total_seconds * 1000:.1f}"
+                    )
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_query_stats)
+            finally:
+                if stats.count > 0:
+                    endpoint = f"{scope['method']} {scope['path']}"
+                    logger.info(
+                        f"{endpoint} DBクエリ: {stats.count}件, {stats.total_seconds * 1000:.1f}ms"
+                    )
+                    for statement, count in stats.repeated_statements(
+                        settings.DB_N_PLUS_ONE_THRESHOLD
+                    ):
+                        logger.warning(
+                            f"{endpoint} 同じSQLが{count}回実行されています（N+1の可能性）: {statement}"
+                        )
+
+
+def _requires_basic_auth(path: str) -> bool:
+    return any(
+        path == prefix or path.startswith(f"{prefix}/") for prefix in BASIC_AUTH_PATHS
+    )
+
+
+def _get_basic_credentials(scope: Scope) -> Optional[Tuple[bytes, bytes]]:
+    """Authorization ヘッダーから Basic 認証のユーザー名とパスワードを取得する"""
+    for name, value in scope["headers"]:
+        if name != b"authorization":
+            continue
+        auth_scheme, _, encoded = value.partition(b" ")
+        if auth_scheme.lower() != b"basic":
+            return None
+        try:
+            username, separator, password = base64.b64decode(
+                encoded, validate=True
+            ).partition(b":")
+        except (binascii.Error, ValueError):
+            return None
+        return (username, password) if separator else None
+    return None
+
+
+class BasicAuthMiddleware:
+    """
+    BASIC_AUTH_PATHS（/docs, /redoc, /openapi.json, /admin）へのアクセス時に Basic 認証を要求する Middleware。
+    それ以外のリクエストはパスのみを見て、そのまま通す。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not _requires_basic_auth(scope["path"])
+            or settings.SERVICE_ENV == "local"
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        credentials = _get_basic_credentials(scope)
+        if credentials is None:
+            response = JSONResponse(
+                status_code=401,
+                content={"detail": "Unauthorized"},
+                headers={"WWW-Authenticate": "Basic"},
+            )
+            await response(scope, receive, send)
+            return
+
+        # NOTE: タイミング攻撃を避けるため、ユーザー名とパスワードの両方を一定時間で比較する
+        username, password = credentials
+        username_matches = secrets.compare_digest(
+            username, settings.BASIC_USERNAME.encode("utf-8")
+        )
+        password_matches = secrets.compare_digest(
+            password, settings.BASIC_PASSWORD.encode("utf-8")
+        )
+        if not (username_matches and password_matches):
+            response = JSONResponse(
+                status_code=401,
+                content={"detail": "Invalid credentials"},
+                headers={"WWW-Authenticate": "Basic"},
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+
+def select_content_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Accept-Encoding から、レスポンスの圧縮形式を選ぶ。
+    対応する形式をクライアントが受け付けない場合（q=0 を含む）は None を返す。
+    """
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    selected: Optional[str] = None
+    selected_quality = 0.0
+    for content_encoding in CONTENT_ENCODINGS:
+        quality = qualities.get(content_encoding, qualities.get("*", 0.0))
+        if quality > selected_quality:
+            selected, selected_quality = content_encoding, quality
+    return selected
+
+
+class _GzipEncoder:
+    def __init__(self) -> None:
+        self._compressor = zlib.compressobj(
+            settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self) -> None:
+        self._compressor = brotli.Compressor(
+            quality=settings.COMPRESSION_BROTLI_QUALITY
+        )
+
+    def compress(self, data: bytes) -> bytes:
+        return cast(bytes, self._compressor.process(data))
+
+    def flush(self) -> bytes:
+        return cast(bytes, self._compressor.flush())
+
+    def finish(self) -> bytes:
+        return cast(bytes, self._compressor.finish())
+
+
+def _create_encoder(content_encoding: str) -> Union[_GzipEncoder, _BrotliEncoder]:
+    if content_encoding == "br":
+        return _BrotliEncoder()
+    return _GzipEncoder()
+
+
+def _compress(
+    encoder: Union[_GzipEncoder, _BrotliEncoder], message: Message
+) -> Message:
+    """ボディを圧縮する。続きがある場合は、それまでのデータがクライアントに届くようフラッシュする"""
+    body = encoder.compress(message.get("body", b""))
+    more_body = message.get("more_body", False)
+    body += encoder.flush() if more_body else encoder.finish()
+    return {"type": "http.response.body", "body": body, "more_body": more_body}
+
+
+class _CompressionResponder:
+    """
+    1つのレスポンスを圧縮して送る。圧縮するかどうかは最初のボディを見て決める。
+    ストリーミングのレスポンスはチャンク毎に圧縮してフラッシュし、全体をメモリに保持しない。
+    """
+
+    def __init__(self, content_encoding: Optional[str], send: Send) -> None:
+        self._content_encoding = content_encoding
+        self._send = send
+        self._start_message: Optional[Message] = None
+        self._encoder: Optional[Union[_GzipEncoder, _BrotliEncoder]] = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # NOTE: ヘッダーは最初のボディを見てから送る
+            self._start_message = message
+            return
+        if self._start_message is not None:
+            start_message, self._start_message = self._start_message, None
+            if message["type"] == "http.response.body":
+                message = self._start_compression(start_message, message)
+            await self._send(start_message)
+            await self._send(message)
+            return
+        if self._encoder is not None and message["type"] == "http.response.body":
+            message = _compress(self._encoder, message)
+        await self._send(message)
+
+    def _start_compression(self, start_message: Message, message: Message) -> Message:
+        headers = MutableHeaders(scope=start_message)
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if (
+            "content-encoding" in headers
+            or headers.get("content-type", "").startswith("text/event-stream")
+            or (not more_body and len(body) < settings.COMPRESSION_MINIMUM_SIZE)
+        ):
+            return message
+
+        if "accept-encoding" not in headers.get("vary", "").lower():
+            headers.add_vary_header("Accept-Encoding")
+        if self._content_encoding is None:
+            return message
+        self._encoder = _create_encoder(self._content_encoding)
+        headers["Content-Encoding"] = self._content_encoding
+        message = _compress(self._encoder, message)
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(message["body"]))
+        return message
+
+
+class CompressionMiddleware:
+    """
+    Accept-Encoding に応じて、レスポンスを brotli または gzip で圧縮する Middleware。
+    COMPRESSION_MINIMUM_SIZE より小さいレスポンスと、圧縮済みのレスポンスはそのまま返す。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_encoding = select_content_encoding(
+            Headers(scope=scope).get("accept-encoding", "")
+        )
+        responder = _CompressionResponder(content_encoding, send)
+        await self.app(scope, receive, responder.send)
@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional
 
-from fastapi import APIRouter, Body, Depends, status
+from fastapi import APIRouter, Body, Depends, Query, status
 from fastapi.openapi.models import Example
 from injector import Injector
 
@@ -9,15 +9,21 @@ from app.dependencies import dependency_injector
 
 # from app.dependencies.auth import verify_token_and_get_email
 from app.domain.constants import NOT_SPECIFIED_ID
-from app.domain.entity.organization import Organization
-from app.router.schemas.organization import OrganizationResponse
+from app.domain.entity.organization import ORGANIZATION_LIST_ADAPTER, Organization
+from app.router.responses import ORJSONResponse, to_list_response
+from app.router.schemas.organization import (
+    ORGANIZATION_RESPONSE_FIELDS,
+    OrganizationResponse,
+)
 
-# from app.router.util import is_user_role_app_admin
+# from app.domain.entity.principal import Principal
+# from app.router.util import get_principal, is_user_role_app_admin
 # from app.usecase.error import AppAdminOnlyAccessError
 from app.usecase.organization import (
     CreateOrganizationParams,
-    OrganizationUsecase,
+    OrganizationAsyncUsecase,
 )
+from app.usecase.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
 
 router = APIRouter()
 
@@ -47,8 +53,8 @@ async def create_organization(
     injector: Injector = Depends(dependency_injector.get_injector),
 ) -> OrganizationResponse:
     # TODO: 認可処理を入れる。アプリ管理者のみが操作できる。
-    organization_usecase = injector.get(OrganizationUsecase)
-    organization_entity = organization_usecase.create_organization(params=params)
+    organization_usecase = injector.get(OrganizationAsyncUsecase)
+    organization_entity = await organization_usecase.create_organization(params=params)
     # TODO: Entity-Responseの型変換を関数化する。
     return OrganizationResponse(
         id=(
@@ -86,8 +92,8 @@ async def get_organization(
     # _: Dict[str, Any] = Depends(verify_token_and_get_email),
     injector: Injector = Depends(dependency_injector.get_injector),
 ) -> Organization:
-    organization_usecase = injector.get(OrganizationUsecase)
-    return organization_usecase.get_organization(organization_id)
+    organization_usecase = injector.get(OrganizationAsyncUsecase)
+    return await organization_usecase.get_organization(organization_id)
 
 
 @router.get(
@@ -95,17 +101,24 @@ async def get_organization(
     summary="組織の一覧取得",
     status_code=status.HTTP_200_OK,
     response_model=list[OrganizationResponse],
+    response_class=ORJSONResponse,
 )
 async def get_all_organizations(
-    # email: str = Depends(verify_token_and_get_email),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = Query(
+        None, description="前のページのレスポンスヘッダー X-Next-Cursor の値"
+    ),
+    # principal: Principal = Depends(get_principal),
     injector: Injector = Depends(dependency_injector.get_injector),
-) -> list[Organization]:
+) -> ORJSONResponse:
 
     # 認可処理。アプリの管理者（AA role=app_admin) が操作できる。
-    # is_app_admin, _ = is_user_role_app_admin(injector, email)
+    # is_app_admin, _ = is_user_role_app_admin(principal)
     # if not is_app_admin:
     #     raise AppAdminOnlyAccessError()
 
-    organization_usecase = injector.get(OrganizationUsecase)
-    organizations = organization_usecase.get_all_organizations()
-    return organizations
+    organization_usecase = injector.get(OrganizationAsyncUsecase)
+    page = await organization_usecase.get_all_organizations(limit=limit, cursor=cursor)
+    return to_list_response(
+        ORGANIZATION_LIST_ADAPTER, page, ORGANIZATION_RESPONSE_FIELDS
+    )
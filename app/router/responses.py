@@ -0,0 +1,39 @@
+from typing import Any, List, Set, TypeVar
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.domain.entity.page import Page
+from app.router.util import set_next_cursor_header
+
+T = TypeVar("T")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    orjson でシリアライズするレスポンス。
+    日時の形式は通常のAPIのレスポンス（pydantic）に合わせ、UTC は Z で表す。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def to_list_response(
+    adapter: TypeAdapter[List[T]], page: Page[T], fields: Set[str]
+) -> ORJSONResponse:
+    """
+    検証済みのエンティティの一覧から、レスポンスを作成する。
+    Response を返すと FastAPI は response_model による再検証を行わないため、
+    エンティティの検証（リポジトリ）の1回だけで済む。response_model は OpenAPI のために残す。
+
+    Args:
+        adapter: エンティティの一覧の TypeAdapter
+        page: 一覧の1ページ分の結果
+        fields: レスポンスに含めるフィールド（response_model のフィールド）
+    """
+    content = adapter.dump_python(page.items, include={"__all__": fields})
+    response = ORJSONResponse(content)
+    set_next_cursor_header(response, page)
+    return response
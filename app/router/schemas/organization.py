@@ -10,3 +10,6 @@ class OrganizationResponse(BaseModel):
     deleted: Optional[bool]
     created_at: datetime
     updated_at: datetime
+
+
+ORGANIZATION_RESPONSE_FIELDS = set(OrganizationResponse.model_fields)
@@ -1,4 +1,6 @@
 from datetime import datetime
+from enum import Enum
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr
 
@@ -13,6 +15,29 @@ class UserResponse(BaseModel):
     updated_at: datetime
 
 
+class UserBulkCreateResultResponse(BaseModel):
+    index: int
+    cognito_user_id: Optional[str]
+    email: Optional[str]
+    user: Optional[UserResponse]
+    error: Optional[str]
+
+
+class UserBulkCreateResponse(BaseModel):
+    created_count: int
+    failed_count: int
+    results: List[UserBulkCreateResultResponse]
+
+
+class UserExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+USER_EXPORT_COLUMNS = list(UserResponse.model_fields)
+USER_RESPONSE_FIELDS = set(UserResponse.model_fields)
+
+
 class UserCreateParams(BaseModel):
     cognito_user_id: str
     email: EmailStr
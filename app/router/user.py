@@ -1,26 +1,42 @@
 from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Body, Depends, status
+from fastapi import APIRouter, Body, Depends, Query, status
 from fastapi.openapi.models import Example
+from fastapi.responses import StreamingResponse
 from injector import Injector
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.dependencies import dependency_injector
 
 # from app.dependencies.auth import verify_token_and_get_email
-from app.dependencies.db import get_db
 from app.domain.constants import NOT_SPECIFIED_ID
-from app.domain.entity.user import User as UserEntity
+from app.domain.entity.principal import Principal
+from app.domain.entity.user import USER_LIST_ADAPTER
 from app.domain.entity.user_organization import UserRole
-from app.router.schemas.user import UserResponse
+from app.router.export import to_csv_chunks, to_ndjson_chunks
+from app.router.responses import ORJSONResponse, to_list_response
+from app.router.schemas.user import (
+    USER_EXPORT_COLUMNS,
+    USER_RESPONSE_FIELDS,
+    UserBulkCreateResponse,
+    UserExportFormat,
+    UserResponse,
+)
+from app.router.util import get_principal, is_user_role_app_admin
 
 # from app.router.util import (
 #     get_user_and_role,
-#     is_user_role_app_admin,
 #     is_user_role_app_admin_or_org_admin,
 # )
 # from app.usecase.error import MemberAccessDeniedError
-from app.usecase.user import UserCreateParams, UserUsecase
+from app.usecase.error import AppAdminOnlyAccessError
+from app.usecase.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
+from app.usecase.user import (
+    UserAsyncUsecase,
+    UserBulkCreateParams,
+    UserCreateParams,
+    UserUsecase,
+)
 
 router = APIRouter()
 
@@ -48,40 +64,149 @@ create_user_params_example: Dict[str, Example] = {
 )
 async def create_user(
     params: UserCreateParams = Body(..., openapi_examples=create_user_params_example),
-    # email: str = Depends(verify_token_and_get_email),
+    # principal: Principal = Depends(get_principal),
     injector: Injector = Depends(dependency_injector.get_injector),
 ) -> UserResponse:
     user_usecase = injector.get(UserUsecase)
     # role = None
-    # is_app_admin, _ = is_user_role_app_admin(injector, email)
+    # is_app_admin, _ = is_user_role_app_admin(principal)
     # if is_app_admin:
     #     role = UserRole.APP_ADMIN
     # else:
-    #     role, _ = get_user_and_role(injector, email, params.organization_id)
+    #     role, _ = get_user_and_role(principal, params.organization_id)
 
     # TODO: 認可処理をする。
     role = UserRole.APP_ADMIN
 
-    user = user_usecase.create_user(role=role, params=params)
+    user = await run_in_threadpool(user_usecase.create_user, role=role, params=params)
     return UserResponse.model_validate(user.model_dump())
 
 
+bulk_create_users_params_example: Dict[str, Example] = {
+    "ユーザ一括作成": {
+        "summary": "ユーザ一括作成リクエストの例",
+        "description": "作成するユーザを配列で指定します。結果はユーザ毎に返します。",
+        "value": {
+            "users": [
+                {
+                    "cognito_user_id": "member1",
+                    "email": "member1@example.com",
+                    "display_name": "member1",
+                    "role": UserRole.MEMBER,
+                    "organization_id": 1,
+                    "password": "Samplepassword_123",
+                },
+                {
+                    "cognito_user_id": "member2",
+                    "email": "member2@example.com",
+                    "display_name": "member2",
+                    "role": UserRole.MEMBER,
+                    "organization_id": 1,
+                    "password": "Samplepassword_123",
+                },
+            ]
+        },
+    }
+}
+
+
+@router.post(
+    "/bulk",
+    summary="ユーザ一括作成",
+    status_code=status.HTTP_200_OK,
+    response_model=UserBulkCreateResponse,
+)
+async def bulk_create_users(
+    params: UserBulkCreateParams = Body(
+        ..., openapi_examples=bulk_create_users_params_example
+    ),
+    principal: Principal = Depends(get_principal),
+    injector: Injector = Depends(dependency_injector.get_injector),
+) -> UserBulkCreateResponse:
+    # NOTE: 任意の組織・ロールのユーザーを Cognito にまとめて作成するため、アプリ管理者のみが操作できる
+    is_app_admin, _ = is_user_role_app_admin(principal)
+    if not is_app_admin:
+        raise AppAdminOnlyAccessError()
+    role = UserRole.APP_ADMIN
+
+    user_usecase = injector.get(UserUsecase)
+
+    # NOTE: 件数が多いと時間がかかるため、スレッドプールで実行する
+    results = await run_in_threadpool(
+        user_usecase.bulk_create_users, role=role, params=params
+    )
+    created_count = sum(1 for result in results if result.error is None)
+    return UserBulkCreateResponse.model_validate(
+        {
+            "created_count": created_count,
+            "failed_count": len(results) - created_count,
+            "results": [result.model_dump() for result in results],
+        }
+    )
+
+
 @router.get(
     "",
     summary="ユーザ一覧取得",
     status_code=status.HTTP_200_OK,
     response_model=List[UserResponse],
+    response_class=ORJSONResponse,
 )
 async def get_users(
     organization_id: Optional[int] = NOT_SPECIFIED_ID,
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    cursor: Optional[str] = Query(
+        None, description="前のページのレスポンスヘッダー X-Next-Cursor の値"
+    ),
     # _: Dict[str, Any] = Depends(verify_token_and_get_email),
-    db: Session = Depends(get_db),
     injector: Injector = Depends(dependency_injector.get_injector),
-) -> List[UserEntity]:
-    user_usecase = injector.get(UserUsecase)
-    # TODO: 組織IDでの絞り込み処理を実装
-    users = user_usecase.get_users(db)
-    return [UserEntity.model_validate(user) for user in users]
+) -> ORJSONResponse:
+    user_usecase = injector.get(UserAsyncUsecase)
+    page = await user_usecase.get_users(
+        limit=limit,
+        cursor=cursor,
+        organization_id=(
+            organization_id if organization_id != NOT_SPECIFIED_ID else None
+        ),
+    )
+    return to_list_response(USER_LIST_ADAPTER, page, USER_RESPONSE_FIELDS)
+
+
+@router.get(
+    "/export",
+    summary="ユーザ一覧のエクスポート",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+async def export_users(
+    format: UserExportFormat = UserExportFormat.NDJSON,
+    organization_id: Optional[int] = NOT_SPECIFIED_ID,
+    principal: Principal = Depends(get_principal),
+    injector: Injector = Depends(dependency_injector.get_injector),
+) -> StreamingResponse:
+    # NOTE: 全ユーザーのメールアドレス・ロールを返すため、アプリ管理者のみが操作できる
+    is_app_admin, _ = is_user_role_app_admin(principal)
+    if not is_app_admin:
+        raise AppAdminOnlyAccessError()
+
+    user_usecase = injector.get(UserAsyncUsecase)
+    batches = user_usecase.export_users(
+        organization_id=(
+            organization_id if organization_id != NOT_SPECIFIED_ID else None
+        )
+    )
+    # NOTE: 取得したバッチを逐次レスポンスに書き出し、一覧をメモリに保持しない
+    if format is UserExportFormat.CSV:
+        return StreamingResponse(
+            to_csv_chunks(batches, USER_EXPORT_COLUMNS),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="users.csv"'},
+        )
+    return StreamingResponse(
+        to_ndjson_chunks(batches),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="users.ndjson"'},
+    )
 
 
 update_user_params_example: Dict[str, Example] = {
@@ -98,14 +223,14 @@ update_user_params_example: Dict[str, Example] = {
 )
 async def delete_user(
     cognito_user_id: str,
-    # email: str = Depends(verify_token_and_get_email),
+    # principal: Principal = Depends(get_principal),
     injector: Injector = Depends(dependency_injector.get_injector),
 ) -> None:
-    # is_app_admin_or_org_admin, _ = is_user_role_app_admin_or_org_admin(injector, email)
+    # is_app_admin_or_org_admin, _ = is_user_role_app_admin_or_org_admin(principal)
 
     # if is_app_admin_or_org_admin is False:
     #     raise MemberAccessDeniedError()
 
     user_usecase = injector.get(UserUsecase)
-    user_usecase.delete_user(cognito_user_id=cognito_user_id)
+    await run_in_threadpool(user_usecase.delete_user, cognito_user_id=cognito_user_id)
     return
@@ -1,51 +1,80 @@
-from typing import Tuple
+from typing import Any, Tuple
 
+from fastapi import Depends, Response
 from injector import Injector
 
+from app.dependencies import dependency_injector
+from app.dependencies.auth import verify_token_and_get_email
+from app.domain.entity.page import Page
+from app.domain.entity.principal import Principal
 from app.domain.entity.user import User
-from app.domain.entity.user_organization import UserRole
-from app.usecase.user import UserUsecase
-from app.usecase.user_organization import UserOrganizationUsecase
+from app.domain.entity.user_organization import UserOrganization, UserRole
+from app.usecase.error import (
+    EntityNotFoundError,
+    GetListUserOrganizationByUserIdEmptyError,
+)
+from app.usecase.user import UserAsyncUsecase
+
+
+async def get_principal(
+    email: str = Depends(verify_token_and_get_email),
+    injector: Injector = Depends(dependency_injector.get_injector),
+) -> Principal:
+    """
+    リクエストを行ったユーザーと所属組織・ロールを取得する。
+    FastAPIの依存関係はリクエスト内でキャッシュされるため、1リクエストにつき1回だけ解決される。
+    """
+    user_usecase = injector.get(UserAsyncUsecase)
+    return await user_usecase.get_principal(email=email)
 
 
 def get_user_and_role(
-    injector: Injector, email: str, organization_id: int
+    principal: Principal, organization_id: int
 ) -> Tuple[UserRole, User]:
-    user_usecase = injector.get(UserUsecase)
-    user_org_usecase = injector.get(UserOrganizationUsecase)
-
-    # user_id取得のためemailからユーザー詳細取得
-    user: User = user_usecase.get_user_by_email(email=email)
+    user = principal.user
+    for user_org in principal.user_organizations:
+        if user_org.organization_id == organization_id:
+            return user_org.role, user
 
-    role: UserRole = user_org_usecase.get_role_by_user_id_and_organization_id(
-        user_id=user.id, organization_id=organization_id
+    raise EntityNotFoundError(
+        entity_name="UserOrganization",
+        entity_id=organization_id,
+        message=f"指定された組織が存在しないか、組織にユーザーが所属していません。 user_id: {user.id}, organization_id: {organization_id}",
     )
 
-    return role, user
 
-
-def is_user_role_app_admin(injector: Injector, email: str) -> Tuple[bool, User]:
-    user_usecase = injector.get(UserUsecase)
-    user_org_usecase = injector.get(UserOrganizationUsecase)
-    user: User = user_usecase.get_user_by_email(email=email)
-
-    user_orgs = user_org_usecase.get_user_organizations_by_user_id(user_id=user.id)
+def is_user_role_app_admin(principal: Principal) -> Tuple[bool, User]:
+    user_orgs = get_user_organizations(principal)
 
     is_app_admin = any(user_org.role == UserRole.APP_ADMIN for user_org in user_orgs)
-    return is_app_admin, user
-
+    return is_app_admin, principal.user
 
-def is_user_role_app_admin_or_org_admin(
-    injector: Injector, email: str
-) -> Tuple[bool, User]:
-    user_usecase = injector.get(UserUsecase)
-    user_org_usecase = injector.get(UserOrganizationUsecase)
-    user: User = user_usecase.get_user_by_email(email=email)
 
-    user_orgs = user_org_usecase.get_user_organizations_by_user_id(user_id=user.id)
+def is_user_role_app_admin_or_org_admin(principal: Principal) -> Tuple[bool, User]:
+    user_orgs = get_user_organizations(principal)
 
     is_app_admin_or_org_admin = any(
         user_org.role == UserRole.ORG_ADMIN or user_org.role == UserRole.APP_ADMIN
         for user_org in user_orgs
     )
-    return is_app_admin_or_org_admin, user
+    return is_app_admin_or_org_admin, principal.user
+
+
+def get_user_organizations(
+    principal: Principal,
+) -> list[UserOrganization]:
+    if not principal.user_organizations:
+        raise GetListUserOrganizationByUserIdEmptyError(user_id=principal.user.id)
+    return principal.user_organizations
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def set_next_cursor_header(response: Response, page: Page[Any]) -> None:
+    """
+    次のページのカーソルをレスポンスヘッダーに設定する。
+    一覧のレスポンスボディは配列のまま変えないため、カーソルはヘッダーで返す。
+    """
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
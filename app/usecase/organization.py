@@ -5,12 +5,17 @@ from injector import inject
 from pydantic import BaseModel, Field, model_validator
 
 from app.domain.entity.organization import Organization
+from app.domain.entity.page import Page
 
 # from app.domain.entity.user_organization import UserRole
-from app.domain.i_repository.organization import OrganizationIRepository
+from app.domain.i_repository.organization import (
+    OrganizationAsyncIRepository,
+    OrganizationIRepository,
+)
 from app.usecase.error import (
     ValidationParamError,
 )
+from app.usecase.pagination import DEFAULT_PAGE_LIMIT, decode_cursor, to_page
 
 
 class CreateOrganizationParams(BaseModel):
@@ -46,3 +51,26 @@ class OrganizationUsecase:
 
     def get_all_organizations(self) -> list[Organization]:
         return self.organization_repository.get_all_organizations()
+
+
+@inject
+@dataclass
+class OrganizationAsyncUsecase:
+    organization_repository: OrganizationAsyncIRepository
+
+    async def create_organization(
+        self, params: CreateOrganizationParams
+    ) -> Organization:
+        organization = Organization(**params.model_dump())
+        return await self.organization_repository.save_organization(organization)
+
+    async def get_organization(self, organization_id: int) -> Organization:
+        return await self.organization_repository.get_organization(organization_id)
+
+    async def get_all_organizations(
+        self, limit: int = DEFAULT_PAGE_LIMIT, cursor: Optional[str] = None
+    ) -> Page[Organization]:
+        organizations = await self.organization_repository.get_all_organizations(
+            limit=limit + 1, after_id=decode_cursor(cursor)
+        )
+        return to_page(organizations, limit, lambda organization: organization.id)
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from injector import inject
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.domain.entity.outbox import OutboxEvent, OutboxEventType
+from app.domain.i_repository.outbox import OutboxIRepository
+from app.domain.i_repository.user import UserAsyncIRepository
+
+logger = logging.getLogger(__name__)
+
+
+@inject
+@dataclass
+class OutboxUsecase:
+    """
+    アウトボックスに登録されたイベントを処理する（DBのコミット後に行う外部サービスの呼び出し等）。
+
+    NOTE: リースの期限切れ等で同じイベントが複数回処理される場合があるため、
+    イベントの処理は冪等にすること。
+    """
+
+    outbox_repository: OutboxIRepository
+    user_async_repository: UserAsyncIRepository
+
+    async def process_pending_events(self) -> int:
+        """処理待ちのイベントを処理し、処理したイベントの件数を返す"""
+        # NOTE: DB の操作は同期版のリポジトリのため、スレッドプールで実行する
+        events = await run_in_threadpool(
+            self.outbox_repository.claim_pending_events,
+            limit=settings.OUTBOX_BATCH_SIZE,
+            lease_seconds=settings.OUTBOX_LEASE_SECONDS,
+        )
+        for event in events:
+            await self.process_event(event)
+        return len(events)
+
+    async def process_event(self, event: OutboxEvent) -> None:
+        try:
+            await self.handle_event(event)
+        except Exception as e:
+            if event.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                logger.error(
+                    f"イベントの処理がリトライ回数の上限に達しました。 id: {event.id}, {e}"
+                )
+                await run_in_threadpool(
+                    self.outbox_repository.mark_failed,
+                    event.id,
+                    str(e),
+                    retry_after_seconds=None,
+                )
+                return
+            retry_after_seconds = min(
+                settings.OUTBOX_RETRY_MAX_DELAY_SECONDS,
+                settings.OUTBOX_RETRY_BASE_DELAY_SECONDS * 2 ** (event.attempts - 1),
+            )
+            logger.warning(
+                f"イベントの処理に失敗しました。{retry_after_seconds}秒後にリトライします。 id: {event.id}, {e}"
+            )
+            await run_in_threadpool(
+                self.outbox_repository.mark_failed,
+                event.id,
+                str(e),
+                retry_after_seconds=retry_after_seconds,
+            )
+            return
+        await run_in_threadpool(self.outbox_repository.mark_done, event.id)
+
+    async def handle_event(self, event: OutboxEvent) -> None:
+        if event.event_type is OutboxEventType.DELETE_COGNITO_USER:
+            # NOTE: Cognito 上に既に存在しない場合は成功として扱うため、冪等に処理できる
+            # Cognito の呼び出しは専用のスレッドプールで実行され、イベントループを止めない
+            await self.user_async_repository.delete_user_on_cognito(
+                event.payload["cognito_user_id"]
+            )
+        else:
+            raise ValueError(f"不明なイベントです: {event.event_type}")
+
+    async def run_worker(self, stop: asyncio.Event) -> None:
+        """stop がセットされるまで、処理待ちのイベントを定期的に処理する"""
+        while not stop.is_set():
+            try:
+                processed = await self.process_pending_events()
+            except Exception as e:
+                logger.error(f"アウトボックスの処理中にエラーが発生しました: {e}")
+                processed = 0
+            # NOTE: 取得件数の上限まで処理した場合は、残りがあるとみなして続けて処理する
+            if processed >= settings.OUTBOX_BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(
+                    stop.wait(), timeout=settings.OUTBOX_POLL_INTERVAL_SECONDS
+                )
+            except asyncio.TimeoutError:
+                pass
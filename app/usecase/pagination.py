@@ -0,0 +1,44 @@
+import base64
+import binascii
+import json
+from typing import Callable, List, Optional, TypeVar
+
+from app.domain.entity.page import Page
+from app.usecase.error import ValidationParamError
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+
+def encode_cursor(last_id: int) -> str:
+    """ページの最後の要素のIDから、次のページを取得するための不透明なカーソルを作成する"""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """カーソルから、前のページの最後の要素のIDを取り出す。カーソルがない場合は None を返す"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        last_id = payload["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError, UnicodeError):
+        raise ValidationParamError("cursorが不正です")
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValidationParamError("cursorが不正です")
+    return last_id
+
+
+def to_page(items: List[T], limit: int, get_id: Callable[[T], int]) -> Page[T]:
+    """
+    limit + 1 件取得した結果からページを作成する。
+    limit を超える要素がある場合のみ、次のページのカーソルを設定する。
+    """
+    if len(items) <= limit:
+        return Page(items=items)
+    items = items[:limit]
+    return Page(items=items, next_cursor=encode_cursor(get_id(items[-1])))
@@ -1,15 +1,20 @@
 import logging
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
 
 from injector import inject
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from sqlalchemy.orm import Session
 
+from app.domain.entity.outbox import OutboxEventType
+from app.domain.entity.page import Page
+from app.domain.entity.principal import Principal
 from app.domain.entity.user import User as UserEntity
+from app.domain.entity.user import UserBulkCreateItem, UserBulkCreateResult
 from app.domain.entity.user_organization import UserRole
 from app.domain.i_repository.organization import OrganizationIRepository
-from app.domain.i_repository.user import UserIRepository
+from app.domain.i_repository.outbox import OutboxIRepository
+from app.domain.i_repository.user import UserAsyncIRepository, UserIRepository
 from app.infra.repository.db import transaction_scope
 from app.usecase.error import (
     EntityNotFoundError,
@@ -17,9 +22,13 @@ from app.usecase.error import (
     OrgMemberAccessDeniedError,
     ValidationParamError,
 )
+from app.usecase.pagination import DEFAULT_PAGE_LIMIT, decode_cursor, to_page
 
 logger = logging.getLogger(__name__)
 
+# ユーザーの一括作成で1度に指定できる件数の上限
+BULK_CREATE_USERS_MAX_SIZE = 5000
+
 
 class UserCreateParams(BaseModel):
     cognito_user_id: str = Field(..., min_length=1, description="cognitoのユーザID")
@@ -67,6 +76,15 @@ class UserCreateParams(BaseModel):
         return v
 
 
+class UserBulkCreateParams(BaseModel):
+    users: List[UserCreateParams] = Field(
+        ...,
+        min_length=1,
+        max_length=BULK_CREATE_USERS_MAX_SIZE,
+        description="作成するユーザー",
+    )
+
+
 class UserUpdateParams(BaseModel):
     # TODO: バリデーションの見直しが必要。一旦全項目必須とする
     email: EmailStr = Field(..., description="メールアドレス")
@@ -79,6 +97,7 @@ class UserUpdateParams(BaseModel):
 class UserUsecase:
     user_repository: UserIRepository
     organization_repository: OrganizationIRepository
+    outbox_repository: OutboxIRepository
 
     def create_user(self, role: UserRole, params: UserCreateParams) -> UserEntity:
 
@@ -112,6 +131,78 @@ class UserUsecase:
             password=user_params["password"],
         )
 
+    def bulk_create_users(
+        self, role: UserRole, params: UserBulkCreateParams
+    ) -> List[UserBulkCreateResult]:
+        """
+        ユーザーを一括で作成し、リクエストの順に1件毎の結果を返す。
+        権限がない場合はリクエスト全体をエラーにする。
+        組織が存在しない・リクエスト内で重複しているなどのエラーは結果に含め、残りのユーザーは作成する。
+        """
+        if role is UserRole.MEMBER:
+            raise MemberAccessDeniedError()
+        if role is UserRole.ORG_ADMIN and any(
+            user_params.role == UserRole.APP_ADMIN for user_params in params.users
+        ):
+            raise OrgMemberAccessDeniedError()
+
+        # NOTE: 組織の存在確認は1件ずつではなく、まとめて1回のクエリで行う
+        existing_organization_ids = (
+            self.organization_repository.get_existing_organization_ids(
+                {user_params.organization_id for user_params in params.users}
+            )
+        )
+        errors: Dict[int, str] = {}
+        items: List[UserBulkCreateItem] = []
+        emails: Set[str] = set()
+        cognito_user_ids: Set[str] = set()
+        for index, user_params in enumerate(params.users):
+            if user_params.organization_id not in existing_organization_ids:
+                errors[index] = (
+                    f"指定された組織が存在しません。organization_id: {user_params.organization_id}"
+                )
+            elif user_params.email in emails:
+                errors[index] = (
+                    f"メールアドレスがリクエスト内で重複しています。 email: {user_params.email}"
+                )
+            elif user_params.cognito_user_id in cognito_user_ids:
+                errors[index] = (
+                    f"cognitoのユーザIDがリクエスト内で重複しています。 cognito_user_id: {user_params.cognito_user_id}"
+                )
+            else:
+                items.append(
+                    UserBulkCreateItem(
+                        index=index,
+                        user=UserEntity(
+                            cognito_user_id=user_params.cognito_user_id,
+                            email=user_params.email,
+                            display_name=user_params.display_name,
+                        ),
+                        organization_id=user_params.organization_id,
+                        role=UserRole(user_params.role),
+                        password=user_params.password,
+                    )
+                )
+            emails.add(user_params.email)
+            cognito_user_ids.add(user_params.cognito_user_id)
+
+        results = {
+            result.index: result
+            for result in self.user_repository.bulk_create_users_with_user_organization(
+                items
+            )
+        }
+        return [
+            results.get(index)
+            or UserBulkCreateResult(
+                index=index,
+                cognito_user_id=user_params.cognito_user_id,
+                email=user_params.email,
+                error=errors[index],
+            )
+            for index, user_params in enumerate(params.users)
+        ]
+
     def get_users(self, db: Session) -> List[UserEntity]:
         return self.user_repository.get_users(db)
 
@@ -123,36 +214,19 @@ class UserUsecase:
 
     def delete_user(self, cognito_user_id: str) -> None:
         """
-        ユーザーを段階的に削除する
+        ユーザーを論理削除し、Cognito 上のユーザーの削除をアウトボックスに登録する。
+        Cognito の削除は、コミット後にバックグラウンドのワーカーが行う（OutboxUsecase）。
 
-        1. Cognito 上のユーザーを一時的に無効化する
-        2. DB 上のユーザーを論理削除する
-        3. 上記 DB 論理削除が成功した場合、Cognito 上のユーザーを完全に削除する
+        NOTE: 論理削除したユーザーは認可時に取得されないため、Cognito の削除が完了するまでの間も
+        APIは利用できない。
         """
         with transaction_scope() as db:
-            try:
-                # cognito user disable
-                self.user_repository.disable_user_on_cognito(cognito_user_id)
-                try:
-                    # DB論理削除
-                    self.user_repository.soft_delete_user(db, cognito_user_id)
-
-                except Exception as db_err:
-                    # 論理削除失敗時、cognito userをenable
-                    try:
-                        self.user_repository.enable_user_on_cognito(cognito_user_id)
-                        logger.info(
-                            "DBの削除に失敗したため、Cognitoユーザーを再有効化しました"
-                        )
-                    except Exception as e:
-                        logger.error(f"Cognitoユーザーの再有効化にも失敗しました: {e}")
-                    raise db_err
-
-                # Cognito完全削除
-                self.user_repository.delete_user_on_cognito(cognito_user_id)
-            except Exception as e:
-                logger.error(f"ユーザー削除処理に失敗しました: {e}")
-                raise
+            self.user_repository.soft_delete_user(db, cognito_user_id)
+            self.outbox_repository.add_event(
+                db,
+                OutboxEventType.DELETE_COGNITO_USER,
+                {"cognito_user_id": cognito_user_id},
+            )
 
     def get_user_by_email(self, email: str) -> UserEntity:
         try:
@@ -163,3 +237,60 @@ class UserUsecase:
                 entity_id=e.entity_id,
                 message=e.message,
             )
+
+    def get_principal(self, email: str) -> Principal:
+        try:
+            return self.user_repository.get_principal_by_email(email=email)
+        except EntityNotFoundError as e:
+            raise EntityNotFoundError(
+                entity_name=e.entity_name,
+                entity_id=e.entity_id,
+                message=e.message,
+            )
+
+
+@inject
+@dataclass
+class UserAsyncUsecase:
+    """UserUsecase の参照系の非同期版"""
+
+    user_repository: UserAsyncIRepository
+
+    async def get_users(
+        self,
+        limit: int = DEFAULT_PAGE_LIMIT,
+        cursor: Optional[str] = None,
+        organization_id: Optional[int] = None,
+    ) -> Page[UserEntity]:
+        users = await self.user_repository.get_users(
+            limit=limit + 1,
+            after_id=decode_cursor(cursor),
+            organization_id=organization_id,
+        )
+        return to_page(users, limit, lambda user: user.id)
+
+    def export_users(
+        self, organization_id: Optional[int] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """ユーザーを一定件数ずつ取得する。呼び出し側で逐次シリアライズすること"""
+        return self.user_repository.stream_users(organization_id=organization_id)
+
+    async def get_user_by_email(self, email: str) -> UserEntity:
+        try:
+            return await self.user_repository.get_user_by_email(email=email)
+        except EntityNotFoundError as e:
+            raise EntityNotFoundError(
+                entity_name=e.entity_name,
+                entity_id=e.entity_id,
+                message=e.message,
+            )
+
+    async def get_principal(self, email: str) -> Principal:
+        try:
+            return await self.user_repository.get_principal_by_email(email=email)
+        except EntityNotFoundError as e:
+            raise EntityNotFoundError(
+                entity_name=e.entity_name,
+                entity_id=e.entity_id,
+                message=e.message,
+            )
@@ -1,3 +1,26 @@
+import logging
+
+from httpx import Response
+from pytest import MonkeyPatch
+
+from app.router.middleware import QUERY_COUNT_HEADER
+
 fixed_time_freezgun = "2024-08-17 12:00:00"
 fixed_time = "2024-08-17T12:00:00Z"
 fixed_time_2 = "2025-08-17T12:00:00Z"
+
+
+def assert_query_budget(response: Response, budget: int) -> None:
+    """エンドポイントで実行したSQLの件数が budget 以内であることを確認する"""
+    query_count = int(response.headers[QUERY_COUNT_HEADER])
+    assert (
+        query_count <= budget
+    ), f"SQLの実行件数が上限を超えています: {query_count}件 (上限: {budget}件)"
+
+
+def enable_logger(monkeypatch: MonkeyPatch, name: str) -> None:
+    """
+    ログの出力を確認するテストで、対象のロガーを有効にする。
+    ログの設定（fileConfig 等）で既存のロガーが無効化されていても、テストの結果が変わらないようにする。
+    """
+    monkeypatch.setattr(logging.getLogger(name), "disabled", False)
@@ -9,13 +9,16 @@ from fastapi.testclient import TestClient
 from mypy_boto3_s3 import S3Client
 from pytest_mock import MockerFixture
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 from sqlalchemy_utils import create_database, database_exists, drop_database
 
 from app.config import settings
 from app.dependencies.auth import verify_token_and_get_email
 from app.dependencies.db import get_db
 from app.infra.models.base import Base
+from app.infra.repository.principal_cache import principal_cache
 from app.infra.repository.s3 import create_s3_client
 from app.router.main import app
 from app.util import setup_logger
@@ -30,6 +33,16 @@ testing_session_local = sessionmaker(
 )
 test_db = testing_session_local()
 
+TEST_ASYNC_DATABASE_URL = TEST_DATABASE_URL.replace(
+    "postgresql://", "postgresql+asyncpg://", 1
+)
+
+# NOTE: テスト毎に asyncio.run でイベントループが変わるため、接続をプールしない
+test_async_engine = create_async_engine(TEST_ASYNC_DATABASE_URL, poolclass=NullPool)
+testing_async_session_local = async_sessionmaker(
+    bind=test_async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 @pytest.fixture(scope="session", autouse=True)
 def create_and_delete_database() -> Generator[None, None, None]:
@@ -91,9 +104,19 @@ def delete_data() -> Generator[None, None, None]:
         test_db.close()
 
 
+@pytest.fixture(scope="function", autouse=True)
+def clear_principal_cache() -> None:
+    # NOTE: テスト毎にデータを削除するため、前のテストのキャッシュが残らないようにする
+    principal_cache.clear()
+
+
 @pytest.fixture(scope="function", autouse=True)
 def mock_testdb(mocker: MockerFixture) -> None:
     mocker.patch("app.infra.repository.db.SessionLocal", return_value=test_db)
+    mocker.patch(
+        "app.infra.repository.db.get_async_sessionmaker",
+        return_value=testing_async_session_local,
+    )
 
 
 @pytest.fixture(scope="function")
@@ -1,5 +1,7 @@
+import asyncio
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Any, Dict
 
 import pytest
 from cryptography.hazmat.primitives import serialization
@@ -8,9 +10,17 @@ from fastapi import HTTPException
 from jose import jwt
 from jose.utils import base64url_encode
 from pytest import MonkeyPatch
+from requests import ConnectionError
 
+from app.cache import TTLCache
 from app.config import settings
-from app.dependencies.auth import verify_token
+from app.dependencies.auth import (
+    JWKSKeyStore,
+    jwks_key_store,
+    verified_token_cache,
+    verify_token,
+    verify_token_and_get_email,
+)
 
 # ファイルから鍵を読み込み
 PRIVATE_KEY_PEM = Path("tests/keys/private_test_key.pem").read_text()
@@ -42,6 +52,11 @@ TEST_PUBLIC_KEYS = {
 }
 
 
+@pytest.fixture(autouse=True)
+def clear_verified_token_cache() -> None:
+    verified_token_cache.clear()
+
+
 def create_jwt_token(
     iss: str | None = None,
     aud: str | None = None,
@@ -95,3 +110,235 @@ def test_verify_token_invalid_issuer(monkeypatch: MonkeyPatch) -> None:
 
     assert exc_info.value.status_code == 401
     assert exc_info.value.detail == "Invalid issuer or audience"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def create_key_store(
+    fetched: list[int], clock: FakeClock, keys: dict[str, dict[str, str]]
+) -> JWKSKeyStore:
+    def fetcher() -> dict[str, dict[str, str]]:
+        fetched.append(1)
+        return dict(keys)
+
+    return JWKSKeyStore(
+        fetcher=fetcher,
+        ttl_seconds=60,
+        min_refresh_interval_seconds=10,
+        clock=clock,
+    )
+
+
+def test_jwks_key_store_caches_keys_within_ttl() -> None:
+    """TTL内であれば JWKS を再取得せずキャッシュを返すことを確認するテスト"""
+    fetched: list[int] = []
+    clock = FakeClock()
+    key_store = create_key_store(fetched, clock, {TEST_KID: {"kid": TEST_KID}})
+
+    key_store.get_keys()
+    clock.now = 59
+    keys = key_store.get_keys()
+
+    assert TEST_KID in keys
+    assert len(fetched) == 1
+
+
+def test_jwks_key_store_refreshes_in_background_after_ttl() -> None:
+    """TTL経過後はキャッシュを返しつつ、バックグラウンドで再取得することを確認するテスト"""
+    fetched: list[int] = []
+    clock = FakeClock()
+    key_store = create_key_store(fetched, clock, {TEST_KID: {"kid": TEST_KID}})
+
+    key_store.get_keys()
+    clock.now = 61
+    keys = key_store.get_keys()
+    assert TEST_KID in keys
+
+    assert key_store._refresh_thread is not None
+    key_store._refresh_thread.join()
+    assert len(fetched) == 2
+
+
+def test_jwks_key_store_refetches_on_unknown_kid_with_rate_limit() -> None:
+    """未知の kid の場合のみ再取得し、最小間隔内の連続取得は行わないことを確認するテスト"""
+    fetched: list[int] = []
+    clock = FakeClock()
+    key_store = create_key_store(fetched, clock, {TEST_KID: {"kid": TEST_KID}})
+
+    assert key_store.get_key(TEST_KID) is not None
+    assert key_store.get_key("unknown-kid") is None
+    assert len(fetched) == 1
+
+    clock.now = 10
+    assert key_store.get_key("unknown-kid") is None
+    assert len(fetched) == 2
+
+    clock.now = 15
+    assert key_store.get_key("unknown-kid") is None
+    assert len(fetched) == 2
+
+
+def test_verify_token_returns_503_when_jwks_fetch_fails(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """JWKS を1度も取得できない場合は、500 ではなく 503 を返すことを確認するテスト"""
+
+    def fetcher() -> dict[str, dict[str, str]]:
+        raise ConnectionError("connection refused")
+
+    monkeypatch.setattr(jwks_key_store, "_fetcher", fetcher)
+    jwks_key_store.clear()
+
+    with pytest.raises(HTTPException) as exc_info:
+        verify_token(create_jwt_token())
+    assert exc_info.value.status_code == 503
+
+
+def test_jwks_key_store_unknown_kid_refetch_failure_returns_none() -> None:
+    """未知の kid の再取得に失敗した場合は、鍵が見つからないものとして扱うことを確認するテスト"""
+    clock = FakeClock()
+    responses: list[Any] = [{TEST_KID: {"kid": TEST_KID}}, ConnectionError("timeout")]
+
+    def fetcher() -> dict[str, dict[str, str]]:
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return dict(response)
+
+    key_store = JWKSKeyStore(
+        fetcher=fetcher, ttl_seconds=60, min_refresh_interval_seconds=10, clock=clock
+    )
+    key_store.get_keys()
+    clock.now = 10
+
+    assert key_store.get_key("unknown-kid") is None
+    assert key_store.get_key(TEST_KID) is not None
+
+
+def test_jwks_key_store_async_limits_refetch_from_scheduling() -> None:
+    """再取得はタスクの作成時点から最小間隔で制限され、実行待ちの間に連続して要求されないことを確認するテスト"""
+    clock = FakeClock()
+
+    async def async_fetcher() -> dict[str, dict[str, str]]:
+        return {TEST_KID: {"kid": TEST_KID}}
+
+    key_store = JWKSKeyStore(
+        fetcher=dict,
+        async_fetcher=async_fetcher,
+        ttl_seconds=60,
+        min_refresh_interval_seconds=10,
+        clock=clock,
+    )
+
+    async def schedule_refresh() -> bool:
+        await key_store.get_keys_async()
+        clock.now = 10
+        task = key_store._start_refresh_task()
+        can_refresh = key_store._can_refresh()
+        await task
+        return can_refresh
+
+    assert asyncio.run(schedule_refresh()) is False
+
+
+def test_verify_token_uses_verified_token_cache(monkeypatch: MonkeyPatch) -> None:
+    """同一トークンの2回目以降の検証では署名検証を行わずキャッシュを返すことを確認するテスト"""
+    monkeypatch.setattr(
+        "app.dependencies.auth.get_cognito_public_keys", lambda: TEST_PUBLIC_KEYS
+    )
+    decode_calls: list[str] = []
+    original_decode = jwt.decode
+
+    def counting_decode(token: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        decode_calls.append(token)
+        return original_decode(token, *args, **kwargs)
+
+    monkeypatch.setattr("app.dependencies.auth.jwt.decode", counting_decode)
+    token = create_jwt_token()
+
+    first = verify_token(token)
+    second = verify_token(token)
+
+    assert first == second
+    assert len(decode_calls) == 1
+    assert verified_token_cache.hits == 1
+    assert verified_token_cache.misses == 1
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used() -> None:
+    """有効期限切れのエントリを返さず、上限を超えた場合は最も古いエントリを破棄することを確認するテスト"""
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, clock=clock)
+
+    cache.set("a", 1, expires_at=10)
+    cache.set("b", 2, expires_at=100)
+    assert cache.get("a") == 1
+    cache.set("c", 3, expires_at=100)
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 2, "misses": 2, "size": 1, "maxsize": 2}
+
+
+def test_ttl_cache_set_with_ttl_uses_cache_clock() -> None:
+    """ttl_seconds で指定した場合、有効期限がキャッシュの clock を基準に計算されることを確認するテスト"""
+    clock = FakeClock()
+    clock.now = 1000
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, clock=clock)
+
+    cache.set("a", 1, ttl_seconds=30)
+    assert cache.get("a") == 1
+
+    clock.now = 1030
+    assert cache.get("a") is None
+
+
+def test_verify_token_and_get_email_async(monkeypatch: MonkeyPatch) -> None:
+    """非同期の認証経路でトークンを検証し、メールアドレスを取得できることを確認するテスト"""
+
+    async def get_public_keys_async() -> dict[str, dict[str, str]]:
+        return TEST_PUBLIC_KEYS
+
+    monkeypatch.setattr(
+        "app.dependencies.auth.get_cognito_public_keys_async", get_public_keys_async
+    )
+    token = create_jwt_token()
+
+    email = asyncio.run(verify_token_and_get_email(token))
+
+    assert email == "test@example.com"
+
+
+def test_jwks_key_store_async_fetches_once_for_concurrent_requests() -> None:
+    """非同期で同時に鍵を要求された場合も、JWKS の取得が1回にまとめられることを確認するテスト"""
+    fetched: list[int] = []
+
+    async def async_fetcher() -> dict[str, dict[str, str]]:
+        fetched.append(1)
+        await asyncio.sleep(0)
+        return {TEST_KID: {"kid": TEST_KID}}
+
+    key_store = JWKSKeyStore(
+        fetcher=dict,
+        async_fetcher=async_fetcher,
+        ttl_seconds=60,
+        min_refresh_interval_seconds=10,
+        clock=FakeClock(),
+    )
+
+    async def get_keys_concurrently() -> list[dict[str, dict[str, str]]]:
+        return await asyncio.gather(*[key_store.get_keys_async() for _ in range(5)])
+
+    results = asyncio.run(get_keys_concurrently())
+
+    assert all(TEST_KID in keys for keys in results)
+    assert len(fetched) == 1
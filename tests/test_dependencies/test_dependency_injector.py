@@ -0,0 +1,18 @@
+import asyncio
+
+from app.dependencies.dependency_injector import get_injector, get_shared_injector
+from app.domain.i_repository.user import UserIRepository
+from app.usecase.user import UserAsyncUsecase, UserUsecase
+
+
+def test_get_injector_returns_shared_singletons() -> None:
+    """Injector とリポジトリ・usecase がリクエスト間で共有されることを確認する"""
+    injector = get_shared_injector()
+
+    assert get_shared_injector() is injector
+    assert asyncio.run(get_injector()) is injector
+    assert injector.get(UserUsecase) is injector.get(UserUsecase)
+    assert injector.get(UserUsecase).user_repository is injector.get(
+        UserIRepository  # type: ignore[type-abstract]
+    )
+    assert injector.get(UserAsyncUsecase) is injector.get(UserAsyncUsecase)
@@ -1,13 +1,21 @@
+import asyncio
+from typing import Any, List
 from unittest.mock import MagicMock, patch
 
 import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
 from pytest import MonkeyPatch
 
 from app.infra.repository.cognito import (
+    CognitoApi,
+    call_cognito_api,
+    cognito_rate_limit_stats,
     create_cognito_client,
     delete_user,
+    delete_user_async,
     disable_user,
     enable_user,
+    get_cognito_client,
 )
 
 
@@ -26,12 +34,22 @@ def test_create_mock_cognito_user_pool(mock_settings: MonkeyPatch) -> None:
     assert response["UserPool"]["Name"] == "mock-user-pool"
 
 
-def test_disable_user_calls_admin_disable_user(mock_settings: MonkeyPatch) -> None:
+def test_get_cognito_client_is_shared(
+    mock_settings: MonkeyPatch, monkeypatch: MonkeyPatch
+) -> None:
+    """Cognito クライアントがプロセス内で1度だけ作成されることを確認する"""
+    monkeypatch.setattr("app.infra.repository.cognito._cognito_client", None)
     with patch(
         "app.infra.repository.cognito.create_cognito_client"
     ) as mock_create_client:
+        assert get_cognito_client() is get_cognito_client()
+        mock_create_client.assert_called_once()
+
+
+def test_disable_user_calls_admin_disable_user(mock_settings: MonkeyPatch) -> None:
+    with patch("app.infra.repository.cognito.get_cognito_client") as mock_get_client:
         mock_client = MagicMock()
-        mock_create_client.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         disable_user("mock-user-id")
 
@@ -42,11 +60,9 @@ def test_disable_user_calls_admin_disable_user(mock_settings: MonkeyPatch) -> No
 
 
 def test_enable_user_calls_admin_enable_user(mock_settings: MonkeyPatch) -> None:
-    with patch(
-        "app.infra.repository.cognito.create_cognito_client"
-    ) as mock_create_client:
+    with patch("app.infra.repository.cognito.get_cognito_client") as mock_get_client:
         mock_client = MagicMock()
-        mock_create_client.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         enable_user("mock-user-id")
 
@@ -57,11 +73,9 @@ def test_enable_user_calls_admin_enable_user(mock_settings: MonkeyPatch) -> None
 
 
 def test_delete_user_calls_admin_delete_user(mock_settings: MonkeyPatch) -> None:
-    with patch(
-        "app.infra.repository.cognito.create_cognito_client"
-    ) as mock_create_client:
+    with patch("app.infra.repository.cognito.get_cognito_client") as mock_get_client:
         mock_client = MagicMock()
-        mock_create_client.return_value = mock_client
+        mock_get_client.return_value = mock_client
 
         delete_user("mock-user-id")
 
@@ -69,3 +83,92 @@ def test_delete_user_calls_admin_delete_user(mock_settings: MonkeyPatch) -> None
             UserPoolId="mock-pool-id",
             Username="mock-user-id",
         )
+
+
+def test_delete_user_async_calls_admin_delete_user(mock_settings: MonkeyPatch) -> None:
+    """非同期版がスレッドプールで Cognito を呼び出すことを確認する"""
+    with patch("app.infra.repository.cognito.get_cognito_client") as mock_get_client:
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+
+        asyncio.run(delete_user_async("mock-user-id"))
+
+        mock_client.admin_delete_user.assert_called_once_with(
+            UserPoolId="mock-pool-id",
+            Username="mock-user-id",
+        )
+
+
+def test_create_cognito_client_does_not_retry(monkeypatch: MonkeyPatch) -> None:
+    """リトライは call_cognito_api のみで行い、botocore ではリトライしないことを確認する"""
+    monkeypatch.setattr("app.infra.repository.cognito.settings.SERVICE_ENV", "dev")
+    monkeypatch.setattr(
+        "app.infra.repository.cognito.settings.AWS_REGION", "ap-northeast-1"
+    )
+
+    client = create_cognito_client()
+
+    assert client.meta.config.retries["total_max_attempts"] == 1  # type: ignore[attr-defined]
+
+
+def throttling_error() -> ClientError:
+    return ClientError(
+        {"Error": {"Code": "TooManyRequestsException", "Message": "Too many"}},
+        "AdminDeleteUser",
+    )
+
+
+def test_call_cognito_api_retries_throttled_call(monkeypatch: MonkeyPatch) -> None:
+    """スロットリングされた呼び出しがバックオフ後にリトライされ、集計されることを確認する"""
+    sleeps: List[float] = []
+    monkeypatch.setattr("app.infra.repository.cognito.time.sleep", sleeps.append)
+    monkeypatch.setattr(
+        "app.infra.repository.cognito.settings.COGNITO_THROTTLE_MAX_RETRIES", 2
+    )
+    before = cognito_rate_limit_stats.snapshot().get(
+        CognitoApi.ADMIN_DELETE_USER, {"calls": 0, "throttled": 0, "failed": 0}
+    )
+    call = MagicMock(side_effect=[throttling_error(), throttling_error(), "ok"])
+
+    assert call_cognito_api(CognitoApi.ADMIN_DELETE_USER, call) == "ok"
+    assert call.call_count == 3
+    assert len(sleeps) == 2
+
+    # リトライ回数を超えた場合はエラーになる
+    call = MagicMock(side_effect=throttling_error())
+    with pytest.raises(ClientError):
+        call_cognito_api(CognitoApi.ADMIN_DELETE_USER, call)
+    assert call.call_count == 3
+
+    after = cognito_rate_limit_stats.snapshot()[CognitoApi.ADMIN_DELETE_USER]
+    assert after["calls"] - before["calls"] == 6
+    assert after["throttled"] - before["throttled"] == 5
+    assert after["failed"] - before["failed"] == 1
+
+
+def client_error(code: str, status_code: int) -> ClientError:
+    response: Any = {
+        "Error": {"Code": code, "Message": code},
+        "ResponseMetadata": {"HTTPStatusCode": status_code},
+    }
+    return ClientError(response, "AdminDeleteUser")
+
+
+def test_call_cognito_api_retries_transient_errors(monkeypatch: MonkeyPatch) -> None:
+    """通信エラー・5xx はリトライし、それ以外のエラーはリトライしないことを確認する"""
+    monkeypatch.setattr("app.infra.repository.cognito.time.sleep", lambda _: None)
+    call = MagicMock(
+        side_effect=[
+            client_error("InternalErrorException", 500),
+            EndpointConnectionError(endpoint_url="https://cognito"),
+            "ok",
+        ]
+    )
+
+    assert call_cognito_api(CognitoApi.ADMIN_DELETE_USER, call) == "ok"
+    assert call.call_count == 3
+
+    call = MagicMock(side_effect=client_error("UserNotFoundException", 400))
+    with pytest.raises(ClientError):
+        call_cognito_api(CognitoApi.ADMIN_DELETE_USER, call)
+    assert call.call_count == 1
@@ -0,0 +1,55 @@
+import asyncio
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.infra.engine import (
+    InstrumentedQueuePool,
+    create_async_db_engine,
+    create_db_engine,
+    get_pool_stats,
+)
+from tests.conftest import TEST_ASYNC_DATABASE_URL, TEST_DATABASE_URL
+
+
+def test_create_db_engine_uses_pool_settings() -> None:
+    """エンジンのプール設定が Settings の値で作成されることを確認する"""
+    engine = create_db_engine(TEST_DATABASE_URL)
+
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    stats = get_pool_stats(engine)
+    assert stats["pool_size"] == settings.DB_POOL_SIZE
+    assert stats["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert stats["in_use"] == 0
+    assert stats["checkouts"] == 0
+
+
+def test_get_pool_stats_records_checkout() -> None:
+    """チェックアウト数・使用中の接続数が集計されることを確認する"""
+    engine = create_db_engine(TEST_DATABASE_URL)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert get_pool_stats(engine)["in_use"] == 1
+
+    stats = get_pool_stats(engine)
+    assert stats["in_use"] == 0
+    assert stats["checkouts"] == 1
+    assert stats["max_checkout_wait_ms"] >= 0
+    engine.dispose()
+
+
+def test_create_async_db_engine_uses_pool_settings() -> None:
+    """非同期エンジンも同じプール設定・asyncpgドライバで作成されることを確認する"""
+    engine = create_async_db_engine(TEST_ASYNC_DATABASE_URL)
+
+    assert engine.dialect.driver == "asyncpg"
+    assert engine.pool.size() == settings.DB_POOL_SIZE  # type: ignore[attr-defined]
+
+    async def select_one() -> int:
+        async with engine.connect() as connection:
+            value: int = (await connection.execute(text("SELECT 1"))).scalar_one()
+        await engine.dispose()
+        return value
+
+    assert asyncio.run(select_one()) == 1
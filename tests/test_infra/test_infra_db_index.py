@@ -0,0 +1,148 @@
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import pytest
+import pytz
+from sqlalchemy import event, insert, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.domain.entity.user_organization import UserRole
+from app.infra.models.organization import Organization
+from app.infra.models.user import User
+from app.infra.models.user_organization import UserOrganization
+from app.infra.repository.organization import OrganizationRepository
+from app.infra.repository.user import UserRepository
+from app.infra.repository.user_organization import UserOrganizationRepository
+from app.usecase.error import EntityNotFoundError
+from tests.conftest import test_engine
+
+ORGANIZATION_COUNT = 1000
+USER_COUNT = 5000
+
+
+@pytest.fixture
+def seeded_db(db: Session) -> Session:
+    """小さなテーブルではシーケンシャルスキャンが選ばれるため、ある程度の件数を作成する"""
+    now = datetime.now(pytz.utc)
+    db.execute(
+        insert(Organization),
+        [
+            {
+                "id": i,
+                "name": f"org{i}",
+                "deleted": i % 10 == 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(1, ORGANIZATION_COUNT + 1)
+        ],
+    )
+    db.execute(
+        insert(User),
+        [
+            {
+                "id": i,
+                "cognito_user_id": f"user{i}",
+                "email": f"user{i}@example.com",
+                "display_name": f"user{i}",
+                "deleted": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(1, USER_COUNT + 1)
+        ],
+    )
+    db.execute(
+        insert(UserOrganization),
+        [
+            {
+                "user_id": i,
+                "organization_id": i % ORGANIZATION_COUNT + 1,
+                "role": UserRole.MEMBER,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(1, USER_COUNT + 1)
+        ],
+    )
+    db.commit()
+    db.execute(text("ANALYZE"))
+    db.commit()
+    return db
+
+
+@contextmanager
+def capture_selects() -> Iterator[List[Tuple[str, Any]]]:
+    """実行された SELECT 文とパラメータを記録する"""
+    statements: List[Tuple[str, Any]] = []
+
+    def before_cursor_execute(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(test_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(test_engine, "before_cursor_execute", before_cursor_execute)
+
+
+def explain(db: Session, statement: str, parameters: Any) -> str:
+    rows = db.connection().exec_driver_sql(f"EXPLAIN {statement}", parameters).all()
+    return "\n".join(row[0] for row in rows)
+
+
+def soft_delete_missing_user(repository: UserRepository, db: Session) -> None:
+    with pytest.raises(EntityNotFoundError):
+        repository.soft_delete_user(db, cognito_user_id="missing")
+
+
+def test_repository_queries_use_index(seeded_db: Session) -> None:
+    """リポジトリの主要なクエリが、シーケンシャルスキャンではなくインデックスを使うことを確認する"""
+    user_organization_repository = UserOrganizationRepository()
+    user_repository = UserRepository(
+        user_organization_repository=user_organization_repository
+    )
+    organization_repository = OrganizationRepository()
+
+    calls: Dict[str, Callable[[], Any]] = {
+        "get_user_by_email": lambda: user_repository.get_user_by_email(
+            "user42@example.com"
+        ),
+        "get_principal_by_email": lambda: user_repository.get_principal_by_email(
+            "user42@example.com"
+        ),
+        "soft_delete_user": lambda: soft_delete_missing_user(
+            user_repository, seeded_db
+        ),
+        "get_users_by_organization": lambda: user_repository.get_users(
+            seeded_db, limit=100, organization_id=7
+        ),
+        "stream_users_by_organization": lambda: list(
+            user_repository.stream_users(organization_id=7)
+        ),
+        "get_all_organizations": lambda: organization_repository.get_all_organizations(
+            limit=20, after_id=40
+        ),
+        "get_user_organizations_by_user_id": lambda: (
+            user_organization_repository.get_user_organizations_by_user_id(42)
+        ),
+    }
+
+    for name, call in calls.items():
+        with capture_selects() as statements:
+            call()
+        assert statements, name
+        for statement, parameters in statements:
+            plan = explain(seeded_db, statement, parameters)
+            assert "Seq Scan" not in plan, f"{name}:\n{plan}"
+        seeded_db.rollback()
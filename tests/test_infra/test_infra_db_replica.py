@@ -0,0 +1,191 @@
+import asyncio
+from typing import List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+from pytest import MonkeyPatch
+from sqlalchemy import exc
+from sqlalchemy.orm import Session
+
+from app.infra.replica import LEAST_CONNECTIONS, Replica, ReplicaRouter
+from app.infra.repository import db as db_module
+from app.infra.repository.db import (
+    ReplicaUnavailableError,
+    readonly_transaction_scope,
+    request_db_context,
+    retry_read_on_primary,
+    transaction_scope,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeReplica(Replica):
+    def __init__(self, url: str, healthy: bool = True, in_use: int = 0) -> None:
+        super().__init__(url)
+        self.is_up = healthy
+        self.connections = in_use
+        self.ping_count = 0
+        self.session = MagicMock(name=url)
+
+    def ping(self) -> bool:
+        self.ping_count += 1
+        return self.is_up
+
+    def in_use(self) -> int:
+        return self.connections
+
+    def create_session(self) -> MagicMock:
+        return self.session
+
+
+def create_router(
+    replicas: List[Replica],
+    policy: str = "round_robin",
+    clock: Optional[FakeClock] = None,
+) -> ReplicaRouter:
+    return ReplicaRouter(
+        replicas=replicas,
+        policy=policy,
+        health_check_interval_seconds=10,
+        clock=clock or FakeClock(),
+    )
+
+
+def test_choose_round_robin() -> None:
+    """正常なレプリカが順番に選ばれることを確認する"""
+    replicas: List[Replica] = [FakeReplica("r1"), FakeReplica("r2")]
+    router = create_router(replicas)
+
+    assert [router.choose() for _ in range(4)] == [
+        replicas[0],
+        replicas[1],
+        replicas[0],
+        replicas[1],
+    ]
+
+
+def test_choose_least_connections() -> None:
+    """使用中のコネクションが最も少ないレプリカが選ばれることを確認する"""
+    replicas: List[Replica] = [FakeReplica("r1", in_use=3), FakeReplica("r2", in_use=1)]
+    router = create_router(replicas, policy=LEAST_CONNECTIONS)
+
+    assert router.choose() is replicas[1]
+
+
+def test_choose_unknown_policy() -> None:
+    with pytest.raises(ValueError):
+        create_router([], policy="random")
+
+
+def test_unhealthy_replica_is_skipped_until_next_health_check() -> None:
+    """異常なレプリカは次のヘルスチェックまで選ばれず、全て異常ならプライマリに戻ることを確認する"""
+    clock = FakeClock()
+    replica = FakeReplica("r1", healthy=False)
+    router = create_router([replica], clock=clock)
+
+    assert router.choose() is None
+    assert router.choose() is None
+    assert replica.ping_count == 1
+
+    # 復旧後、ヘルスチェックの間隔を過ぎると再び選ばれる
+    replica.is_up = True
+    clock.now = 10
+    assert router.choose() is replica
+
+
+def test_readonly_transaction_scope_uses_replica(monkeypatch: MonkeyPatch) -> None:
+    """読み取り専用のスコープはレプリカに、書き込み後はプライマリに接続することを確認する"""
+    replica = FakeReplica("r1")
+    primary_session = MagicMock(name="primary")
+    monkeypatch.setattr(db_module, "replica_router", create_router([replica]))
+    monkeypatch.setattr(db_module, "SessionLocal", lambda: primary_session)
+
+    async def handle_request() -> None:
+        async with request_db_context():
+            with readonly_transaction_scope() as db:
+                assert db is replica.session
+
+            # レプリカの遅延が許されない読み取りはプライマリで行う
+            with readonly_transaction_scope(primary=True) as db:
+                assert db is primary_session
+
+            with transaction_scope() as db:
+                assert db is primary_session
+
+            # 書き込み後は同じリクエスト内の読み取りもプライマリで行う
+            with readonly_transaction_scope() as db:
+                assert db is primary_session
+
+    asyncio.run(handle_request())
+
+    # リクエストが変われば再びレプリカを使う
+    with readonly_transaction_scope() as db:
+        assert db is replica.session
+
+
+def test_readonly_transaction_scope_marks_replica_unhealthy_on_disconnect(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """レプリカへの接続エラー時に、以降の読み取りがプライマリに切り替わることを確認する"""
+    replica = FakeReplica("r1")
+    router = create_router([replica])
+    monkeypatch.setattr(db_module, "replica_router", router)
+
+    with pytest.raises(ReplicaUnavailableError):
+        with readonly_transaction_scope():
+            raise exc.OperationalError("SELECT 1", {}, Exception("connection lost"))
+
+    assert replica.healthy is False
+    assert router.choose() is None
+
+
+def test_retry_read_on_primary_after_replica_disconnect(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """レプリカとの接続が切れた読み取りを、プライマリで1度だけやり直すことを確認する"""
+    replicas = [FakeReplica("r1"), FakeReplica("r2")]
+    primary_session = MagicMock(name="primary")
+    monkeypatch.setattr(db_module, "replica_router", create_router([*replicas]))
+    monkeypatch.setattr(db_module, "SessionLocal", lambda: primary_session)
+    sessions: List[Session] = []
+
+    @retry_read_on_primary
+    def read() -> str:
+        with readonly_transaction_scope() as db:
+            sessions.append(db)
+            if db is not primary_session:
+                raise exc.OperationalError("SELECT 1", {}, Exception("connection lost"))
+            return "ok"
+
+    async def handle_request() -> None:
+        async with request_db_context():
+            assert read() == "ok"
+
+    asyncio.run(handle_request())
+
+    # 他のレプリカではなく、プライマリでやり直す
+    assert sessions == [replicas[0].session, primary_session]
+    assert replicas[0].healthy is False
+    assert replicas[1].healthy is True
+
+
+def test_replica_engine_has_connect_timeout(monkeypatch: MonkeyPatch) -> None:
+    """応答しないレプリカで止まらないよう、レプリカのエンジンに接続のタイムアウトを設定することを確認する"""
+    create_db_engine = MagicMock()
+    monkeypatch.setattr("app.infra.replica.create_db_engine", create_db_engine)
+    monkeypatch.setattr(
+        "app.infra.replica.settings.DB_REPLICA_CONNECT_TIMEOUT_SECONDS", 2
+    )
+
+    Replica("postgresql://u:p@replica:5432/d").engine
+
+    create_db_engine.assert_called_once_with(
+        "postgresql://u:p@replica:5432/d", connect_timeout_seconds=2
+    )
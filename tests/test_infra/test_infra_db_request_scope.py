@@ -0,0 +1,148 @@
+import asyncio
+from typing import Any, List
+
+import pytest
+from pytest import MonkeyPatch
+
+from app.infra.repository import db as db_module
+from app.infra.repository.db import (
+    readonly_transaction_scope,
+    request_db_context,
+    transaction_scope,
+)
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def commit(self) -> None:
+        self.calls.append("commit")
+
+    def rollback(self) -> None:
+        self.calls.append("rollback")
+
+    def close(self) -> None:
+        self.calls.append("close")
+
+    def begin_nested(self) -> "FakeSession":
+        self.calls.append("savepoint")
+        return self
+
+    def __enter__(self) -> "FakeSession":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.calls.append("release")
+
+
+@pytest.fixture
+def sessions(monkeypatch: MonkeyPatch) -> List[FakeSession]:
+    sessions: List[FakeSession] = []
+
+    def create_session() -> FakeSession:
+        sessions.append(FakeSession())
+        return sessions[-1]
+
+    monkeypatch.setattr(db_module, "SessionLocal", create_session)
+    return sessions
+
+
+def test_request_shares_one_session(sessions: List[FakeSession]) -> None:
+    """リクエスト内の読み取り・書き込みのスコープで1つのセッションを共有することを確認する"""
+
+    async def handle_request() -> None:
+        async with request_db_context():
+            with readonly_transaction_scope() as read_db:
+                pass
+            with transaction_scope() as write_db:
+                # 書き込み中の読み取りは同じトランザクションで行う
+                with readonly_transaction_scope() as nested_read_db:
+                    assert nested_read_db is write_db
+            with readonly_transaction_scope() as after_write_db:
+                pass
+            assert read_db is write_db is after_write_db
+
+    asyncio.run(handle_request())
+
+    # スコープ毎には閉じず、リクエストの終了時に1度だけ閉じる
+    # 読み取りのトランザクションはスコープを抜けた時点で終了する（書き込み中の読み取りを除く）
+    assert len(sessions) == 1
+    assert sessions[0].calls == ["rollback", "commit", "rollback", "close"]
+
+
+def test_request_ends_read_transaction_at_outermost_scope(
+    sessions: List[FakeSession],
+) -> None:
+    """入れ子の読み取りのスコープでは、最も外側のスコープを抜けた時点でトランザクションを終了することを確認する"""
+
+    async def handle_request() -> None:
+        async with request_db_context():
+            with readonly_transaction_scope():
+                with readonly_transaction_scope():
+                    pass
+                assert sessions[0].calls == []
+
+    asyncio.run(handle_request())
+
+    assert sessions[0].calls == ["rollback", "close"]
+
+
+def test_request_readonly_scope_rollback(sessions: List[FakeSession]) -> None:
+    """読み取りのスコープで例外が発生した場合にロールバックし、以降のスコープを使えることを確認する"""
+
+    async def handle_request() -> None:
+        async with request_db_context():
+            with readonly_transaction_scope():
+                with pytest.raises(ValueError):
+                    with readonly_transaction_scope():
+                        raise ValueError("error")
+                assert sessions[0].calls == ["rollback"]
+            with transaction_scope():
+                pass
+
+    asyncio.run(handle_request())
+
+    assert sessions[0].calls == ["rollback", "rollback", "commit", "close"]
+
+
+def test_request_nested_transaction_scope_uses_savepoint(
+    sessions: List[FakeSession],
+) -> None:
+    """入れ子の書き込みのスコープはセーブポイントを使い、外側のスコープのみコミットすることを確認する"""
+
+    async def handle_request() -> None:
+        async with request_db_context():
+            with transaction_scope() as db:
+                with transaction_scope() as nested_db:
+                    assert nested_db is db
+
+    asyncio.run(handle_request())
+
+    assert sessions[0].calls == ["savepoint", "release", "commit", "close"]
+
+
+def test_request_transaction_scope_rollback(sessions: List[FakeSession]) -> None:
+    """書き込みのスコープで例外が発生した場合にロールバックすることを確認する"""
+
+    async def handle_request() -> None:
+        async with request_db_context():
+            with pytest.raises(ValueError):
+                with transaction_scope():
+                    raise ValueError("error")
+
+    asyncio.run(handle_request())
+
+    assert sessions[0].calls == ["rollback", "close"]
+
+
+def test_without_request_context_opens_session_per_scope(
+    sessions: List[FakeSession],
+) -> None:
+    """リクエスト外（バッチ等）ではスコープ毎にセッションを作成して閉じることを確認する"""
+    with readonly_transaction_scope():
+        pass
+    with transaction_scope():
+        pass
+
+    assert [session.calls for session in sessions] == [["close"], ["commit", "close"]]
@@ -0,0 +1,114 @@
+import logging
+
+import pytest
+from pytest import LogCaptureFixture, MonkeyPatch
+from sqlalchemy import create_engine, exc, text
+
+from app.config import settings
+from app.infra.query_stats import (
+    StatementStats,
+    collect_query_stats,
+    fingerprint,
+    statement_stats,
+)
+from tests.common import enable_logger
+
+
+def test_collect_query_stats_counts_statements() -> None:
+    """スコープ内で実行したSQLの件数・時間が集計され、繰り返されたSQLを検出できることを確認する"""
+    engine = create_engine("sqlite://")
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        with collect_query_stats() as stats:
+            for _ in range(3):
+                connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+
+    assert stats.count == 4
+    assert stats.total_seconds > 0
+    assert stats.repeated_statements(3) == [("SELECT 1", 3)]
+    assert stats.repeated_statements(4) == []
+    assert stats.repeated_statements(0) == []
+
+
+def test_collect_query_stats_counts_failed_statement() -> None:
+    """エラーになったSQLも集計されることを確認する"""
+    engine = create_engine("sqlite://")
+
+    with engine.connect() as connection:
+        with collect_query_stats() as stats:
+            with pytest.raises(exc.OperationalError):
+                connection.execute(text("SELECT * FROM missing"))
+            connection.execute(text("SELECT 1"))
+
+        assert stats.count == 2
+        assert connection.info["query_stats_start_times"] == []
+
+
+def test_fingerprint_removes_parameters() -> None:
+    """バインドパラメータ・リテラルが除かれ、IN 句や VALUES の件数に依らないことを確認する"""
+    assert fingerprint(
+        'SELECT * FROM "user"\n  WHERE email = %(email_1)s AND id > 10 LIMIT $1'
+    ) == ('SELECT * FROM "user" WHERE email = ? AND id > ? LIMIT ?')
+    assert fingerprint("SELECT * FROM t WHERE name = 'it''s' AND t2.id IN (1, 2)") == (
+        "SELECT * FROM t WHERE name = ? AND t2.id IN (...)"
+    )
+    assert fingerprint(
+        "SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s)"
+    ) == fingerprint("SELECT * FROM t WHERE id IN (%(id_1_1)s)")
+    assert fingerprint(
+        "INSERT INTO t (a, b) VALUES (%(a_m0)s, %(b_m0)s), (%(a_m1)s, %(b_m1)s)"
+    ) == ("INSERT INTO t (a, b) VALUES (...)")
+
+
+def test_statement_stats_aggregates_by_fingerprint() -> None:
+    """フィンガープリント毎に件数・p50・p95・最大値が集計されることを確認する"""
+    stats = StatementStats()
+    for i in range(1, 101):
+        stats.record(f"SELECT * FROM t WHERE id = {i}", i / 1000)
+    stats.record("SELECT 'other'", 0.5)
+
+    snapshot = stats.snapshot()
+
+    assert [entry["fingerprint"] for entry in snapshot] == [
+        "SELECT * FROM t WHERE id = ?",
+        "SELECT ?",
+    ]
+    entry = snapshot[0]
+    assert entry["count"] == 100
+    assert entry["p50_ms"] == pytest.approx(50)
+    assert entry["p95_ms"] == pytest.approx(95)
+    assert entry["max_ms"] == pytest.approx(100)
+    assert entry["total_ms"] == pytest.approx(5050)
+
+    stats.clear()
+    assert stats.snapshot() == []
+
+
+def test_slow_query_is_logged(
+    monkeypatch: MonkeyPatch, caplog: LogCaptureFixture
+) -> None:
+    """閾値以上のSQLがフィンガープリントでログに出力され、全体の集計に含まれることを確認する"""
+    enable_logger(monkeypatch, "app.infra.query_stats")
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_THRESHOLD_MS", 0)
+    engine = create_engine("sqlite://")
+    statement_stats.clear()
+
+    with engine.connect() as connection:
+        with caplog.at_level(logging.WARNING, logger="app.infra.query_stats"):
+            connection.execute(text("SELECT 1"))
+            assert caplog.records == []
+
+            monkeypatch.setattr(settings, "DB_SLOW_QUERY_THRESHOLD_MS", 1)
+            monkeypatch.setattr(
+                "app.infra.query_stats.time.perf_counter", iter([0.0, 0.002]).__next__
+            )
+            connection.execute(text("SELECT 'secret'"))
+
+    assert [record.getMessage() for record in caplog.records] == [
+        "スロークエリ: 2.0ms SELECT ?"
+    ]
+    assert [entry["fingerprint"] for entry in statement_stats.snapshot()] == [
+        "SELECT ?"
+    ]
@@ -0,0 +1,64 @@
+from typing import List
+
+from app.infra.rate_limiter import RateLimitStats, TokenBucket, backoff_delay
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_waits_when_tokens_run_out() -> None:
+    """上限まではすぐに許可され、超えた分は補充を待つことを確認する"""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, clock=clock, sleep=clock.sleep)
+
+    assert [bucket.acquire() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.acquire() == 0.5
+    assert bucket.acquire() == 0.5
+    assert clock.sleeps == [0.5, 0.5]
+
+    # 時間が経てば容量まで補充される
+    clock.now += 10
+    assert [bucket.acquire() for _ in range(2)] == [0.0, 0.0]
+
+
+def test_token_bucket_without_limit() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0, clock=clock, sleep=clock.sleep)
+
+    assert [bucket.acquire() for _ in range(100)] == [0.0] * 100
+    assert clock.sleeps == []
+
+
+def test_backoff_delay_is_capped() -> None:
+    """待機時間の上限が指数的に増え、最大値で頭打ちになることを確認する"""
+
+    def upper(low: float, high: float) -> float:
+        return high
+
+    assert [backoff_delay(i, 0.1, 1, rand=upper) for i in range(5)] == [
+        0.1,
+        0.2,
+        0.4,
+        0.8,
+        1,
+    ]
+
+
+def test_rate_limit_stats() -> None:
+    stats = RateLimitStats()
+    stats.record("SignUp", calls=1, throttled=1, wait_seconds=0.5)
+    stats.record("SignUp", calls=1)
+
+    assert stats.snapshot() == {
+        "SignUp": {"calls": 2, "throttled": 1, "failed": 0, "wait_seconds": 0.5}
+    }
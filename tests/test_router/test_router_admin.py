@@ -0,0 +1,16 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.router.admin as admin
+
+
+def test_event_loop_stats() -> None:
+    """イベントループの遅延とスレッドプールの使用状況を取得できることを確認する"""
+    app = FastAPI()
+    app.include_router(admin.router, prefix="/admin")
+
+    response = TestClient(app).get("/admin/event_loop")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"lag", "threadpool"}
+    assert response.json()["threadpool"]["size"] > 0
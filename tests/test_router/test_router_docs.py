@@ -0,0 +1,59 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.router import docs
+from app.router.docs import OpenAPIDocument
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+
+    @app.get("/items")
+    def get_items() -> None:
+        pass
+
+    app.include_router(docs.router)
+    return app
+
+
+@pytest.mark.parametrize("content_encoding", ["br", "gzip"])
+def test_get_openapi_compressed(
+    monkeypatch: pytest.MonkeyPatch, content_encoding: str
+) -> None:
+    """受け付ける形式で圧縮済みのドキュメントを返すことを確認する"""
+    monkeypatch.setattr(docs, "openapi_document", OpenAPIDocument())
+    app = create_app()
+    client = TestClient(app)
+
+    response = client.get(
+        "/openapi.json", headers={"Accept-Encoding": content_encoding}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == content_encoding
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.json() == app.openapi()
+    assert list(response.json()["paths"]) == ["/items"]
+
+
+def test_get_openapi_uncompressed(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(docs, "openapi_document", OpenAPIDocument())
+    app = create_app()
+    client = TestClient(app)
+
+    response = client.get("/openapi.json", headers={"Accept-Encoding": "identity"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.json() == app.openapi()
+
+
+def test_get_docs() -> None:
+    client = TestClient(create_app())
+
+    response = client.get("/docs")
+    assert response.status_code == 200
+    assert "/openapi.json" in response.text
+    assert "/docs/oauth2-redirect" in response.text
+    assert client.get("/docs/oauth2-redirect").status_code == 200
+    assert client.get("/redoc").status_code == 200
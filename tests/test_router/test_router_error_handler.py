@@ -0,0 +1,92 @@
+import logging
+from typing import Iterator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from pytest import LogCaptureFixture, MonkeyPatch
+
+from app.router.error_handler import ErrorHandler, get_error_status_code
+from app.usecase.error import DuplicateError, EntityNotFoundError
+from tests.common import enable_logger
+
+
+class CustomNotFoundError(EntityNotFoundError):
+    pass
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/not_found")
+    def not_found() -> None:
+        raise EntityNotFoundError(
+            entity_name="User", entity_id=1, message="存在しません"
+        )
+
+    @app.get("/duplicate")
+    async def duplicate() -> None:
+        raise DuplicateError(message="重複しています")
+
+    @app.get("/error")
+    def error() -> None:
+        raise RuntimeError("予期しないエラー")
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        def generate() -> Iterator[str]:
+            yield "a"
+            raise RuntimeError("ストリーミング中のエラー")
+
+        return StreamingResponse(generate())
+
+    app.add_middleware(ErrorHandler)
+    return app
+
+
+def test_get_error_status_code() -> None:
+    """登録された例外・そのサブクラス・未登録の例外のステータスコードを確認する"""
+    assert get_error_status_code(DuplicateError(message="")) == 409
+    assert (
+        get_error_status_code(
+            CustomNotFoundError(entity_name="User", entity_id=1, message="")
+        )
+        == 404
+    )
+    assert get_error_status_code(RuntimeError()) == 500
+
+
+def test_error_handler_converts_exceptions(
+    caplog: LogCaptureFixture, monkeypatch: MonkeyPatch
+) -> None:
+    """例外がステータスコードとメッセージに変換され、5xxのみスタックトレースが出力されることを確認する"""
+    enable_logger(monkeypatch, "app.router.error_handler")
+    client = TestClient(create_app())
+
+    with caplog.at_level(logging.WARNING, logger="app.router.error_handler"):
+        not_found = client.get("/not_found")
+        duplicate = client.get("/duplicate")
+        error = client.get("/error")
+
+    assert not_found.status_code == 404
+    assert duplicate.status_code == 409
+    assert duplicate.json() == {"message": "重複しています"}
+    assert error.status_code == 500
+    assert error.json() == {"message": "予期しないエラー"}
+
+    assert [record.levelno for record in caplog.records] == [
+        logging.WARNING,
+        logging.WARNING,
+        logging.ERROR,
+    ]
+    assert "Traceback" not in caplog.records[0].getMessage()
+    assert "Traceback" in caplog.records[2].getMessage()
+
+
+def test_error_handler_reraises_after_response_started() -> None:
+    """レスポンスの送信開始後の例外は、エラーレスポンスに変換せず再送出されることを確認する"""
+    client = TestClient(create_app())
+
+    with pytest.raises(RuntimeError):
+        client.get("/stream")
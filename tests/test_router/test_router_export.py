@@ -0,0 +1,59 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, TypeVar
+
+from app.router.export import to_csv_chunks, to_ndjson_chunks
+
+T = TypeVar("T")
+
+ROWS = [
+    {
+        "id": 1,
+        "email": "a@org.com",
+        "created_at": datetime(2024, 1, 1, 9, 0, tzinfo=timezone.utc),
+    },
+    {
+        "id": 2,
+        "email": "b@org.com",
+        "created_at": datetime(2024, 1, 2, 9, 0, tzinfo=timezone.utc),
+    },
+]
+
+
+async def batches(
+    *batches: List[Dict[str, Any]]
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    for batch in batches:
+        yield batch
+
+
+async def collect(chunks: AsyncIterator[T]) -> List[T]:
+    return [chunk async for chunk in chunks]
+
+
+def test_to_ndjson_chunks() -> None:
+    """バッチ毎に1つのチャンクとして、1行1JSONに変換されることを確認する"""
+    chunks = asyncio.run(collect(to_ndjson_chunks(batches(ROWS[:1], ROWS[1:]))))
+
+    assert chunks == [
+        b'{"id":1,"email":"a@org.com","created_at":"2024-01-01T09:00:00Z"}\n',
+        b'{"id":2,"email":"b@org.com","created_at":"2024-01-02T09:00:00Z"}\n',
+    ]
+
+
+def test_to_csv_chunks() -> None:
+    """先頭のチャンクにのみヘッダー行が含まれることを確認する"""
+    columns = ["id", "email", "created_at"]
+    chunks = asyncio.run(collect(to_csv_chunks(batches(ROWS[:1], ROWS[1:]), columns)))
+
+    assert chunks == [
+        "id,email,created_at\r\n1,a@org.com,2024-01-01T09:00:00Z\r\n",
+        "2,b@org.com,2024-01-02T09:00:00Z\r\n",
+    ]
+
+
+def test_to_csv_chunks_empty() -> None:
+    """0件の場合もヘッダー行を返すことを確認する"""
+    chunks = asyncio.run(collect(to_csv_chunks(batches(), ["id", "email"])))
+
+    assert chunks == ["id,email\r\n"]
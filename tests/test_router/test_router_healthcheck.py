@@ -0,0 +1,32 @@
+import asyncio
+import logging
+import time
+
+from pytest import LogCaptureFixture, MonkeyPatch
+
+from app.event_loop_monitor import EventLoopLagMonitor
+from tests.common import enable_logger
+
+
+def test_event_loop_monitor_detects_blocking_call(
+    caplog: LogCaptureFixture, monkeypatch: MonkeyPatch
+) -> None:
+    """イベントループをブロックする処理があった場合に、遅延として計測されることを確認する"""
+    enable_logger(monkeypatch, "app.event_loop_monitor")
+    monitor = EventLoopLagMonitor(interval_seconds=0.01, warning_threshold_seconds=0.05)
+
+    async def run() -> None:
+        stop = asyncio.Event()
+        task = asyncio.create_task(monitor.run(stop))
+        await asyncio.sleep(0.03)
+        time.sleep(0.1)
+        await asyncio.sleep(0.03)
+        stop.set()
+        await asyncio.wait_for(task, timeout=1)
+
+    with caplog.at_level(logging.WARNING, logger="app.event_loop_monitor"):
+        asyncio.run(run())
+
+    assert monitor.count > 0
+    assert monitor.max_lag_seconds >= 0.05
+    assert "イベントループが" in caplog.records[0].getMessage()
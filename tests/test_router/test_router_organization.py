@@ -7,7 +7,7 @@ from fastapi.testclient import TestClient
 from freezegun import freeze_time
 
 from app.domain.entity.user_organization import UserRole
-from tests.common import fixed_time, fixed_time_freezgun
+from tests.common import assert_query_budget, fixed_time, fixed_time_freezgun
 from tests.factories.organization import create_organization
 from tests.factories.user import create_user
 from tests.factories.user_organization import create_user_organization
@@ -83,6 +83,7 @@ def test_get_organization(client: TestClient) -> None:
     # データ作成
     org = create_organization(id=1, name="org")
     response = client.get(f"/api/organization/{org.id}")
+    assert_query_budget(response, 1)
     expected = {
         "created_at": fixed_time,
         "id": org.id,
@@ -124,6 +125,7 @@ def test_get_all_organizations_success(client: TestClient) -> None:
 
     response = client.get("/api/organization")
     assert response.status_code == status.HTTP_200_OK
+    assert_query_budget(response, 1)
     expected = [
         {
             "id": 1,
@@ -141,6 +143,31 @@ def test_get_all_organizations_success(client: TestClient) -> None:
         },
     ]
     assert response.json() == expected
+    assert "X-Next-Cursor" not in response.headers
+
+
+@freeze_time(fixed_time_freezgun)
+def test_get_all_organizations_paginated(client: TestClient) -> None:
+    for organization_id in range(1, 4):
+        create_organization(id=organization_id, name=f"org{organization_id}")
+
+    response = client.get("/api/organization", params={"limit": 2})
+    assert response.status_code == status.HTTP_200_OK
+    assert [organization["id"] for organization in response.json()] == [1, 2]
+
+    response = client.get(
+        "/api/organization",
+        params={"limit": 2, "cursor": response.headers["X-Next-Cursor"]},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [organization["id"] for organization in response.json()] == [3]
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_get_all_organizations_invalid_cursor(client: TestClient) -> None:
+    response = client.get("/api/organization", params={"cursor": "invalid"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["message"] == "cursorが不正です"
 
 
 # NOTE: 以降は認可処理前提のテスト
@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+
+from app.domain.entity.page import Page
+from app.domain.entity.user import USER_LIST_ADAPTER
+from app.domain.entity.user import User as UserEntity
+from app.router.responses import ORJSONResponse, to_list_response
+from app.router.schemas.user import USER_RESPONSE_FIELDS
+from app.router.util import NEXT_CURSOR_HEADER
+
+CREATED_AT = datetime(2024, 8, 17, 12, 0, tzinfo=timezone.utc)
+
+
+def test_orjson_response_formats_utc_as_z() -> None:
+    """日時の形式が pydantic のレスポンスと同じになることを確認する"""
+    response = ORJSONResponse({"created_at": CREATED_AT})
+    assert response.body == b'{"created_at":"2024-08-17T12:00:00Z"}'
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_to_list_response() -> None:
+    """レスポンスのフィールドのみを出力し、次のページのカーソルをヘッダーに設定することを確認する"""
+    user = UserEntity(
+        id=1,
+        cognito_user_id="user1",
+        email="user1@example.com",
+        display_name="user1",
+        deleted=False,
+        created_at=CREATED_AT,
+        updated_at=CREATED_AT,
+    )
+
+    response = to_list_response(
+        USER_LIST_ADAPTER,
+        Page(items=[user], next_cursor="cursor"),
+        {"id", "email", "created_at"},
+    )
+
+    assert response.body == (
+        b'[{"created_at":"2024-08-17T12:00:00Z","id":1,"email":"user1@example.com"}]'
+    )
+    assert response.headers[NEXT_CURSOR_HEADER] == "cursor"
+
+    response = to_list_response(USER_LIST_ADAPTER, Page(items=[]), USER_RESPONSE_FIELDS)
+    assert response.body == b"[]"
+    assert NEXT_CURSOR_HEADER not in response.headers
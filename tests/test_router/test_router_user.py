@@ -1,9 +1,13 @@
+import csv
+import io
+import json
+
 from fastapi import status
 from fastapi.testclient import TestClient
 from freezegun import freeze_time
 
 from app.domain.entity.user_organization import UserRole
-from tests.common import fixed_time_freezgun
+from tests.common import assert_query_budget, fixed_time, fixed_time_freezgun
 from tests.factories.organization import create_organization
 from tests.factories.user import create_user
 from tests.factories.user_organization import create_user_organization
@@ -36,6 +40,8 @@ def test_create_user_success(client: TestClient) -> None:
     response = client.post("/api/user", json=user_request)
 
     assert response.status_code == status.HTTP_201_CREATED
+    # 組織の存在確認、ユーザー・ユーザー組織の作成
+    assert_query_budget(response, 3)
     response_data = response.json()
     assert response_data["cognito_user_id"] == user_request["cognito_user_id"]
     assert response_data["email"] == user_request["email"]
@@ -185,6 +191,80 @@ def test_create_user_validation_error(client: TestClient) -> None:
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
+def test_bulk_create_users(client: TestClient) -> None:
+    """ユーザーを一括作成し、ユーザー毎の結果が返ることを確認"""
+    create_organization(id=1, name="test_org")
+    create_user(id=1, cognito_user_id="admin", email="org@org.com", display_name="a")
+    create_user_organization(user_id=1, organization_id=1, role=UserRole.APP_ADMIN)
+    create_user(
+        id=2, cognito_user_id="exist", email="exist@org.com", display_name="exist"
+    )
+
+    users = [
+        {
+            "cognito_user_id": cognito_user_id,
+            "email": email,
+            "display_name": cognito_user_id,
+            "role": UserRole.MEMBER.value,
+            "organization_id": 1,
+            "password": "Samplepassword_123",
+        }
+        for cognito_user_id, email in [
+            ("u1", "u1@example.com"),
+            ("u2", "exist@org.com"),
+            ("u3", "u3@example.com"),
+        ]
+    ]
+    response = client.post("/api/user/bulk", json={"users": users})
+
+    assert response.status_code == status.HTTP_200_OK
+    # 件数によらず、実行者の取得、組織・既存ユーザーの確認とユーザー・ユーザー組織の作成の5件
+    assert_query_budget(response, 5)
+    response_data = response.json()
+    assert response_data["created_count"] == 2
+    assert response_data["failed_count"] == 1
+    results = response_data["results"]
+    assert [result["cognito_user_id"] for result in results] == ["u1", "u2", "u3"]
+    assert results[0]["user"]["email"] == "u1@example.com"
+    assert results[0]["error"] is None
+    assert results[1]["user"] is None
+    assert (
+        results[1]["error"]
+        == "このメールアドレスは既に登録されています。 email: exist@org.com"
+    )
+
+
+def test_bulk_create_users_forbidden_for_non_app_admin(client: TestClient) -> None:
+    """アプリ管理者以外はユーザーを一括作成できないことを確認"""
+    create_organization(id=1, name="test_org")
+    create_user(id=1, cognito_user_id="test", email="org@org.com", display_name="a")
+    create_user_organization(user_id=1, organization_id=1, role=UserRole.ORG_ADMIN)
+    users = [
+        {
+            "cognito_user_id": "u1",
+            "email": "u1@example.com",
+            "display_name": "u1",
+            "role": UserRole.MEMBER.value,
+            "organization_id": 1,
+            "password": "Samplepassword_123",
+        }
+    ]
+
+    response = client.post("/api/user/bulk", json={"users": users})
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_bulk_create_users_validation_error(client: TestClient) -> None:
+    """作成するユーザーが指定されていない場合にエラーになることを確認"""
+    create_organization(id=1, name="test_org")
+    create_user(id=1, cognito_user_id="admin", email="org@org.com", display_name="a")
+    create_user_organization(user_id=1, organization_id=1, role=UserRole.APP_ADMIN)
+
+    response = client.post("/api/user/bulk", json={"users": []})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 # NOTE: 認可処理前提のテストは一旦コメントアウト。
 
 # @freeze_time(fixed_time_freezgun)
@@ -352,3 +432,58 @@ def test_delete_user_not_found(client: TestClient) -> None:
 #     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 #     response_data = response.json()
 #     assert response_data["message"] == "メンバーはこの操作を実行する権限がありません"
+
+
+@freeze_time(fixed_time_freezgun)
+def test_export_users_ndjson(client: TestClient) -> None:
+    """ユーザー一覧をNDJSONで、組織で絞り込んでエクスポートできることを確認"""
+    create_organization(id=1, name="test_org1")
+    create_organization(id=2, name="test_org2")
+    create_user(id=1, cognito_user_id="test1", email="test1@org.com", display_name="a")
+    create_user(id=2, cognito_user_id="test2", email="test2@org.com", display_name="b")
+    create_user_organization(user_id=1, organization_id=1, role=UserRole.MEMBER)
+    create_user_organization(user_id=2, organization_id=2, role=UserRole.MEMBER)
+    create_user(id=3, cognito_user_id="admin", email="org@org.com", display_name="c")
+    create_user_organization(user_id=3, organization_id=2, role=UserRole.APP_ADMIN)
+
+    response = client.get("/api/user/export", params={"organization_id": 1})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["email"] for row in rows] == ["test1@org.com"]
+    assert rows[0]["created_at"] == fixed_time
+
+
+@freeze_time(fixed_time_freezgun)
+def test_export_users_csv(client: TestClient) -> None:
+    """ユーザー一覧をヘッダー行付きのCSVでエクスポートできることを確認"""
+    create_organization(id=1, name="test_org")
+    create_user(id=1, cognito_user_id="test1", email="test1@org.com", display_name="a")
+    create_user(id=2, cognito_user_id="admin", email="org@org.com", display_name="b")
+    create_user_organization(user_id=2, organization_id=1, role=UserRole.APP_ADMIN)
+
+    response = client.get("/api/user/export", params={"format": "csv"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["cognito_user_id"] for row in rows] == ["test1", "admin"]
+    assert rows[0]["deleted"] == "False"
+    assert rows[0]["created_at"] == fixed_time
+
+
+@freeze_time(fixed_time_freezgun)
+def test_export_users_forbidden_for_non_app_admin(client: TestClient) -> None:
+    """アプリ管理者以外はユーザー一覧をエクスポートできないことを確認"""
+    create_organization(id=1, name="test_org")
+    create_user(id=1, cognito_user_id="test", email="org@org.com", display_name="a")
+    create_user_organization(user_id=1, organization_id=1, role=UserRole.ORG_ADMIN)
+
+    response = client.get("/api/user/export")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert (
+        response.json()["message"]
+        == "アクセス権がありません。アプリ管理者のみ操作可能です。"
+    )
@@ -0,0 +1,70 @@
+import pytest
+
+from app.domain.entity.principal import Principal
+from app.domain.entity.user import User
+from app.domain.entity.user_organization import UserOrganization, UserRole
+from app.router.util import (
+    get_user_and_role,
+    is_user_role_app_admin,
+    is_user_role_app_admin_or_org_admin,
+)
+from app.usecase.error import (
+    EntityNotFoundError,
+    GetListUserOrganizationByUserIdEmptyError,
+)
+
+
+def create_principal(*roles: UserRole) -> Principal:
+    return Principal(
+        user=User(id=1, cognito_user_id="test", email="test@org.com"),
+        user_organizations=[
+            UserOrganization(user_id=1, organization_id=i + 1, role=role)
+            for i, role in enumerate(roles)
+        ],
+    )
+
+
+def test_get_user_and_role() -> None:
+    """指定した組織でのロールを取得できることを確認する"""
+    principal = create_principal(UserRole.ORG_ADMIN, UserRole.MEMBER)
+
+    role, user = get_user_and_role(principal, organization_id=2)
+
+    assert role == UserRole.MEMBER
+    assert user.id == 1
+
+
+def test_get_user_and_role_not_in_organization() -> None:
+    """所属していない組織を指定した場合にEntityNotFoundErrorが発生することを確認する"""
+    principal = create_principal(UserRole.ORG_ADMIN)
+
+    with pytest.raises(EntityNotFoundError):
+        get_user_and_role(principal, organization_id=999)
+
+
+def test_is_user_role_app_admin() -> None:
+    """いずれかの組織でアプリ管理者であれば、アプリ管理者と判定されることを確認する"""
+    principal = create_principal(UserRole.MEMBER, UserRole.APP_ADMIN)
+    is_app_admin, _ = is_user_role_app_admin(principal)
+    assert is_app_admin is True
+
+    principal = create_principal(UserRole.ORG_ADMIN)
+    is_app_admin, _ = is_user_role_app_admin(principal)
+    assert is_app_admin is False
+
+
+def test_is_user_role_app_admin_or_org_admin() -> None:
+    """組織管理者またはアプリ管理者であるかを判定できることを確認する"""
+    principal = create_principal(UserRole.ORG_ADMIN)
+    is_admin, _ = is_user_role_app_admin_or_org_admin(principal)
+    assert is_admin is True
+
+    principal = create_principal(UserRole.MEMBER)
+    is_admin, _ = is_user_role_app_admin_or_org_admin(principal)
+    assert is_admin is False
+
+
+def test_is_user_role_app_admin_without_organization() -> None:
+    """組織に所属していない場合にGetListUserOrganizationByUserIdEmptyErrorが発生することを確認する"""
+    with pytest.raises(GetListUserOrganizationByUserIdEmptyError):
+        is_user_role_app_admin(create_principal())
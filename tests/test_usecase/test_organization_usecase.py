@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+
+from app.domain.entity.organization import Organization
+from app.domain.i_repository.organization import OrganizationAsyncIRepository
+from app.infra.repository.organization import (
+    OrganizationAsyncRepository,
+    OrganizationRepository,
+    OrganizationThreadpoolRepository,
+)
+from app.usecase.error import ConflictError, EntityNotFoundError
+from app.usecase.organization import CreateOrganizationParams, OrganizationAsyncUsecase
+from tests.factories.organization import create_organization
+
+
+@pytest.fixture(params=["asyncpg", "threadpool"])
+def organization_async_repository(
+    request: pytest.FixtureRequest,
+) -> OrganizationAsyncIRepository:
+    """OrganizationAsyncIRepositoryのfixture。asyncpgとスレッドプールの両方の実装で検証する"""
+    if request.param == "asyncpg":
+        return OrganizationAsyncRepository()
+    return OrganizationThreadpoolRepository(
+        organization_repository=OrganizationRepository()
+    )
+
+
+@pytest.fixture
+def organization_async_usecase(
+    organization_async_repository: OrganizationAsyncIRepository,
+) -> OrganizationAsyncUsecase:
+    """OrganizationAsyncUsecaseのfixture"""
+    return OrganizationAsyncUsecase(
+        organization_repository=organization_async_repository
+    )
+
+
+def test_create_and_get_organization_async(
+    organization_async_usecase: OrganizationAsyncUsecase,
+) -> None:
+    """非同期版で組織を作成し、取得できることを確認する"""
+    created = asyncio.run(
+        organization_async_usecase.create_organization(
+            CreateOrganizationParams(name="test_org")
+        )
+    )
+
+    organization = asyncio.run(
+        organization_async_usecase.get_organization(organization_id=created.id)
+    )
+
+    assert organization.name == "test_org"
+    assert organization.deleted is False
+    assert organization.created_at == created.created_at
+
+
+def test_get_all_organizations_async(
+    organization_async_usecase: OrganizationAsyncUsecase,
+    organization_async_repository: OrganizationAsyncIRepository,
+) -> None:
+    """非同期版で組織の一覧と存在確認ができることを確認する"""
+    create_organization(id=1, name="test_org1")
+    create_organization(id=2, name="test_org2")
+
+    page = asyncio.run(organization_async_usecase.get_all_organizations())
+
+    assert [organization.id for organization in page.items] == [1, 2]
+    assert page.next_cursor is None
+    assert asyncio.run(organization_async_repository.is_organization_exist(1))
+    assert not asyncio.run(organization_async_repository.is_organization_exist(999))
+
+
+def test_get_all_organizations_async_paginates_by_cursor(
+    organization_async_usecase: OrganizationAsyncUsecase,
+) -> None:
+    """limit件ずつ、カーソルで次のページを取得できることを確認する"""
+    for organization_id in range(1, 4):
+        create_organization(id=organization_id, name=f"test_org{organization_id}")
+
+    first_page = asyncio.run(organization_async_usecase.get_all_organizations(limit=2))
+    second_page = asyncio.run(
+        organization_async_usecase.get_all_organizations(
+            limit=2, cursor=first_page.next_cursor
+        )
+    )
+
+    assert [organization.id for organization in first_page.items] == [1, 2]
+    assert [organization.id for organization in second_page.items] == [3]
+    assert second_page.next_cursor is None
+
+
+def test_get_organization_async_not_found(
+    organization_async_usecase: OrganizationAsyncUsecase,
+) -> None:
+    """存在しない組織の場合にEntityNotFoundErrorが発生することを確認する"""
+    with pytest.raises(EntityNotFoundError):
+        asyncio.run(organization_async_usecase.get_organization(organization_id=999))
+
+
+def test_update_organization_async(
+    organization_async_repository: OrganizationAsyncIRepository,
+) -> None:
+    """updated_at が一致する場合に組織を更新できることを確認する"""
+    created = asyncio.run(
+        organization_async_repository.save_organization(Organization(name="test_org"))
+    )
+
+    updated = asyncio.run(
+        organization_async_repository.save_organization(
+            Organization(id=created.id, deleted=True, updated_at=created.updated_at)
+        )
+    )
+
+    assert updated.id == created.id
+    assert updated.name == "test_org"
+    assert updated.deleted is True
+    assert updated.updated_at != created.updated_at
+
+
+def test_update_organization_async_conflict(
+    organization_async_repository: OrganizationAsyncIRepository,
+) -> None:
+    """他のユーザが先に更新していた場合に ConflictError となることを確認する"""
+    created = asyncio.run(
+        organization_async_repository.save_organization(Organization(name="test_org"))
+    )
+    asyncio.run(
+        organization_async_repository.save_organization(
+            Organization(id=created.id, deleted=True, updated_at=created.updated_at)
+        )
+    )
+
+    # 更新前の updated_at のまま更新する
+    with pytest.raises(ConflictError) as excinfo:
+        asyncio.run(
+            organization_async_repository.save_organization(
+                Organization(
+                    id=created.id, deleted=False, updated_at=created.updated_at
+                )
+            )
+        )
+    assert (
+        str(excinfo.value)
+        == "他のユーザが先に更新したため、test_orgの更新に失敗しました。"
+    )
+
+
+def test_update_organization_async_not_found(
+    organization_async_repository: OrganizationAsyncIRepository,
+) -> None:
+    """存在しない組織を更新した場合に EntityNotFoundError となることを確認する"""
+    with pytest.raises(EntityNotFoundError):
+        asyncio.run(
+            organization_async_repository.save_organization(
+                Organization(id=999, deleted=True)
+            )
+        )
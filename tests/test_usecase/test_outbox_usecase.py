@@ -0,0 +1,116 @@
+import asyncio
+from unittest.mock import AsyncMock, call
+
+import pytest
+from pytest import MonkeyPatch
+from sqlalchemy.orm import Session
+
+from app.domain.entity.outbox import OutboxEventType, OutboxStatus
+from app.infra.models.outbox import Outbox
+from app.infra.repository.db import transaction_scope
+from app.infra.repository.outbox import OutboxRepository
+from app.usecase.outbox import OutboxUsecase
+
+
+@pytest.fixture
+def user_async_repository() -> AsyncMock:
+    """Cognito を呼び出さないよう、ユーザーのリポジトリはモックにする"""
+    return AsyncMock()
+
+
+@pytest.fixture
+def outbox_usecase(db: Session, user_async_repository: AsyncMock) -> OutboxUsecase:
+    """OutboxUsecaseのfixture"""
+    return OutboxUsecase(
+        outbox_repository=OutboxRepository(),
+        user_async_repository=user_async_repository,
+    )
+
+
+def add_delete_cognito_user_event(cognito_user_id: str) -> None:
+    with transaction_scope() as db:
+        OutboxRepository().add_event(
+            db,
+            OutboxEventType.DELETE_COGNITO_USER,
+            {"cognito_user_id": cognito_user_id},
+        )
+
+
+def test_process_pending_events(
+    db: Session, outbox_usecase: OutboxUsecase, user_async_repository: AsyncMock
+) -> None:
+    """処理待ちのイベントが処理され、完了したイベントは再度処理されないことを確認する"""
+    add_delete_cognito_user_event("user1")
+    add_delete_cognito_user_event("user2")
+
+    assert asyncio.run(outbox_usecase.process_pending_events()) == 2
+    assert asyncio.run(outbox_usecase.process_pending_events()) == 0
+
+    assert user_async_repository.delete_user_on_cognito.call_args_list == [
+        call("user1"),
+        call("user2"),
+    ]
+    db.expire_all()
+    rows = db.query(Outbox.status, Outbox.attempts).order_by(Outbox.id).all()
+    assert [tuple(row) for row in rows] == [
+        (OutboxStatus.DONE, 1),
+        (OutboxStatus.DONE, 1),
+    ]
+
+
+def test_process_pending_events_retries_failed_event(
+    db: Session, outbox_usecase: OutboxUsecase, user_async_repository: AsyncMock
+) -> None:
+    """失敗したイベントはリトライの時刻まで取得されず、上限に達すると失敗になることを確認する"""
+    add_delete_cognito_user_event("user1")
+    user_async_repository.delete_user_on_cognito.side_effect = Exception(
+        "Cognito削除失敗"
+    )
+
+    assert asyncio.run(outbox_usecase.process_pending_events()) == 1
+    # リトライの時刻になるまでは取得されない
+    assert asyncio.run(outbox_usecase.process_pending_events()) == 0
+
+    db.expire_all()
+    event = db.query(Outbox).one()
+    assert event.status == OutboxStatus.PENDING
+    assert event.attempts == 1
+    assert event.last_error == "Cognito削除失敗"
+
+    # リトライ回数の上限に達した場合
+    db.query(Outbox).update({"next_attempt_at": event.created_at})
+    db.commit()
+    with MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr("app.usecase.outbox.settings.OUTBOX_MAX_ATTEMPTS", 2)
+        assert asyncio.run(outbox_usecase.process_pending_events()) == 1
+
+    db.expire_all()
+    event = db.query(Outbox).one()
+    assert event.status == OutboxStatus.FAILED
+    assert event.attempts == 2
+
+
+def test_run_worker_processes_events_until_stopped(
+    monkeypatch: MonkeyPatch,
+    outbox_usecase: OutboxUsecase,
+    user_async_repository: AsyncMock,
+) -> None:
+    """ワーカーがイベントを処理し、停止の指示で終了することを確認する"""
+    monkeypatch.setattr(
+        "app.usecase.outbox.settings.OUTBOX_POLL_INTERVAL_SECONDS", 0.01
+    )
+    add_delete_cognito_user_event("user1")
+
+    async def run() -> None:
+        stop = asyncio.Event()
+        worker = asyncio.create_task(outbox_usecase.run_worker(stop))
+        for _ in range(500):
+            if user_async_repository.delete_user_on_cognito.called:
+                break
+            await asyncio.sleep(0.01)
+        stop.set()
+        await asyncio.wait_for(worker, timeout=5)
+
+    asyncio.run(run())
+
+    user_async_repository.delete_user_on_cognito.assert_called_once_with("user1")
@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.domain.entity.user_organization import UserRole
 from app.infra.repository.user_organization import UserOrganizationRepository
-from app.usecase.error import EntityNotFoundError
+from app.usecase.error import DuplicateError, EntityNotFoundError
 from app.usecase.user_organization import UserOrganizationUsecase
 from tests.common import fixed_time_freezgun
 from tests.factories.organization import create_organization
@@ -95,3 +95,25 @@ def test_get_role_by_user_id_and_organization_id_roles(
     # 検証
     assert result1 == UserRole.APP_ADMIN.value
     assert result2 == UserRole.MEMBER.value
+
+
+def test_create_user_organization_duplicate_does_not_abort_transaction(
+    db: Session, user_organization_repository: UserOrganizationRepository
+) -> None:
+    """既に所属している組織への追加に失敗しても、同じトランザクションで処理を続けられることを確認する"""
+    create_user(id=1, cognito_user_id="test", email="test@org.com", display_name="test")
+    create_organization(id=1, name="test_org1")
+    create_organization(id=2, name="test_org2")
+    create_user_organization(user_id=1, organization_id=1, role=UserRole.MEMBER)
+
+    with pytest.raises(DuplicateError):
+        user_organization_repository.create_user_organization(
+            user_id=1, organization_id=1, role=UserRole.ORG_ADMIN, db=db
+        )
+
+    created = user_organization_repository.create_user_organization(
+        user_id=1, organization_id=2, role=UserRole.MEMBER, db=db
+    )
+    assert created.user_id == 1
+    assert created.organization_id == 2
+    assert created.role == UserRole.MEMBER
@@ -1,21 +1,53 @@
-from unittest.mock import MagicMock, patch
+import asyncio
+from typing import Tuple
+from unittest.mock import patch
 
 import pytest
 from freezegun import freeze_time
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.config import settings
+from app.domain.entity.outbox import OutboxEventType, OutboxStatus
+from app.domain.entity.user import User as UserEntity
+from app.domain.entity.user_organization import UserRole
 from app.domain.i_repository.organization import OrganizationIRepository
 from app.domain.i_repository.user import UserIRepository
 from app.domain.i_repository.user_organization import UserOrganizationIRepository
+from app.infra.models.outbox import Outbox
 from app.infra.models.user import User
+from app.infra.models.user_organization import UserOrganization
 from app.infra.repository.organization import OrganizationRepository
-from app.infra.repository.user import UserRepository
+from app.infra.repository.outbox import OutboxRepository
+from app.infra.repository.principal_cache import (
+    cache_principal,
+    get_cached_principal,
+    get_principal_generation,
+    invalidate_principal,
+    principal_cache,
+)
+from app.infra.repository.user import (
+    UserAsyncRepository,
+    UserRepository,
+    UserThreadpoolRepository,
+)
 from app.infra.repository.user_organization import UserOrganizationRepository
-from app.usecase.error import EntityNotFoundError
-from app.usecase.user import UserUsecase
+from app.usecase.error import (
+    DuplicateError,
+    EntityNotFoundError,
+    MemberAccessDeniedError,
+    ValidationParamError,
+)
+from app.usecase.user import (
+    UserAsyncUsecase,
+    UserBulkCreateParams,
+    UserCreateParams,
+    UserUsecase,
+)
 from tests.common import fixed_time_freezgun
+from tests.conftest import test_engine
+from tests.factories.organization import create_organization
 from tests.factories.user import create_user
+from tests.factories.user_organization import create_user_organization
 
 
 @pytest.fixture
@@ -48,6 +80,19 @@ def user_usecase(
     return UserUsecase(
         user_repository=user_repository,
         organization_repository=organization_repository,
+        outbox_repository=OutboxRepository(),
+    )
+
+
+@pytest.fixture(params=["asyncpg", "threadpool"])
+def user_async_usecase(
+    request: pytest.FixtureRequest, user_repository: UserIRepository
+) -> UserAsyncUsecase:
+    """UserAsyncUsecaseのfixture。asyncpgとスレッドプールの両方の実装で検証する"""
+    if request.param == "asyncpg":
+        return UserAsyncUsecase(user_repository=UserAsyncRepository())
+    return UserAsyncUsecase(
+        user_repository=UserThreadpoolRepository(user_repository=user_repository)
     )
 
 
@@ -83,6 +128,207 @@ def test_get_user_by_email_not_found(db: Session, user_usecase: UserUsecase) ->
     )
 
 
+@freeze_time(fixed_time_freezgun)
+def test_get_principal(db: Session, user_usecase: UserUsecase) -> None:
+    """メールアドレスからユーザーと所属組織・ロールをまとめて取得できることを確認する"""
+    # テストデータの作成
+    email = "test@org.com"
+    create_user(id=1, cognito_user_id="test", email=email, display_name="test_user")
+    create_organization(id=1, name="test_org1")
+    create_organization(id=2, name="test_org2")
+    create_user_organization(user_id=1, organization_id=1, role=UserRole.ORG_ADMIN)
+    create_user_organization(user_id=1, organization_id=2, role=UserRole.MEMBER)
+
+    # ユースケースの実行
+    principal = user_usecase.get_principal(email=email)
+
+    # 検証
+    assert principal.user.id == 1
+    assert principal.user.email == email
+    assert {
+        (user_org.organization_id, user_org.role)
+        for user_org in principal.user_organizations
+    } == {(1, UserRole.ORG_ADMIN), (2, UserRole.MEMBER)}
+
+
+@freeze_time(fixed_time_freezgun)
+def test_get_principal_without_organization(
+    db: Session, user_usecase: UserUsecase
+) -> None:
+    """組織に所属していないユーザーの場合、所属組織が空で取得できることを確認する"""
+    email = "test@org.com"
+    create_user(id=1, cognito_user_id="test", email=email, display_name="test_user")
+
+    principal = user_usecase.get_principal(email=email)
+
+    assert principal.user.id == 1
+    assert principal.user_organizations == []
+
+
+@freeze_time(fixed_time_freezgun)
+def test_get_principal_not_found(db: Session, user_usecase: UserUsecase) -> None:
+    """存在しないメールアドレスの場合にEntityNotFoundErrorが発生することを確認する"""
+    with pytest.raises(EntityNotFoundError) as excinfo:
+        user_usecase.get_principal(email="org@org.com")
+
+    assert (
+        str(excinfo.value)
+        == "指定されたメールアドレスのユーザーは存在しません。 email: org@org.com"
+    )
+
+
+def test_get_principal_is_cached_until_user_organization_changes(
+    db: Session,
+    user_usecase: UserUsecase,
+    user_organization_repository: UserOrganizationIRepository,
+) -> None:
+    """取得結果がキャッシュされ、所属組織の変更時に破棄されることを確認する"""
+    # テストデータの作成
+    email = "test@org.com"
+    create_user(id=1, cognito_user_id="test", email=email, display_name="test_user")
+    create_organization(id=1, name="test_org1")
+    create_organization(id=2, name="test_org2")
+    create_user_organization(user_id=1, organization_id=1, role=UserRole.ORG_ADMIN)
+
+    # 2回目はキャッシュから取得される
+    user_usecase.get_principal(email=email)
+    user_usecase.get_principal(email=email)
+    assert principal_cache.hits == 1
+
+    # 所属組織を追加するとキャッシュが破棄される
+    user_organization_repository.create_user_organization(
+        user_id=1, organization_id=2, role=UserRole.MEMBER, db=db
+    )
+    db.commit()
+    principal = user_usecase.get_principal(email=email)
+
+    assert len(principal.user_organizations) == 2
+
+
+def test_get_principal_is_invalidated_after_delete_user(
+    db: Session, user_usecase: UserUsecase
+) -> None:
+    """ユーザーを削除すると、コミット後にキャッシュが破棄され、認可時に取得されないことを確認する"""
+    email = "test@org.com"
+    create_user(id=1, cognito_user_id="test", email=email, display_name="test_user")
+    user_usecase.get_principal(email=email)
+    assert get_cached_principal(email) is not None
+
+    user_usecase.delete_user(cognito_user_id="test")
+
+    assert get_cached_principal(email) is None
+    with pytest.raises(EntityNotFoundError):
+        user_usecase.get_principal(email=email)
+
+
+def test_get_principal_is_not_invalidated_on_rollback(
+    db: Session, user_usecase: UserUsecase
+) -> None:
+    """ロールバックされた場合は、キャッシュを破棄しないことを確認する"""
+    email = "test@org.com"
+    create_user(id=1, cognito_user_id="test", email=email, display_name="test_user")
+    user_usecase.get_principal(email=email)
+
+    with patch.object(OutboxRepository, "add_event", side_effect=Exception("登録失敗")):
+        with pytest.raises(Exception):
+            user_usecase.delete_user(cognito_user_id="test")
+
+    assert get_cached_principal(email) is not None
+
+
+def test_cache_principal_skips_value_read_before_invalidation(
+    user_usecase: UserUsecase,
+) -> None:
+    """取得中にキャッシュが破棄された場合、取得した古い値をキャッシュしないことを確認する"""
+    email = "test@org.com"
+    create_user(id=1, cognito_user_id="test", email=email, display_name="test_user")
+    principal = user_usecase.get_principal(email=email)
+    principal_cache.clear()
+
+    generation = get_principal_generation()
+    invalidate_principal(1)
+    cache_principal(email, principal, generation)
+
+    assert get_cached_principal(email) is None
+
+
+def test_get_principal_async(user_async_usecase: UserAsyncUsecase) -> None:
+    """非同期版でもユーザーと所属組織・ロールをまとめて取得できることを確認する"""
+    email = "test@org.com"
+    create_user(id=1, cognito_user_id="test", email=email, display_name="test_user")
+    create_organization(id=1, name="test_org1")
+    create_user_organization(user_id=1, organization_id=1, role=UserRole.ORG_ADMIN)
+
+    principal = asyncio.run(user_async_usecase.get_principal(email=email))
+
+    assert principal.user.id == 1
+    assert [
+        (user_org.organization_id, user_org.role)
+        for user_org in principal.user_organizations
+    ] == [(1, UserRole.ORG_ADMIN)]
+
+    # 2回目はキャッシュから取得される
+    asyncio.run(user_async_usecase.get_principal(email=email))
+    assert principal_cache.hits == 1
+
+
+def test_get_users_and_user_by_email_async(
+    user_async_usecase: UserAsyncUsecase,
+) -> None:
+    """非同期版でユーザー一覧とメールアドレスによるユーザー取得ができることを確認する"""
+    create_user(
+        id=1, cognito_user_id="test1", email="test1@org.com", display_name="test1"
+    )
+    create_user(
+        id=2, cognito_user_id="test2", email="test2@org.com", display_name="test2"
+    )
+
+    page = asyncio.run(user_async_usecase.get_users())
+    assert [user.email for user in page.items] == ["test1@org.com", "test2@org.com"]
+    assert page.next_cursor is None
+
+    user = asyncio.run(user_async_usecase.get_user_by_email(email="test2@org.com"))
+    assert user.id == 2
+
+    with pytest.raises(EntityNotFoundError):
+        asyncio.run(user_async_usecase.get_user_by_email(email="none@org.com"))
+
+
+def test_get_users_async_paginates_by_cursor(
+    user_async_usecase: UserAsyncUsecase,
+) -> None:
+    """カーソルでページを辿り、組織IDで絞り込めることを確認する"""
+    create_organization(id=1, name="test_org1")
+    create_organization(id=2, name="test_org2")
+    for user_id in range(1, 6):
+        create_user(
+            id=user_id,
+            cognito_user_id=f"test{user_id}",
+            email=f"test{user_id}@org.com",
+            display_name=f"test{user_id}",
+        )
+        create_user_organization(
+            user_id=user_id,
+            organization_id=1 if user_id != 3 else 2,
+            role=UserRole.MEMBER,
+        )
+
+    first_page = asyncio.run(user_async_usecase.get_users(limit=2, organization_id=1))
+    assert [user.id for user in first_page.items] == [1, 2]
+    assert first_page.next_cursor is not None
+
+    second_page = asyncio.run(
+        user_async_usecase.get_users(
+            limit=2, cursor=first_page.next_cursor, organization_id=1
+        )
+    )
+    assert [user.id for user in second_page.items] == [4, 5]
+    assert second_page.next_cursor is None
+
+    with pytest.raises(ValidationParamError):
+        asyncio.run(user_async_usecase.get_users(cursor="invalid"))
+
+
 @freeze_time(fixed_time_freezgun)
 def test_delete_user_by_cognito_user_id(db: Session, user_usecase: UserUsecase) -> None:
     """cognito_user_idからユーザーを削除できることを確認する"""
@@ -95,32 +341,28 @@ def test_delete_user_by_cognito_user_id(db: Session, user_usecase: UserUsecase)
         display_name="test_user",
     )
 
-    with patch(
-        "app.infra.repository.cognito.create_cognito_client"
-    ) as mock_create_client:
-        # 2. モッククライアント作成
-        mock_cognito_client = MagicMock()
-        mock_create_client.return_value = mock_cognito_client
-
-        # 3. ユーザー削除実行
+    with patch.object(
+        user_usecase.user_repository, "delete_user_on_cognito"
+    ) as mock_delete_cognito:
         user_usecase.delete_user(cognito_user_id=cognito_user_id)
 
-        # 4. DB論理削除確認
-        deleted_user = (
-            db.query(User).filter(User.cognito_user_id == cognito_user_id).first()
-        )
-        assert deleted_user is not None
-        assert deleted_user.deleted is True
-
-        # 5. Cognito クライアントメソッドが呼ばれたことを検証
-        mock_cognito_client.admin_disable_user.assert_called_once_with(
-            UserPoolId=settings.COGNITO_USER_POOL_ID,
-            Username=cognito_user_id,
-        )
-        mock_cognito_client.admin_delete_user.assert_called_once_with(
-            UserPoolId=settings.COGNITO_USER_POOL_ID,
-            Username=cognito_user_id,
+    # DB論理削除確認
+    deleted_user = (
+        db.query(User).filter(User.cognito_user_id == cognito_user_id).first()
+    )
+    assert deleted_user is not None
+    assert deleted_user.deleted is True
+
+    # Cognito の削除はリクエスト内では行わず、アウトボックスに登録される
+    mock_delete_cognito.assert_not_called()
+    events = db.query(Outbox).all()
+    assert [(event.event_type, event.payload, event.status) for event in events] == [
+        (
+            OutboxEventType.DELETE_COGNITO_USER,
+            {"cognito_user_id": cognito_user_id},
+            OutboxStatus.PENDING,
         )
+    ]
 
 
 @freeze_time(fixed_time_freezgun)
@@ -129,51 +371,157 @@ def test_delete_user_not_found(db: Session, user_usecase: UserUsecase) -> None:
     with pytest.raises(EntityNotFoundError):
         user_usecase.delete_user(cognito_user_id="test")
 
+    assert db.query(Outbox).count() == 0
 
-def test_delete_user_db_failure_triggers_cognito_reenable(
-    user_usecase: UserUsecase,
+
+def test_delete_user_outbox_failure_rolls_back_soft_delete(
+    db: Session, user_usecase: UserUsecase
 ) -> None:
-    cognito_user_id = "test-user-id"
+    """アウトボックスへの登録に失敗した場合、論理削除もロールバックされることを確認する"""
+    create_user(id=1, cognito_user_id="test", email="test@org.com", display_name="a")
 
     with patch.object(
-        user_usecase.user_repository, "disable_user_on_cognito"
-    ) as mock_disable, patch.object(
-        user_usecase.user_repository,
-        "soft_delete_user",
-        side_effect=Exception("DB失敗"),
-    ) as mock_delete_db, patch.object(
-        user_usecase.user_repository, "enable_user_on_cognito"
-    ) as mock_enable, patch.object(
-        user_usecase.user_repository, "delete_user_on_cognito"
-    ) as mock_delete_cognito:
-
+        user_usecase.outbox_repository,
+        "add_event",
+        side_effect=Exception("登録失敗"),
+    ):
         with pytest.raises(Exception) as excinfo:
-            user_usecase.delete_user(cognito_user_id=cognito_user_id)
+            user_usecase.delete_user(cognito_user_id="test")
+
+    assert "登録失敗" in str(excinfo.value)
+    db.expire_all()
+    user = db.query(User).filter(User.cognito_user_id == "test").one()
+    assert user.deleted is False
+
+
+def test_create_user_duplicate_does_not_abort_transaction(
+    db: Session, user_repository: UserIRepository
+) -> None:
+    """重複したユーザーの作成に失敗しても、同じトランザクションで処理を続けられることを確認する"""
+    create_user(cognito_user_id="exist", email="exist@org.com", display_name="exist")
+
+    with pytest.raises(DuplicateError) as excinfo:
+        user_repository.create_user(
+            db=db,
+            user=UserEntity(
+                cognito_user_id="new", email="exist@org.com", display_name="new"
+            ),
+        )
+    assert (
+        str(excinfo.value)
+        == "このメールアドレスは既に登録されています。 email: exist@org.com"
+    )
+
+    created = user_repository.create_user(
+        db=db,
+        user=UserEntity(cognito_user_id="new", email="new@org.com", display_name="new"),
+    )
+    assert created.cognito_user_id == "new"
+    assert created.deleted is False
+    assert db.query(User).count() == 2
+
+
+def build_bulk_create_params(*users: Tuple[str, str, int]) -> UserBulkCreateParams:
+    """(cognitoのユーザID, メールアドレス, 組織ID) から一括作成のパラメータを作る"""
+    return UserBulkCreateParams(
+        users=[
+            UserCreateParams(
+                cognito_user_id=cognito_user_id,
+                email=email,
+                display_name=cognito_user_id,
+                role=UserRole.MEMBER.value,
+                organization_id=organization_id,
+                password="Samplepassword_123",
+            )
+            for cognito_user_id, email, organization_id in users
+        ]
+    )
+
 
-        assert "DB失敗" in str(excinfo.value)
-        mock_disable.assert_called_once_with(cognito_user_id)
-        mock_delete_db.assert_called_once()
-        mock_enable.assert_called_once_with(cognito_user_id)
-        mock_delete_cognito.assert_not_called()
+def test_bulk_create_users(db: Session, user_usecase: UserUsecase) -> None:
+    """ユーザーを一括作成し、作成できなかったユーザーは理由を結果に含めることを確認する"""
+    create_organization(id=1, name="test_org")
+    create_user(cognito_user_id="exist", email="exist@org.com", display_name="exist")
+    params = build_bulk_create_params(
+        ("u1", "u1@org.com", 1),
+        ("u2", "u2@org.com", 1),
+        ("u3", "exist@org.com", 1),
+        ("u4", "u4@org.com", 2),
+        ("u1", "u5@org.com", 1),
+    )
 
+    with patch.object(user_usecase.user_repository, "create_cognito_user") as mock:
+        results = user_usecase.bulk_create_users(role=UserRole.APP_ADMIN, params=params)
+
+    assert [result.index for result in results] == [0, 1, 2, 3, 4]
+    assert [result.error is None for result in results] == [
+        True,
+        True,
+        False,
+        False,
+        False,
+    ]
+    assert results[2].error == (
+        "このメールアドレスは既に登録されています。 email: exist@org.com"
+    )
+    assert results[3].error == "指定された組織が存在しません。organization_id: 2"
+    assert results[4].error == (
+        "cognitoのユーザIDがリクエスト内で重複しています。 cognito_user_id: u1"
+    )
+    assert mock.call_count == 2
+
+    created = {
+        result.user.cognito_user_id: result.user.id
+        for result in results
+        if result.user is not None
+    }
+    db_users = db.query(User).filter(User.cognito_user_id.in_(["u1", "u2"])).all()
+    assert {db_user.cognito_user_id: db_user.id for db_user in db_users} == created
+    db_user_organizations = (
+        db.query(UserOrganization.organization_id, UserOrganization.role)
+        .filter(UserOrganization.user_id.in_(created.values()))
+        .all()
+    )
+    assert [tuple(row) for row in db_user_organizations] == [
+        (1, UserRole.MEMBER),
+        (1, UserRole.MEMBER),
+    ]
 
-def test_delete_user_cognito_final_delete_fails(user_usecase: UserUsecase) -> None:
-    cognito_user_id = "test-user-id"
+
+def test_bulk_create_users_removes_users_failed_to_sign_up(
+    db: Session, user_usecase: UserUsecase
+) -> None:
+    """Cognitoへのサインアップに失敗したユーザーは、DBにも作成されないことを確認する"""
+    create_organization(id=1, name="test_org")
+    params = build_bulk_create_params(
+        ("u1", "u1@org.com", 1),
+        ("u2", "u2@org.com", 1),
+    )
+
+    def sign_up(user: UserEntity, password: str) -> None:
+        # サインアップはコミット後に、トランザクションの外で行う
+        with test_engine.connect() as connection:
+            assert connection.scalar(select(func.count()).select_from(User)) == 2
+        if user.cognito_user_id == "u2":
+            raise DuplicateError(message="ユーザーは既に存在します: u2")
 
     with patch.object(
-        user_usecase.user_repository, "disable_user_on_cognito"
-    ) as mock_disable, patch.object(
-        user_usecase.user_repository, "soft_delete_user"
-    ) as mock_delete_db, patch.object(
-        user_usecase.user_repository,
-        "delete_user_on_cognito",
-        side_effect=Exception("Cognito削除失敗"),
-    ) as mock_delete_cognito:
+        user_usecase.user_repository, "create_cognito_user", side_effect=sign_up
+    ):
+        results = user_usecase.bulk_create_users(role=UserRole.APP_ADMIN, params=params)
 
-        with pytest.raises(Exception) as excinfo:
-            user_usecase.delete_user(cognito_user_id=cognito_user_id)
+    assert results[0].error is None
+    assert results[1].user is None
+    assert results[1].error == "ユーザーは既に存在します: u2"
+    assert [db_user.cognito_user_id for db_user in db.query(User).all()] == ["u1"]
+    assert db.query(UserOrganization).count() == 1
+
+
+def test_bulk_create_users_member_access_denied(user_usecase: UserUsecase) -> None:
+    """メンバーは一括作成できないことを確認する"""
+    params = build_bulk_create_params(
+        ("u1", "u1@org.com", 1),
+    )
 
-        assert "Cognito削除失敗" in str(excinfo.value)
-        mock_disable.assert_called_once_with(cognito_user_id)
-        mock_delete_db.assert_called_once()
-        mock_delete_cognito.assert_called_once_with(cognito_user_id)
+    with pytest.raises(MemberAccessDeniedError):
+        user_usecase.bulk_create_users(role=UserRole.MEMBER, params=params)